@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Acquisition Stream - background capture loop feeding a ring buffer.
+
+A worker thread calls a capture function back-to-back and stores each
+result (one segment: a waveform, a set of channels, a trace) with its
+timestamp in a preallocated ring buffer. Clients pull unread segments in
+batches while capture continues; when they fall behind, the oldest
+unread segments are overwritten and counted as dropped.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Consecutive capture errors before the worker gives up
+MAX_CONSECUTIVE_ERRORS = 5
+
+# Pause after a capture error before retrying (seconds)
+ERROR_BACKOFF = 0.5
+
+# Events kept for clients; older ones are discarded
+MAX_EVENTS = 10000
+
+
+class RingBuffer:
+    """
+    Fixed-capacity ring of equally shaped segments with timestamps.
+
+    Storage is allocated on the first push, when the segment shape is
+    known. Every segment gets a sequence number; gaps in the sequence
+    numbers a reader sees are segments it lost to overwriting.
+    """
+
+    def __init__(self, capacity: int, dtype=np.float32):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.dtype = np.dtype(dtype)
+        self.data: Optional[np.ndarray] = None
+        self.timestamps = np.zeros(capacity, dtype=np.float64)
+        self.written = 0     # segments pushed so far (next sequence number)
+        self.read = 0        # next sequence number to pull
+        self.dropped = 0     # unread segments overwritten
+        self._lock = threading.Lock()
+
+    @property
+    def shape(self) -> Optional[Tuple[int, ...]]:
+        """Shape of one segment, or None before the first push."""
+        return None if self.data is None else self.data.shape[1:]
+
+    def __len__(self) -> int:
+        """Number of unread segments."""
+        with self._lock:
+            return self.written - self.read
+
+    def push(self, segment: np.ndarray, timestamp: float) -> int:
+        """
+        Store one segment. Return its sequence number.
+
+        A segment whose shape differs from the first one is truncated or
+        NaN-padded along each axis to fit.
+        """
+        segment = np.asarray(segment)
+        with self._lock:
+            if self.data is None:
+                self.data = np.empty((self.capacity,) + segment.shape, dtype=self.dtype)
+            slot = self.data[self.written % self.capacity]
+            if segment.shape == slot.shape:
+                slot[...] = segment
+            else:
+                slot.fill(np.nan)
+                fit = tuple(slice(0, min(a, b)) for a, b in zip(segment.shape, slot.shape))
+                slot[fit] = segment[fit]
+            self.timestamps[self.written % self.capacity] = timestamp
+            seq = self.written
+            self.written += 1
+            if self.written - self.read > self.capacity:
+                self.dropped += self.written - self.read - self.capacity
+                self.read = self.written - self.capacity
+            return seq
+
+    def pull(self, max_segments: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Take unread segments, oldest first.
+
+        Returns:
+            Tuple of (sequence numbers, timestamps, segments), each a new
+            array with one entry per segment
+        """
+        with self._lock:
+            count = self.written - self.read
+            if max_segments is not None:
+                count = min(count, max_segments)
+            seqs = np.arange(self.read, self.read + count, dtype=np.int64)
+            slots = seqs % self.capacity
+            if self.data is None or count == 0:
+                empty = np.empty((0,) + (self.shape or ()), dtype=self.dtype)
+                return seqs, np.empty(0, dtype=np.float64), empty
+            self.read += count
+            return seqs, self.timestamps[slots], self.data[slots]
+
+    def latest(self, count: int = 1) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Copy of the newest segments (read or not), oldest first, without consuming."""
+        with self._lock:
+            count = min(count, self.written, self.capacity)
+            seqs = np.arange(self.written - count, self.written, dtype=np.int64)
+            slots = seqs % self.capacity
+            if self.data is None:
+                return seqs, np.empty(0, dtype=np.float64), np.empty((0,), dtype=self.dtype)
+            return seqs, self.timestamps[slots], self.data[slots]
+
+    def stats(self) -> dict:
+        """Counters for status reports."""
+        with self._lock:
+            return {
+                "capacity": self.capacity,
+                "segment_shape": list(self.shape) if self.shape else None,
+                "written": self.written,
+                "unread": self.written - self.read,
+                "dropped": self.dropped
+            }
+
+
+class AcquisitionStream:
+    """
+    Background worker that captures segments into a RingBuffer.
+
+    capture() is called repeatedly on the worker thread. It returns
+    (segment, info) for a capture, or None when no trigger arrived in
+    time (counted as a missed trigger). info may carry "bytes" for the
+    throughput figure and "events", a list of dicts that are stamped with
+    an id, the segment's sequence number and timestamp and kept for
+    pull_events(). Any exception is logged and counted; after
+    MAX_CONSECUTIVE_ERRORS in a row the stream stops itself.
+    """
+
+    def __init__(self, name: str, capture: Callable[[], Optional[Tuple[np.ndarray, Dict[str, Any]]]],
+                 capacity: int = 256, dtype=np.float32):
+        self.name = name
+        self.ring = RingBuffer(capacity, dtype)
+        self._capture = capture
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.started_at: Optional[float] = None
+        self.stopped_at: Optional[float] = None
+        self.segments = 0
+        self.missed_triggers = 0
+        self.errors = 0
+        self.last_error: Optional[str] = None
+        self.bytes = 0
+        self.info: Dict[str, Any] = {}
+        self.events: deque = deque(maxlen=MAX_EVENTS)
+        self.event_count = 0
+        self._events_lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start the capture thread (no-op if already running)."""
+        if self.running:
+            return
+        self._stop.clear()
+        self.started_at = time.time()
+        self.stopped_at = None
+        self._thread = threading.Thread(
+            target=self._run, name=f"stream-{self.name}", daemon=True)
+        self._thread.start()
+        logger.info("Stream %s started", self.name)
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Ask the worker to stop after the current capture and wait for it."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        if self.stopped_at is None:
+            self.stopped_at = time.time()
+
+    def _run(self) -> None:
+        consecutive = 0
+        while not self._stop.is_set():
+            try:
+                result = self._capture()
+            except Exception as e:
+                self.errors += 1
+                consecutive += 1
+                self.last_error = str(e)
+                logger.warning("Stream %s capture failed: %s", self.name, e)
+                if consecutive >= MAX_CONSECUTIVE_ERRORS:
+                    logger.error("Stream %s stopping after %d consecutive errors",
+                                 self.name, consecutive)
+                    break
+                self._stop.wait(ERROR_BACKOFF)
+                continue
+            consecutive = 0
+            if result is None:
+                self.missed_triggers += 1
+                continue
+            segment, info = result
+            stamp = time.time()
+            seq = self.ring.push(segment, stamp)
+            self.segments += 1
+            self.bytes += int(info.get("bytes", 0))
+            if info.get("events"):
+                self._record_events(info["events"], seq, stamp)
+            self.info = {k: v for k, v in info.items() if k not in ("bytes", "events")}
+        self.stopped_at = time.time()
+        logger.info("Stream %s stopped after %d segments", self.name, self.segments)
+
+    def pull(self, max_segments: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Take unread segments, oldest first. See RingBuffer.pull()."""
+        return self.ring.pull(max_segments)
+
+    def _record_events(self, events: List[dict], seq: int, stamp: float) -> None:
+        with self._events_lock:
+            for event in events:
+                self.events.append({"id": self.event_count, "seq": seq, "timestamp": stamp, **event})
+                self.event_count += 1
+
+    def pull_events(self, since_id: int = -1, max_events: Optional[int] = None) -> List[dict]:
+        """Events with id greater than since_id, oldest first (not consumed)."""
+        with self._events_lock:
+            events = [e for e in self.events if e["id"] > since_id]
+        return events[:max_events] if max_events is not None else events
+
+    def status(self) -> dict:
+        """Running state, counters and throughput."""
+        end = self.stopped_at or time.time()
+        elapsed = end - self.started_at if self.started_at else 0.0
+        return {
+            "name": self.name,
+            "running": self.running,
+            "elapsed_s": elapsed,
+            "segments": self.segments,
+            "missed_triggers": self.missed_triggers,
+            "errors": self.errors,
+            "last_error": self.last_error,
+            "segments_per_s": self.segments / elapsed if elapsed > 0 else None,
+            "throughput_mbps": self.bytes / elapsed / 1e6 if elapsed > 0 else None,
+            "events": self.event_count,
+            **self.ring.stats(),
+            **self.info
+        }
@@ -9,14 +9,27 @@ Prevents per-call connection overhead and instrument re-initialization.
 import logging
 import threading
 import time
-from typing import Optional, Dict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
 from dataclasses import dataclass, field
 from datetime import datetime
 
-from scpi_transport import SCPISocket, SCPIConnectionError
+from scpi_transport import (
+    SCPISocket, SCPIError, SCPIConnectionError, PacingPolicy, ResponseFramer, pacing_for
+)
 
 logger = logging.getLogger(__name__)
 
+# Circuit breaker for unreachable instruments
+BREAKER_THRESHOLD = 3       # consecutive connect failures before failing fast
+BREAKER_BACKOFF = 5.0       # seconds - first open window
+BREAKER_MAX_BACKOFF = 300.0 # seconds - cap for the doubling back-off
+
+CIRCUIT_CLOSED = "closed"        # connect normally
+CIRCUIT_OPEN = "open"            # fail fast until the back-off window ends
+CIRCUIT_HALF_OPEN = "half_open"  # window ended: next connect is a probe
+
 
 @dataclass
 class InstrumentConfig:
@@ -26,6 +39,11 @@ class InstrumentConfig:
     port: int = 5555
     timeout: float = 10.0
     instrument_type: str = "generic"  # rsa5065n, mso8204, generic
+    pacing: Optional[PacingPolicy] = None  # None = per-model default
+
+    def pacing_policy(self) -> PacingPolicy:
+        """Return the configured pacing policy or the per-model default."""
+        return self.pacing or pacing_for(self.instrument_type)
 
 
 @dataclass
@@ -36,8 +54,11 @@ class InstrumentState:
     identity: Optional[str] = None
     connected_at: Optional[datetime] = None
     last_error: Optional[str] = None
-    error_count: int = 0
+    error_count: int = 0            # consecutive connect failures
+    retry_at: float = 0.0           # monotonic time the open circuit allows a probe
+    backoff: float = 0.0            # current open window in seconds
     detected_mode: Optional[str] = None  # "scpi", "tsp", or None
+    framer: ResponseFramer = field(default_factory=ResponseFramer)  # survives reconnects
 
 
 # Default instrument registry
@@ -65,6 +86,11 @@ class ConnectionPool:
     - Maintains persistent TCP connections
     - Reconnects automatically on socket errors
     - Supports both named instruments and direct IP access
+    - Runs operations on several instruments in parallel (run_parallel)
+
+    The pool-wide lock only guards the registry and connection dicts;
+    network I/O for an instrument happens under that instrument's own
+    lock, so a slow or dead instrument never blocks the others.
     """
 
     def __init__(self, instruments: Optional[Dict[str, InstrumentConfig]] = None):
@@ -78,16 +104,42 @@ class ConnectionPool:
         self._instruments: Dict[str, InstrumentConfig] = instruments or DEFAULT_INSTRUMENTS.copy()
         self._connections: Dict[str, InstrumentState] = {}
         self._lock = threading.RLock()
+        self._instrument_locks: Dict[str, threading.RLock] = {}
+        self._warmup: Dict[str, Any] = {"state": "idle"}
+
+    def _lock_for(self, key: str) -> threading.RLock:
+        """Get (or create) the lock serialising I/O on one instrument."""
+        with self._lock:
+            lock = self._instrument_locks.get(key)
+            if lock is None:
+                lock = self._instrument_locks[key] = threading.RLock()
+            return lock
+
+    @contextmanager
+    def instrument_lock(self, instrument: str) -> Iterator[None]:
+        """
+        Hold exclusive access to one instrument for a multi-command operation.
+
+        Other threads using the same instrument through the pool wait;
+        other instruments are unaffected.
+        """
+        with self._lock:
+            key = self._resolve_instrument(instrument).name
+        with self._lock_for(key):
+            yield
 
     def register_instrument(self, name: str, ip: str, port: int = 5555,
-                           instrument_type: str = "generic") -> None:
+                           instrument_type: str = "generic",
+                           pacing: Optional[PacingPolicy] = None) -> None:
         """Register a new instrument or update existing config."""
-        with self._lock:
+        # Wait for any operation in progress before replacing its socket
+        with self._lock_for(name), self._lock:
             self._instruments[name] = InstrumentConfig(
                 name=name,
                 ip=ip,
                 port=port,
-                instrument_type=instrument_type
+                instrument_type=instrument_type,
+                pacing=pacing
             )
             # Disconnect if already connected with old config
             if name in self._connections:
@@ -122,35 +174,58 @@ class ConnectionPool:
             instrument_type="generic"
         )
 
-    def connect(self, instrument: str) -> dict:
+    def connect(self, instrument: str, force: bool = False) -> dict:
         """
         Connect to an instrument.
 
+        After BREAKER_THRESHOLD consecutive failures the instrument's
+        circuit opens: connects fail immediately until the back-off window
+        ends, then one probe is let through (half-open). Each failed probe
+        doubles the window up to BREAKER_MAX_BACKOFF; a success closes it.
+        Any failure while connecting counts, including a timeout or bad
+        reply to the *IDN? handshake.
+
         Args:
             instrument: Instrument name or IP address
+            force: Attempt the connection even if the circuit is open
 
         Returns:
             Dict with connection status and identity
         """
         with self._lock:
             config = self._resolve_instrument(instrument)
-            key = config.name
+        key = config.name
 
+        with self._lock_for(key):
             # Check if already connected
-            if key in self._connections:
-                state = self._connections[key]
-                if state.socket and state.socket.connected:
-                    return {
-                        "connected": True,
-                        "identity": state.identity,
-                        "instrument": key,
-                        "ip": config.ip,
-                        "already_connected": True
-                    }
-
-            # Create new connection
+            with self._lock:
+                previous = self._connections.get(key)
+            if previous and previous.socket and previous.socket.connected:
+                return {
+                    "connected": True,
+                    "identity": previous.identity,
+                    "instrument": key,
+                    "ip": config.ip,
+                    "already_connected": True
+                }
+
+            if not force and previous and self._circuit(previous) == CIRCUIT_OPEN:
+                retry_in = previous.retry_at - time.monotonic()
+                return {
+                    "connected": False,
+                    "error": f"Circuit open after {previous.error_count} failures "
+                             f"({previous.last_error}); retry in {retry_in:.1f}s",
+                    "instrument": key,
+                    "ip": config.ip,
+                    "circuit": CIRCUIT_OPEN
+                }
+
+            # Create new connection, keeping learned reply shapes and counters
+            framer = previous.framer if previous else ResponseFramer()
+            sock = None
             try:
-                sock = SCPISocket(config.ip, config.port, config.timeout)
+                sock = SCPISocket(config.ip, config.port, config.timeout,
+                                  policy=config.pacing_policy(), framer=framer)
                 identity = sock.connect()
 
                 state = InstrumentState(
@@ -158,9 +233,11 @@ class ConnectionPool:
                     socket=sock,
                     identity=identity,
                     connected_at=datetime.now(),
-                    error_count=0
+                    error_count=0,
+                    framer=framer
                 )
-                self._connections[key] = state
+                with self._lock:
+                    self._connections[key] = state
 
                 logger.info("Connected to %s (%s): %s", key, config.ip, identity)
 
@@ -172,25 +249,49 @@ class ConnectionPool:
                     "already_connected": False
                 }
 
-            except SCPIConnectionError as e:
+            except SCPIError as e:
                 logger.error("Failed to connect to %s (%s): %s", key, config.ip, e)
+                if sock is not None:
+                    sock.close()
                 # Track failed attempt
-                if key in self._connections:
-                    self._connections[key].last_error = str(e)
-                    self._connections[key].error_count += 1
-                else:
-                    self._connections[key] = InstrumentState(
-                        config=config,
-                        last_error=str(e),
-                        error_count=1
-                    )
+                with self._lock:
+                    state = self._connections.get(key)
+                    if state is None:
+                        state = self._connections[key] = InstrumentState(
+                            config=config,
+                            framer=framer
+                        )
+                    state.last_error = str(e)
+                    state.error_count += 1
+                    if state.error_count >= BREAKER_THRESHOLD:
+                        self._trip(key, state)
                 return {
                     "connected": False,
                     "error": str(e),
                     "instrument": key,
-                    "ip": config.ip
+                    "ip": config.ip,
+                    "circuit": self._circuit(state)
                 }
 
+    def _trip(self, key: str, state: InstrumentState) -> None:
+        """Open the circuit, doubling the back-off after a failed probe."""
+        if state.backoff:
+            state.backoff = min(state.backoff * 2, BREAKER_MAX_BACKOFF)
+        else:
+            state.backoff = BREAKER_BACKOFF
+        state.retry_at = time.monotonic() + state.backoff
+        logger.warning("Circuit open for %s after %d failures; retry in %.0fs",
+                       key, state.error_count, state.backoff)
+
+    @staticmethod
+    def _circuit(state: InstrumentState) -> str:
+        """Circuit breaker state for an instrument."""
+        if state.error_count < BREAKER_THRESHOLD:
+            return CIRCUIT_CLOSED
+        if time.monotonic() < state.retry_at:
+            return CIRCUIT_OPEN
+        return CIRCUIT_HALF_OPEN
+
     def disconnect(self, instrument: str) -> dict:
         """
         Disconnect from an instrument.
@@ -202,8 +303,9 @@ class ConnectionPool:
             Dict with disconnection status
         """
         with self._lock:
-            config = self._resolve_instrument(instrument)
-            key = config.name
+            key = self._resolve_instrument(instrument).name
+        # Wait for any operation in progress on this instrument
+        with self._lock_for(key), self._lock:
             return self._disconnect(key)
 
     def _disconnect(self, key: str) -> dict:
@@ -238,13 +340,14 @@ class ConnectionPool:
         """
         with self._lock:
             config = self._resolve_instrument(instrument)
-            key = config.name
+        key = config.name
 
+        with self._lock_for(key):
             # Check existing connection
-            if key in self._connections:
-                state = self._connections[key]
-                if state.socket and state.socket.connected:
-                    return state.socket
+            with self._lock:
+                state = self._connections.get(key)
+            if state and state.socket and state.socket.connected:
+                return state.socket
 
             # Need to connect
             if auto_reconnect:
@@ -265,15 +368,17 @@ class ConnectionPool:
         Returns:
             "scpi", "tsp", or None if detection failed
         """
-        if key not in self._connections:
-            return None
-
-        state = self._connections[key]
-        if not state.socket or not state.socket.connected:
+        with self._lock:
+            state = self._connections.get(key)
+        if state is None or not state.socket or not state.socket.connected:
             return None
 
         sock = state.socket
+        with self._lock_for(key):
+            return self._detect_dmm_mode(state, sock)
 
+    def _detect_dmm_mode(self, state: InstrumentState, sock: SCPISocket) -> Optional[str]:
+        """Probe SCPI then TSP (must hold the instrument lock)."""
         # Try SCPI first - *IDN? should work in SCPI mode
         try:
             response = sock.query("*IDN?")
@@ -288,7 +393,6 @@ class ConnectionPool:
         try:
             # In TSP mode, we need to use print() to get output
             sock._send(b"print(localnode.model)\n")
-            import time
             time.sleep(0.1)
             response = sock._recv_until().decode("ascii", errors="replace").strip()
             if "DMM6500" in response.upper():
@@ -338,6 +442,10 @@ class ConnectionPool:
                     "identity": None
                 }
 
+                if config:
+                    policy = config.pacing_policy()
+                    info["pacing"] = {"mode": policy.mode, "min_gap_s": policy.min_gap}
+
                 if state:
                     info["connected"] = state.socket is not None and state.socket.connected
                     info["identity"] = state.identity
@@ -346,18 +454,135 @@ class ConnectionPool:
                     if state.last_error:
                         info["last_error"] = state.last_error
                     info["error_count"] = state.error_count
+                    circuit = {"state": self._circuit(state)}
+                    if circuit["state"] != CIRCUIT_CLOSED:
+                        circuit["backoff_s"] = state.backoff
+                        circuit["retry_in_s"] = max(0.0, state.retry_at - time.monotonic())
+                    info["circuit"] = circuit
                     if state.detected_mode:
                         info["detected_mode"] = state.detected_mode
+                    info["framing"] = state.framer.stats()
 
                 instruments.append(info)
 
-            return {"instruments": instruments}
+            return {"instruments": instruments, "warmup": dict(self._warmup)}
+
+    def run_parallel(self, tasks: Dict[str, Callable[[SCPISocket], Any]],
+                     max_workers: Optional[int] = None) -> Dict[str, dict]:
+        """
+        Run one operation per instrument concurrently.
+
+        Each callable receives the instrument's socket (connecting if
+        needed) and runs on a worker thread while holding that
+        instrument's lock, so the whole fan-out takes about as long as
+        the slowest instrument rather than the sum of all of them.
+
+        Args:
+            tasks: Dict mapping instrument name or IP to fn(sock)
+            max_workers: Thread count (default: one per instrument)
+
+        Returns:
+            Dict mapping each instrument to {"ok", "result" or "error",
+            "elapsed_s"}.
+
+        Example:
+            pool.run_parallel({
+                "dp932a-1": lambda s: s.write(":VOLT 5,CH1"),
+                "dmm6500": lambda s: float(s.query(":READ?")),
+                "mso8204": lambda s: s.query_many([":MEAS:VPP?", ":MEAS:FREQ?"]),
+            })
+        """
+        def run(instrument: str, fn: Callable[[SCPISocket], Any]) -> dict:
+            t0 = time.monotonic()
+            try:
+                with self.instrument_lock(instrument):
+                    result = fn(self.get_socket(instrument))
+                outcome = {"ok": True, "result": result}
+            except Exception as e:
+                logger.warning("Parallel task on %s failed: %s", instrument, e)
+                outcome = {"ok": False, "error": str(e)}
+            outcome["elapsed_s"] = time.monotonic() - t0
+            return outcome
+
+        if not tasks:
+            return {}
+        with ThreadPoolExecutor(max_workers=max_workers or len(tasks),
+                                thread_name_prefix="scpi") as executor:
+            futures = {name: executor.submit(run, name, fn) for name, fn in tasks.items()}
+            return {name: future.result() for name, future in futures.items()}
+
+    def warm_up(self, instruments: Optional[List[str]] = None,
+                background: bool = True) -> dict:
+        """
+        Connect to instruments in parallel ahead of first use.
+
+        Each connection caches *IDN?, and DMM6500s also get their SCPI/TSP
+        mode detected, so the first tool call finds a ready socket and an
+        unreachable instrument only costs its timeout once, off the call
+        path. Progress is reported under "warmup" in status().
+
+        Args:
+            instruments: Names to connect (default: all registered)
+            background: Run on a daemon thread and return immediately
+
+        Returns:
+            Warm-up status dict
+        """
+        with self._lock:
+            if self._warmup["state"] == "running":
+                return dict(self._warmup)
+            names = list(instruments or self._instruments)
+            self._warmup = {
+                "state": "running",
+                "started_at": datetime.now().isoformat(),
+                "instruments": names
+            }
+
+        if background:
+            threading.Thread(target=self._run_warm_up, args=(names,),
+                             name="scpi-warmup", daemon=True).start()
+        else:
+            self._run_warm_up(names)
+        return self.warmup_status()
+
+    def _run_warm_up(self, names: List[str]) -> None:
+        t0 = time.monotonic()
+        results = self.run_parallel({
+            name: (lambda sock, name=name: self._warm_one(name, sock))
+            for name in names
+        })
+        with self._lock:
+            self._warmup.update({
+                "state": "done",
+                "finished_at": datetime.now().isoformat(),
+                "elapsed_s": time.monotonic() - t0,
+                "ready": [name for name, r in results.items() if r["ok"]],
+                "failed": {name: r["error"] for name, r in results.items() if not r["ok"]}
+            })
+        logger.info("Warm-up finished in %.2fs: %d/%d instruments ready",
+                    time.monotonic() - t0, len(self._warmup["ready"]), len(names))
+
+    def _warm_one(self, name: str, sock: SCPISocket) -> dict:
+        """Connect-time work for one instrument (runs under its lock)."""
+        key = self._resolve_instrument(name).name
+        mode = None
+        if self._connections[key].config.instrument_type == "dmm6500":
+            mode = self.detect_dmm_mode(key)
+        return {"identity": sock.identity, "detected_mode": mode}
+
+    def warmup_status(self) -> dict:
+        """Return the state of the last warm_up() run."""
+        with self._lock:
+            return dict(self._warmup)
 
     def disconnect_all(self) -> None:
-        """Disconnect from all instruments."""
+        """Disconnect from all instruments, each once its current operation ends."""
         with self._lock:
-            for key in list(self._connections.keys()):
-                self._disconnect(key)
+            keys = list(self._connections.keys())
+        for key in keys:
+            with self._lock_for(key), self._lock:
+                if key in self._connections:
+                    self._disconnect(key)
 
 
 # Global connection pool instance
@@ -8,6 +8,11 @@ from .dmm6500_tsp import DMM6500_TSP
 from .dl3021a import DL3021A
 from .dg2052 import DG2052
 from .dp932a import DP932A
+from .async_base import AsyncBaseInstrument
+from .async_drivers import (
+    AsyncRSA5065N, AsyncMSO8204, AsyncDMM6500, AsyncDMM6500_TSP,
+    AsyncDL3021A, AsyncDG2052, AsyncDP932A, ASYNC_DRIVERS, open_async_instruments,
+)
 
 __all__ = [
     "BaseInstrument",
@@ -18,4 +23,14 @@ __all__ = [
     "DL3021A",
     "DG2052",
     "DP932A",
+    "AsyncBaseInstrument",
+    "AsyncRSA5065N",
+    "AsyncMSO8204",
+    "AsyncDMM6500",
+    "AsyncDMM6500_TSP",
+    "AsyncDL3021A",
+    "AsyncDG2052",
+    "AsyncDP932A",
+    "ASYNC_DRIVERS",
+    "open_async_instruments",
 ]
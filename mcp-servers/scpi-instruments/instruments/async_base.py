@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Async Base Instrument - asyncio counterpart of BaseInstrument.
+
+Drivers built on this class await an AsyncSCPISocket, so one event loop
+can run operations on every bench instrument concurrently.
+"""
+
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from typing import List, Optional, Tuple
+
+from scpi_async import AsyncSCPISocket
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncBaseInstrument(ABC):
+    """
+    Abstract base class for asyncio SCPI instrument drivers.
+
+    Wraps an AsyncSCPISocket; every I/O method is a coroutine. Pacing,
+    reply framing and batching are the socket's, which shares them with
+    SCPISocket. Drivers reuse the command tables of their synchronous
+    counterparts and return the same result dicts.
+    """
+
+    def __init__(self, socket: AsyncSCPISocket):
+        """
+        Initialize instrument with an existing socket connection.
+
+        Args:
+            socket: Connected AsyncSCPISocket instance
+        """
+        self._sock = socket
+
+    @property
+    def socket(self) -> AsyncSCPISocket:
+        """Get the underlying socket."""
+        return self._sock
+
+    @property
+    def identity(self) -> Optional[str]:
+        """Get cached instrument identity."""
+        return self._sock.identity
+
+    @property
+    def connected(self) -> bool:
+        """Check if socket is connected."""
+        return self._sock.connected
+
+    # ---- Low-level SCPI ----
+
+    async def write(self, cmd: str) -> None:
+        """Send SCPI command (no response)."""
+        await self._sock.write(cmd)
+
+    async def query(self, cmd: str) -> str:
+        """Send SCPI query and return response."""
+        return await self._sock.query(cmd)
+
+    async def query_many(self, cmds: List[str]) -> List[str]:
+        """Send several queries in one round-trip and return the responses."""
+        return await self._sock.query_many(cmds)
+
+    async def query_block(self, cmd: str) -> bytearray:
+        """Send SCPI query and return block data."""
+        return await self._sock.query_block(cmd)
+
+    async def query_block_into(self, cmd: str, buf) -> int:
+        """Send SCPI query and read block data into a reusable buffer."""
+        return await self._sock.query_block_into(cmd, buf)
+
+    async def query_opc(self) -> bool:
+        """Wait for *OPC? to return '1'."""
+        return await self._sock.query_opc()
+
+    def batch(self):
+        """
+        Coalesce writes into one compound SCPI message.
+
+        Use as `async with self.batch():`. See AsyncSCPISocket.batch().
+        """
+        return self._sock.batch()
+
+    # ---- Common operations ----
+
+    async def reset(self) -> dict:
+        """
+        Reset instrument to defaults.
+
+        Returns:
+            Dict with ok status and errors_drained count
+        """
+        await self.write("*RST")
+        await asyncio.sleep(1.0)  # Reset needs settling time
+        await self.query_opc()
+        errors = await self.clear_errors()
+        return {"ok": True, "errors_drained": errors}
+
+    async def check_error(self) -> Tuple[int, str]:
+        """
+        Query error queue for one error.
+
+        Returns:
+            Tuple of (code, message). Code 0 means no error.
+        """
+        return await self._sock.check_error()
+
+    async def clear_errors(self) -> int:
+        """
+        Drain error queue until empty.
+
+        Returns:
+            Number of errors cleared.
+        """
+        return await self._sock.clear_errors()
+
+    # ---- Abstract methods for subclasses ----
+
+    @abstractmethod
+    def get_type(self) -> str:
+        """Return instrument type identifier."""
+        pass
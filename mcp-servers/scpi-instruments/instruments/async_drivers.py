@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Async instrument drivers - asyncio variants of the bench drivers.
+
+Each class covers the operations that are run concurrently across the
+bench: output/input control, measurements and sweeps. Commands, tables
+and result dicts come from the synchronous driver of the same name; the
+MCP tools keep using the synchronous drivers.
+
+Usage:
+    drivers = await open_async_instruments(INSTRUMENTS)
+    psu, dmm = drivers["dp932a-1"], drivers["dmm6500"]
+    supply, reading = await asyncio.gather(psu.measure(1), dmm.measure())
+"""
+
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING, Dict, List
+
+import numpy as np
+
+from .async_base import AsyncBaseInstrument
+from .dmm6500 import DMM6500
+from .dmm6500_tsp import BINARY_RESTORE, UNITS as TSP_UNITS
+from .mso8204 import MEASUREMENTS, MSO8204, measure_name
+from .rsa5065n import TRACE_DTYPE, frequency_axis
+from scpi_async import AsyncSCPISocket, open_async_sockets
+from scpi_transport import SCPIError
+
+if TYPE_CHECKING:
+    from connection_pool import InstrumentConfig
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncRSA5065N(AsyncBaseInstrument):
+    """Asyncio driver for Rigol RSA5065N Real-Time Spectrum Analyser."""
+
+    def get_type(self) -> str:
+        return "rsa5065n"
+
+    async def single_sweep(self) -> dict:
+        """Trigger a single sweep and wait for completion. See RSA5065N.single_sweep()."""
+        await self.write(":INIT:CONT OFF")  # Single sweep mode
+        t0 = time.time()
+        await self.write(":INIT:IMM")  # Trigger sweep
+        await self.query_opc()  # Wait for completion
+        return {"elapsed_s": time.time() - t0}
+
+    async def trace_array(self, trace: int = 1) -> dict:
+        """
+        Read trace data as NumPy arrays. See RSA5065N.trace_array().
+
+        The data format and frequency span are read in the same round-trip.
+        """
+        fmt, start, stop = await self.query_many([":FORM:DATA?", ":FREQ:STAR?", ":FREQ:STOP?"])
+        cmd = f":TRAC:DATA? TRACE{trace}"
+        if "REAL" in fmt.upper():
+            fmt = "REAL32"
+            values = np.frombuffer(await self.query_block(cmd), dtype=TRACE_DTYPE)
+        else:
+            fmt = "ASCII"
+            values = np.array((await self.query(cmd)).split(","), dtype=np.float32)
+        return {
+            "trace_dbm": values,
+            "freq_hz": frequency_axis(float(start), float(stop), values.size),
+            "points": values.size,
+            "format": fmt
+        }
+
+    async def sweep(self, trace: int = 1) -> dict:
+        """Single sweep, then the trace as arrays with elapsed_s."""
+        sweep_result = await self.single_sweep()
+        return {**await self.trace_array(trace), "elapsed_s": sweep_result["elapsed_s"]}
+
+
+class AsyncMSO8204(AsyncBaseInstrument):
+    """Asyncio driver for Rigol MSO8204 Mixed Signal Oscilloscope."""
+
+    def get_type(self) -> str:
+        return "mso8204"
+
+    async def acquire(self, mode: str = "RUN") -> dict:
+        """Control acquisition (RUN, STOP or SINGle). See MSO8204.acquire()."""
+        commands = {"RUN": ":RUN", "STOP": ":STOP", "SINGLE": ":SINGle"}
+        if mode.upper() not in commands:
+            return {"error": f"Invalid mode: {mode}"}
+        await self.write(commands[mode.upper()])
+        return {
+            "mode": mode.upper(),
+            "trigger_status": (await self.query(":TRIGger:STATus?")).strip()
+        }
+
+    async def measure(self, channel: int, measurements: List[str]) -> dict:
+        """
+        Take measurements on a channel in one round-trip. See MSO8204.measure().
+
+        Returns:
+            Dict with channel and results mapping (keyed by the names given)
+        """
+        unknown = [m for m in measurements if measure_name(m) is None]
+        if unknown:
+            return {"error": f"Unknown measurements {unknown}. Valid: {MEASUREMENTS}"}
+        async with self.batch() as b:
+            await self.write(f":MEASure:SOURce CHANnel{channel}")
+            for m in measurements:
+                b.query(f":MEASure:{measure_name(m)}?")
+        return {
+            "channel": channel,
+            "results": {m: MSO8204._to_float(v) for m, v in zip(measurements, b.results)}
+        }
+
+
+class AsyncDMM6500(AsyncBaseInstrument):
+    """Asyncio driver for Keithley DMM6500 in SCPI mode."""
+
+    _get_unit = DMM6500._get_unit
+
+    def get_type(self) -> str:
+        return "dmm6500"
+
+    async def measure(self) -> dict:
+        """Take a single measurement with current configuration. See DMM6500.measure()."""
+        try:
+            reading, func = await self.query_many([":READ?", ":SENS:FUNC?"])
+            func = func.strip().strip('"')
+            return {
+                "value": float(reading),
+                "function": func,
+                "unit": self._get_unit(func)
+            }
+        except (ValueError, SCPIError) as e:
+            logger.error("Measurement failed: %s", e)
+            return {"error": str(e)}
+
+
+class AsyncDMM6500_TSP(AsyncBaseInstrument):
+    """Asyncio driver for Keithley DMM6500 in TSP mode."""
+
+    def get_type(self) -> str:
+        return "dmm6500_tsp"
+
+    async def tsp_query(self, expr: str) -> str:
+        """
+        Query a TSP expression (wrapped in print()) and return the result.
+
+        The socket keeps no per-connection cache, so every query carries
+        BINARY_RESTORE in case a synchronous download left the meter in REAL32.
+        """
+        cmd = expr if expr.strip().startswith("print") else f"print({expr})"
+        return await self._sock.query(f"{BINARY_RESTORE} {cmd}")
+
+    async def reset(self) -> dict:
+        """Reset instrument using TSP reset(). See DMM6500_TSP.reset()."""
+        await self.write("reset()")
+        await asyncio.sleep(1.5)  # Reset settling plus the post-reset delay
+        await self.write("eventlog.clear()")
+        return {"ok": True, "mode": "tsp"}
+
+    async def clear_errors(self) -> int:
+        """Clear event log. Returns number of errors cleared."""
+        count = int(float(await self.tsp_query("eventlog.getcount(eventlog.SEV_ERROR)")))
+        await self.write("eventlog.clear()")
+        return count
+
+    async def measure(self) -> dict:
+        """Take a single measurement with current configuration. See DMM6500_TSP.measure()."""
+        try:
+            reading, func = (await self.tsp_query("dmm.measure.read(), dmm.measure.func")).split("\t")
+            func = func.strip()
+            return {
+                "value": float(reading),
+                "function": func,
+                "unit": TSP_UNITS.get(func, ""),
+                "mode": "tsp"
+            }
+        except (ValueError, SCPIError) as e:
+            return {"error": str(e)}
+
+
+class AsyncDL3021A(AsyncBaseInstrument):
+    """Asyncio driver for Rigol DL3021A DC Electronic Load."""
+
+    def get_type(self) -> str:
+        return "dl3021a"
+
+    async def input_state(self, enabled: bool) -> dict:
+        """
+        Enable or disable the load input. See DL3021A.input_state().
+
+        CAUTION: Enabling input will sink current from connected source.
+        """
+        await self.write(f":SOUR:INP:STAT {'ON' if enabled else 'OFF'}")
+        actual = (await self.query(":SOUR:INP:STAT?")).strip()
+        return {
+            "input_enabled": actual in ["1", "ON"],
+            "requested": enabled
+        }
+
+    async def measure(self) -> dict:
+        """Read voltage, current and power. See DL3021A.measure()."""
+        voltage, current, power = (
+            float(v) for v in await self.query_many([":MEAS:VOLT?", ":MEAS:CURR?", ":MEAS:POW?"])
+        )
+        return {
+            "voltage_v": voltage,
+            "current_a": current,
+            "power_w": power
+        }
+
+
+class AsyncDG2052(AsyncBaseInstrument):
+    """Asyncio driver for Rigol DG2052 Function/Arbitrary Waveform Generator."""
+
+    def get_type(self) -> str:
+        return "dg2052"
+
+    async def output_state(self, channel: int, enabled: bool) -> dict:
+        """
+        Enable or disable channel output. See DG2052.output_state().
+
+        CAUTION: Enabling output will produce signal on connected device.
+        """
+        await self.write(f":OUTP{channel}:STAT {'ON' if enabled else 'OFF'}")
+        actual = (await self.query(f":OUTP{channel}:STAT?")).strip()
+        return {
+            "channel": channel,
+            "output_enabled": actual in ["1", "ON"],
+            "requested": enabled
+        }
+
+
+class AsyncDP932A(AsyncBaseInstrument):
+    """Asyncio driver for Rigol DP932A Programmable Linear DC Power Supply."""
+
+    def get_type(self) -> str:
+        return "dp932a"
+
+    async def output_state(self, channel: int, enabled: bool) -> dict:
+        """
+        Enable or disable channel output. See DP932A.output_state().
+
+        CAUTION: Enabling output will apply voltage to connected load.
+        """
+        await self.write(f":OUTP {'ON' if enabled else 'OFF'},CH{channel}")
+        actual = (await self.query(f":OUTP? CH{channel}")).strip()
+        return {
+            "channel": channel,
+            "output_enabled": actual in ["1", "ON"],
+            "requested": enabled
+        }
+
+    async def all_outputs_off(self) -> dict:
+        """Disable all outputs. See DP932A.all_outputs_off()."""
+        async with self.batch():
+            await self.write(":OUTP OFF,CH1")
+            await self.write(":OUTP OFF,CH2")
+            await self.write(":OUTP OFF,CH3")
+
+        ch1, ch2, ch3 = await self.query_many([":OUTP? CH1", ":OUTP? CH2", ":OUTP? CH3"])
+        return {
+            "all_off": True,
+            "ch1": ch1 in ["0", "OFF"],
+            "ch2": ch2 in ["0", "OFF"],
+            "ch3": ch3 in ["0", "OFF"],
+        }
+
+    async def set_channel(self, channel: int, voltage_v: float, current_a: float) -> dict:
+        """Set voltage and current limit for a channel. See DP932A.set_channel()."""
+        async with self.batch():
+            await self.write(f":VOLT {voltage_v},CH{channel}")
+            await self.write(f":CURR {current_a},CH{channel}")
+
+        actual_v, actual_i = (
+            float(v) for v in await self.query_many([f":VOLT? CH{channel}", f":CURR? CH{channel}"])
+        )
+        return {
+            "channel": channel,
+            "voltage_v": actual_v,
+            "current_a": actual_i
+        }
+
+    async def measure(self, channel: int) -> dict:
+        """Read voltage, current and power for a channel. See DP932A.measure()."""
+        voltage, current, power = (
+            float(v) for v in await self.query_many([
+                f":MEAS:VOLT? CH{channel}", f":MEAS:CURR? CH{channel}", f":MEAS:POW? CH{channel}"
+            ])
+        )
+        return {
+            "channel": channel,
+            "voltage_v": voltage,
+            "current_a": current,
+            "power_w": power
+        }
+
+    async def measure_all(self) -> dict:
+        """Read measurements for all channels."""
+        ch1, ch2, ch3 = [await self.measure(ch) for ch in (1, 2, 3)]
+        return {"ch1": ch1, "ch2": ch2, "ch3": ch3}
+
+
+# Instrument type -> async driver class
+ASYNC_DRIVERS = {
+    "rsa5065n": AsyncRSA5065N,
+    "mso8204": AsyncMSO8204,
+    "dmm6500": AsyncDMM6500,
+    "dmm6500_tsp": AsyncDMM6500_TSP,
+    "dl3021a": AsyncDL3021A,
+    "dg2052": AsyncDG2052,
+    "dp932a": AsyncDP932A,
+}
+
+
+async def open_async_instruments(configs: Dict[str, "InstrumentConfig"]) -> Dict[str, AsyncBaseInstrument]:
+    """
+    Connect to several instruments concurrently and wrap each in its driver.
+
+    Args:
+        configs: Dict mapping instrument names to InstrumentConfig
+
+    Returns:
+        Dict mapping names to async drivers. Instruments that fail to
+        connect, or whose type has no async driver, are logged and omitted.
+    """
+    socks: Dict[str, AsyncSCPISocket] = await open_async_sockets(configs)
+    drivers = {}
+    for name, sock in socks.items():
+        driver = ASYNC_DRIVERS.get(configs[name].instrument_type)
+        if driver is None:
+            logger.error("No async driver for %s (%s)", name, configs[name].instrument_type)
+            await sock.close()
+            continue
+        drivers[name] = driver(sock)
+    return drivers
@@ -6,14 +6,52 @@ Provides common functionality shared by all instrument types.
 """
 
 import logging
+import math
+import re
 import time
 from abc import ABC, abstractmethod
-from typing import Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from scpi_transport import SCPISocket
 
 logger = logging.getLogger(__name__)
 
+# Boolean spellings that instruments read back as 1/0
+_BOOL_VALUES = {"ON": "1", "OFF": "0"}
+
+
+def _setting_keys(value) -> set:
+    """
+    Comparable forms of a setting value: a float if numeric, else the
+    upper-case text plus, for a mixed-case SCPI keyword such as "CHANnel1",
+    its short form ("CHAN1"), which is what instruments read back.
+    """
+    text = str(value).strip().strip('"')
+    forms = {text.upper()}
+    if text != text.upper() and text != text.lower():
+        forms.add(re.sub(r"[a-z]", "", text))
+    keys = set()
+    for form in forms:
+        form = _BOOL_VALUES.get(form, form)
+        try:
+            keys.add(float(form))
+        except ValueError:
+            keys.add(form)
+    return keys
+
+
+def _same_setting(a, b) -> bool:
+    """True if two setting values (as written or as read back) are equal."""
+    a_keys, b_keys = _setting_keys(a), _setting_keys(b)
+    for x in a_keys:
+        for y in b_keys:
+            if isinstance(x, float) and isinstance(y, float):
+                if math.isclose(x, y, rel_tol=1e-9, abs_tol=1e-15):
+                    return True
+            elif x == y:
+                return True
+    return False
+
 
 class BaseInstrument(ABC):
     """
@@ -21,10 +59,21 @@ class BaseInstrument(ABC):
 
     Wraps an SCPISocket and provides common instrument operations.
     Subclasses implement instrument-specific commands.
+
+    Inter-command pacing is applied by the socket's PacingPolicy, so
+    drivers do not sleep between commands themselves.
+
+    Setting values are shadowed per connection (see shadow): reads come
+    from memory unless fresh values are asked for, and writes keep the
+    shadow current. Commands listed in INVALIDATED_BY drop the settings
+    they change.
     """
 
-    # Inter-command pacing delay (seconds)
-    PACING = 0.05  # 50 ms
+    # Upper-case command header -> shadow header prefixes it invalidates ("" = all)
+    INVALIDATED_BY: Dict[str, Tuple[str, ...]] = {
+        "*RST": ("",),
+        "*RCL": ("",),
+    }
 
     def __init__(self, socket: SCPISocket):
         """
@@ -53,21 +102,194 @@ class BaseInstrument(ABC):
     # ---- Low-level SCPI ----
 
     def write(self, cmd: str) -> None:
-        """Send SCPI command (no response)."""
+        """Send SCPI command (no response), updating the shadow state."""
         self._sock.write(cmd)
+        self._track_write(cmd)
 
     def query(self, cmd: str) -> str:
         """Send SCPI query and return response."""
         return self._sock.query(cmd)
 
-    def query_block(self, cmd: str) -> bytes:
+    def query_many(self, cmds: List[str]) -> List[str]:
+        """Send several queries in one round-trip and return the responses."""
+        return self._sock.query_many(cmds)
+
+    def query_block(self, cmd: str) -> bytearray:
         """Send SCPI query and return block data."""
         return self._sock.query_block(cmd)
 
+    def query_block_into(self, cmd: str, buf) -> int:
+        """Send SCPI query and read block data into a reusable buffer."""
+        return self._sock.query_block_into(cmd, buf)
+
+    def query_block_stream(self, cmd: str, sink, progress=None) -> int:
+        """Send SCPI query and stream block data to a file, hash or callback."""
+        return self._sock.query_block_stream(cmd, sink, progress)
+
     def query_opc(self) -> bool:
         """Wait for *OPC? to return '1'."""
         return self._sock.query_opc()
 
+    def batch(self):
+        """
+        Coalesce writes into one compound SCPI message.
+
+        See SCPISocket.batch(). Writes inside the block are sent in a single
+        round-trip when the block exits.
+        """
+        return self._sock.batch()
+
+    # ---- Shadow state ----
+
+    @property
+    def shadow(self) -> Dict[str, str]:
+        """
+        Last known value of each setting, keyed by SCPI header.
+
+        Filled from readbacks and from write_setting(). It is kept in the
+        connection cache, so it outlives the driver object and is dropped
+        on reconnect, reset and raw SCPI writes. Changes made on the front
+        panel are not seen; call forget() after anything that changes
+        settings behind the driver's back.
+        """
+        return self._sock.cache.setdefault("shadow", {})
+
+    def _track_write(self, cmd: str) -> None:
+        """
+        Keep the shadow state consistent with a command just written.
+
+        Commands in INVALIDATED_BY drop the settings they affect; settings
+        already shadowed then take the written value (write-through). Other
+        writes are not recorded, so the shadow only holds queryable settings.
+
+        Inside batch() nothing has been sent yet: the affected settings are
+        dropped now and the written values are taken once the batch has
+        been sent, so an abandoned batch leaves them unknown.
+        """
+        batch = self._sock.batching
+        if batch is not None:
+            headers = [part.split(None, 1)[0] for part in cmd.split(";") if part.strip()]
+            for header in headers:
+                prefixes = self.INVALIDATED_BY.get(header.upper())
+                if prefixes is not None:
+                    self.forget(*prefixes)
+                self.shadow.pop(header, None)
+            batch.on_flush(lambda: self._track_write(cmd), lambda: self.forget(*headers))
+            return
+        shadow = self._sock.cache.get("shadow")
+        if not shadow:
+            return
+        for part in cmd.split(";"):
+            fields = part.split(None, 1)
+            if not fields:
+                continue
+            prefixes = self.INVALIDATED_BY.get(fields[0].upper())
+            if prefixes is not None:
+                self.forget(*prefixes)
+            if fields[0] in shadow:
+                if len(fields) == 2:
+                    shadow[fields[0]] = fields[1].strip()
+                else:
+                    del shadow[fields[0]]
+
+    def write_setting(self, header: str, value) -> bool:
+        """
+        Send "header value" unless the shadow state already holds value.
+
+        Works inside batch(). Numeric values are compared as numbers and
+        ON/OFF as 1/0, so readbacks like "1.000000E+03" match a written 1000.
+
+        Returns:
+            True if the command was sent
+        """
+        known = self.shadow.get(header)
+        if known is not None and _same_setting(known, value):
+            return False
+        self.write(f"{header} {value}")
+        self.remember(header, value)
+        return True
+
+    def read_settings(
+        self,
+        headers: List[str],
+        fresh: bool = False,
+        live: Optional[List[str]] = None
+    ) -> List[str]:
+        """
+        Values of settings, querying only those the shadow state lacks.
+
+        Missing values are read in one round-trip ("header?" for each) and
+        remembered.
+
+        Args:
+            headers: SCPI headers, as used with write_setting()
+            fresh: Query every header, refreshing the shadow state
+            live: Queries that are never cached (status, measurements),
+                sent in the same round-trip; their replies are appended
+
+        Returns:
+            Values in the order of headers, then the live replies
+        """
+        shadow = self.shadow
+        live = live or []
+        missing = [h for h in headers if fresh or h not in shadow]
+        if not missing and not live:
+            return [shadow[h] for h in headers]
+        replies = self.query_many([f"{h}?" for h in missing] + live)
+        for header, value in zip(missing, replies):
+            shadow[header] = value.strip()
+        return [shadow[h] for h in headers] + replies[len(missing):]
+
+    def read_setting(self, header: str, fresh: bool = False) -> str:
+        """Value of one setting, from the shadow state unless fresh."""
+        return self.read_settings([header], fresh)[0]
+
+    def refresh(self, *headers: str) -> Dict[str, str]:
+        """
+        Re-read settings from the instrument in one round-trip.
+
+        Args:
+            headers: Settings to re-read; all shadowed settings if none
+
+        Returns:
+            Dict of header -> current value
+        """
+        headers = list(headers) or list(self.shadow)
+        if not headers:
+            return {}
+        return dict(zip(headers, self.read_settings(headers, fresh=True)))
+
+    def remember(self, header: str, value) -> None:
+        """
+        Record a setting made or read outside write_setting()/read_settings().
+
+        Inside batch() the value is recorded once the batch has been sent.
+        """
+        batch = self._sock.batching
+        if batch is not None:
+            batch.on_flush(lambda: self.remember(header, value), lambda: self.forget(header))
+            return
+        self.shadow[header] = str(value)
+
+    def forget(self, *prefixes: str) -> None:
+        """
+        Drop shadow entries whose header starts with any of prefixes
+        (case-insensitive). With no arguments, drop them all.
+
+        Inside batch() the entries are dropped again once the batch has been
+        sent, after any values staged before this call.
+        """
+        batch = self._sock.batching
+        if batch is not None:
+            batch.on_flush(lambda: self.forget(*prefixes))
+        shadow = self.shadow
+        if not prefixes:
+            shadow.clear()
+            return
+        prefixes = tuple(p.upper() for p in prefixes)
+        for header in [h for h in shadow if h.upper().startswith(prefixes)]:
+            del shadow[header]
+
     # ---- Common operations ----
 
     def reset(self) -> dict:
@@ -77,6 +299,7 @@ class BaseInstrument(ABC):
         Returns:
             Dict with ok status and errors_drained count
         """
+        self._sock.cache.clear()
         self.write("*RST")
         time.sleep(1.0)  # Reset needs settling time
         self.query_opc()
@@ -38,6 +38,13 @@ class DG2052(BaseInstrument):
     - Memory: 16 Mpts
     """
 
+    # Amplitude and offset are scaled to the load setting
+    INVALIDATED_BY = {
+        **BaseInstrument.INVALIDATED_BY,
+        ":OUTP1:LOAD": (":SOUR1:VOLT",),
+        ":OUTP2:LOAD": (":SOUR2:VOLT",),
+    }
+
     def get_type(self) -> str:
         return "dg2052"
 
@@ -45,10 +52,9 @@ class DG2052(BaseInstrument):
         """Post-reset initialization."""
         time.sleep(0.5)
         # Ensure outputs are OFF after reset
-        self.write(":OUTP1:STAT OFF")
-        time.sleep(self.PACING)
-        self.write(":OUTP2:STAT OFF")
-        time.sleep(self.PACING)
+        with self.batch():
+            self.write(":OUTP1:STAT OFF")
+            self.write(":OUTP2:STAT OFF")
         self.clear_errors()
 
     # ---- Output Control ----
@@ -67,7 +73,6 @@ class DG2052(BaseInstrument):
             Dict with output state
         """
         self.write(f":OUTP{channel}:STAT {'ON' if enabled else 'OFF'}")
-        time.sleep(self.PACING)
 
         actual = self.query(f":OUTP{channel}:STAT?").strip()
         return {
@@ -107,11 +112,10 @@ class DG2052(BaseInstrument):
             self.write(f":OUTP{channel}:LOAD INF")
         else:
             self.write(f":OUTP{channel}:LOAD {impedance}")
-        time.sleep(self.PACING)
 
         return {
             "channel": channel,
-            "load_impedance": self.query(f":OUTP{channel}:LOAD?").strip()
+            "load_impedance": self.read_setting(f":OUTP{channel}:LOAD", fresh=True)
         }
 
     # ---- Basic Waveform Configuration ----
@@ -142,34 +146,27 @@ class DG2052(BaseInstrument):
         ch = f":SOUR{channel}"
         wave_scpi = WAVEFORMS.get(waveform.lower(), waveform.upper())
 
-        # Set waveform type
-        self.write(f"{ch}:FUNC {wave_scpi}")
-        time.sleep(self.PACING)
-
-        # Set frequency
-        self.write(f"{ch}:FREQ {frequency_hz}")
-        time.sleep(self.PACING)
-
-        # Set amplitude
-        self.write(f"{ch}:VOLT {amplitude_vpp}")
-        time.sleep(self.PACING)
-
-        # Set offset
-        self.write(f"{ch}:VOLT:OFFS {offset_v}")
-        time.sleep(self.PACING)
-
-        # Set phase
-        self.write(f"{ch}:PHAS {phase_deg}")
-        time.sleep(self.PACING)
-
-        # Read back
+        # Only parameters that differ from the shadow state are sent
+        with self.batch():
+            written = [
+                self.write_setting(f"{ch}:FUNC", wave_scpi),
+                self.write_setting(f"{ch}:FREQ", frequency_hz),
+                self.write_setting(f"{ch}:VOLT", amplitude_vpp),
+                self.write_setting(f"{ch}:VOLT:OFFS", offset_v),
+                self.write_setting(f"{ch}:PHAS", phase_deg),
+            ]
+
+        # Read back (skipped when nothing changed and readbacks are known)
+        func, freq, volt, offs, phase = self.read_settings([
+            f"{ch}:FUNC", f"{ch}:FREQ", f"{ch}:VOLT", f"{ch}:VOLT:OFFS", f"{ch}:PHAS"
+        ], fresh=any(written))
         return {
             "channel": channel,
-            "waveform": self.query(f"{ch}:FUNC?").strip(),
-            "frequency_hz": float(self.query(f"{ch}:FREQ?")),
-            "amplitude_vpp": float(self.query(f"{ch}:VOLT?")),
-            "offset_v": float(self.query(f"{ch}:VOLT:OFFS?")),
-            "phase_deg": float(self.query(f"{ch}:PHAS?")),
+            "waveform": func,
+            "frequency_hz": float(freq),
+            "amplitude_vpp": float(volt),
+            "offset_v": float(offs),
+            "phase_deg": float(phase),
         }
 
     def configure_sine(
@@ -225,7 +222,6 @@ class DG2052(BaseInstrument):
         # Set duty cycle
         ch = f":SOUR{channel}"
         self.write(f"{ch}:FUNC:SQU:DCYC {duty_cycle_pct}")
-        time.sleep(self.PACING)
 
         result["duty_cycle_pct"] = float(self.query(f"{ch}:FUNC:SQU:DCYC?"))
         return result
@@ -263,20 +259,17 @@ class DG2052(BaseInstrument):
 
         ch = f":SOUR{channel}"
 
-        if width_s is not None:
-            self.write(f"{ch}:PULS:WIDT {width_s}")
-            time.sleep(self.PACING)
-        elif duty_cycle_pct is not None:
-            self.write(f"{ch}:PULS:DCYC {duty_cycle_pct}")
-            time.sleep(self.PACING)
+        with self.batch():
+            if width_s is not None:
+                self.write(f"{ch}:PULS:WIDT {width_s}")
+            elif duty_cycle_pct is not None:
+                self.write(f"{ch}:PULS:DCYC {duty_cycle_pct}")
 
-        if rise_time_s is not None:
-            self.write(f"{ch}:PULS:TRAN:LEAD {rise_time_s}")
-            time.sleep(self.PACING)
+            if rise_time_s is not None:
+                self.write(f"{ch}:PULS:TRAN:LEAD {rise_time_s}")
 
-        if fall_time_s is not None:
-            self.write(f"{ch}:PULS:TRAN:TRA {fall_time_s}")
-            time.sleep(self.PACING)
+            if fall_time_s is not None:
+                self.write(f"{ch}:PULS:TRAN:TRA {fall_time_s}")
 
         result["pulse_width_s"] = float(self.query(f"{ch}:PULS:WIDT?"))
         return result
@@ -308,7 +301,6 @@ class DG2052(BaseInstrument):
 
         ch = f":SOUR{channel}"
         self.write(f"{ch}:FUNC:RAMP:SYMM {symmetry_pct}")
-        time.sleep(self.PACING)
 
         result["symmetry_pct"] = float(self.query(f"{ch}:FUNC:RAMP:SYMM?"))
         return result
@@ -332,18 +324,19 @@ class DG2052(BaseInstrument):
         """
         ch = f":SOUR{channel}"
 
-        self.write(f"{ch}:FUNC NOIS")
-        time.sleep(self.PACING)
-        self.write(f"{ch}:VOLT {amplitude_vpp}")
-        time.sleep(self.PACING)
-        self.write(f"{ch}:VOLT:OFFS {offset_v}")
-        time.sleep(self.PACING)
+        with self.batch():
+            written = [
+                self.write_setting(f"{ch}:FUNC", "NOIS"),
+                self.write_setting(f"{ch}:VOLT", amplitude_vpp),
+                self.write_setting(f"{ch}:VOLT:OFFS", offset_v),
+            ]
 
+        volt, offs = self.read_settings([f"{ch}:VOLT", f"{ch}:VOLT:OFFS"], fresh=any(written))
         return {
             "channel": channel,
             "waveform": "NOISE",
-            "amplitude_vpp": float(self.query(f"{ch}:VOLT?")),
-            "offset_v": float(self.query(f"{ch}:VOLT:OFFS?")),
+            "amplitude_vpp": float(volt),
+            "offset_v": float(offs),
         }
 
     # ---- Sweep Mode ----
@@ -371,26 +364,25 @@ class DG2052(BaseInstrument):
         """
         ch = f":SOUR{channel}"
 
-        self.write(f"{ch}:SWE:STAT ON")
-        time.sleep(self.PACING)
-        self.write(f"{ch}:SWE:FREQ:STAR {start_hz}")
-        time.sleep(self.PACING)
-        self.write(f"{ch}:SWE:FREQ:STOP {stop_hz}")
-        time.sleep(self.PACING)
-        self.write(f"{ch}:SWE:TIME {sweep_time_s}")
-        time.sleep(self.PACING)
+        with self.batch():
+            self.write(f"{ch}:SWE:STAT ON")
+            self.write(f"{ch}:SWE:FREQ:STAR {start_hz}")
+            self.write(f"{ch}:SWE:FREQ:STOP {stop_hz}")
+            self.write(f"{ch}:SWE:TIME {sweep_time_s}")
 
-        spacing_scpi = "LIN" if spacing.lower() == "linear" else "LOG"
-        self.write(f"{ch}:SWE:SPAC {spacing_scpi}")
-        time.sleep(self.PACING)
+            spacing_scpi = "LIN" if spacing.lower() == "linear" else "LOG"
+            self.write(f"{ch}:SWE:SPAC {spacing_scpi}")
 
+        start, stop, sweep_time, actual_spacing = self.query_many([
+            f"{ch}:SWE:FREQ:STAR?", f"{ch}:SWE:FREQ:STOP?", f"{ch}:SWE:TIME?", f"{ch}:SWE:SPAC?"
+        ])
         return {
             "channel": channel,
             "sweep_enabled": True,
-            "start_hz": float(self.query(f"{ch}:SWE:FREQ:STAR?")),
-            "stop_hz": float(self.query(f"{ch}:SWE:FREQ:STOP?")),
-            "sweep_time_s": float(self.query(f"{ch}:SWE:TIME?")),
-            "spacing": self.query(f"{ch}:SWE:SPAC?").strip(),
+            "start_hz": float(start),
+            "stop_hz": float(stop),
+            "sweep_time_s": float(sweep_time),
+            "spacing": actual_spacing,
         }
 
     def disable_sweep(self, channel: int) -> dict:
@@ -423,30 +415,29 @@ class DG2052(BaseInstrument):
         """
         ch = f":SOUR{channel}"
 
-        self.write(f"{ch}:BURS:STAT ON")
-        time.sleep(self.PACING)
+        with self.batch():
+            self.write(f"{ch}:BURS:STAT ON")
 
-        mode_map = {"triggered": "TRIG", "gated": "GAT", "infinity": "INF"}
-        self.write(f"{ch}:BURS:MODE {mode_map.get(mode.lower(), mode)}")
-        time.sleep(self.PACING)
+            mode_map = {"triggered": "TRIG", "gated": "GAT", "infinity": "INF"}
+            self.write(f"{ch}:BURS:MODE {mode_map.get(mode.lower(), mode)}")
 
-        self.write(f"{ch}:BURS:NCYC {cycles}")
-        time.sleep(self.PACING)
+            self.write(f"{ch}:BURS:NCYC {cycles}")
 
-        trig_map = {"internal": "INT", "external": "EXT", "manual": "MAN"}
-        self.write(f"{ch}:BURS:TRIG:SOUR {trig_map.get(trigger_source.lower(), trigger_source)}")
-        time.sleep(self.PACING)
+            trig_map = {"internal": "INT", "external": "EXT", "manual": "MAN"}
+            self.write(f"{ch}:BURS:TRIG:SOUR {trig_map.get(trigger_source.lower(), trigger_source)}")
 
-        if burst_period_s is not None:
-            self.write(f"{ch}:BURS:INT:PER {burst_period_s}")
-            time.sleep(self.PACING)
+            if burst_period_s is not None:
+                self.write(f"{ch}:BURS:INT:PER {burst_period_s}")
 
+        ncyc, actual_mode, trig_source = self.query_many([
+            f"{ch}:BURS:NCYC?", f"{ch}:BURS:MODE?", f"{ch}:BURS:TRIG:SOUR?"
+        ])
         return {
             "channel": channel,
             "burst_enabled": True,
-            "cycles": int(float(self.query(f"{ch}:BURS:NCYC?"))),
-            "mode": self.query(f"{ch}:BURS:MODE?").strip(),
-            "trigger_source": self.query(f"{ch}:BURS:TRIG:SOUR?").strip(),
+            "cycles": int(float(ncyc)),
+            "mode": actual_mode,
+            "trigger_source": trig_source,
         }
 
     def trigger_burst(self, channel: int) -> dict:
@@ -490,24 +481,21 @@ class DG2052(BaseInstrument):
         """
         ch = f":SOUR{channel}"
 
-        self.write(f"{ch}:AM:STAT ON")
-        time.sleep(self.PACING)
-        self.write(f"{ch}:AM:SOUR INT")
-        time.sleep(self.PACING)
-        self.write(f"{ch}:AM:DEPT {depth_pct}")
-        time.sleep(self.PACING)
-        self.write(f"{ch}:AM:INT:FREQ {mod_frequency_hz}")
-        time.sleep(self.PACING)
+        with self.batch():
+            self.write(f"{ch}:AM:STAT ON")
+            self.write(f"{ch}:AM:SOUR INT")
+            self.write(f"{ch}:AM:DEPT {depth_pct}")
+            self.write(f"{ch}:AM:INT:FREQ {mod_frequency_hz}")
 
-        wave_scpi = WAVEFORMS.get(mod_waveform.lower(), mod_waveform.upper())
-        self.write(f"{ch}:AM:INT:FUNC {wave_scpi}")
-        time.sleep(self.PACING)
+            wave_scpi = WAVEFORMS.get(mod_waveform.lower(), mod_waveform.upper())
+            self.write(f"{ch}:AM:INT:FUNC {wave_scpi}")
 
+        depth, mod_freq = self.query_many([f"{ch}:AM:DEPT?", f"{ch}:AM:INT:FREQ?"])
         return {
             "channel": channel,
             "am_enabled": True,
-            "depth_pct": float(self.query(f"{ch}:AM:DEPT?")),
-            "mod_frequency_hz": float(self.query(f"{ch}:AM:INT:FREQ?")),
+            "depth_pct": float(depth),
+            "mod_frequency_hz": float(mod_freq),
         }
 
     def configure_fm(
@@ -529,30 +517,27 @@ class DG2052(BaseInstrument):
         """
         ch = f":SOUR{channel}"
 
-        self.write(f"{ch}:FM:STAT ON")
-        time.sleep(self.PACING)
-        self.write(f"{ch}:FM:DEV {deviation_hz}")
-        time.sleep(self.PACING)
-        self.write(f"{ch}:FM:INT:FREQ {mod_frequency_hz}")
-        time.sleep(self.PACING)
+        with self.batch():
+            self.write(f"{ch}:FM:STAT ON")
+            self.write(f"{ch}:FM:DEV {deviation_hz}")
+            self.write(f"{ch}:FM:INT:FREQ {mod_frequency_hz}")
 
+        deviation, mod_freq = self.query_many([f"{ch}:FM:DEV?", f"{ch}:FM:INT:FREQ?"])
         return {
             "channel": channel,
             "fm_enabled": True,
-            "deviation_hz": float(self.query(f"{ch}:FM:DEV?")),
-            "mod_frequency_hz": float(self.query(f"{ch}:FM:INT:FREQ?")),
+            "deviation_hz": float(deviation),
+            "mod_frequency_hz": float(mod_freq),
         }
 
     def disable_modulation(self, channel: int) -> dict:
         """Disable all modulation modes."""
         ch = f":SOUR{channel}"
-        self.write(f"{ch}:AM:STAT OFF")
-        time.sleep(self.PACING)
-        self.write(f"{ch}:FM:STAT OFF")
-        time.sleep(self.PACING)
-        self.write(f"{ch}:PM:STAT OFF")
-        time.sleep(self.PACING)
-        self.write(f"{ch}:PWM:STAT OFF")
+        with self.batch():
+            self.write(f"{ch}:AM:STAT OFF")
+            self.write(f"{ch}:FM:STAT OFF")
+            self.write(f"{ch}:PM:STAT OFF")
+            self.write(f"{ch}:PWM:STAT OFF")
         return {"channel": channel, "modulation_disabled": True}
 
     # ---- Phase Alignment ----
@@ -52,7 +52,6 @@ class DL3021A(BaseInstrument):
         time.sleep(0.5)
         # Ensure input is OFF after reset
         self.write(":SOUR:INP:STAT OFF")
-        time.sleep(self.PACING)
         self.clear_errors()
 
     # ---- Input Control ----
@@ -70,7 +69,6 @@ class DL3021A(BaseInstrument):
             Dict with input state
         """
         self.write(f":SOUR:INP:STAT {'ON' if enabled else 'OFF'}")
-        time.sleep(self.PACING)
 
         actual = self.query(":SOUR:INP:STAT?").strip()
         return {
@@ -102,7 +100,6 @@ class DL3021A(BaseInstrument):
         """
         mode_scpi = MODES.get(mode.lower(), mode.upper())
         self.write(f":SOUR:FUNC {mode_scpi}")
-        time.sleep(self.PACING)
 
         actual = self.query(":SOUR:FUNC?").strip()
         return {"mode": actual}
@@ -119,7 +116,6 @@ class DL3021A(BaseInstrument):
         """
         mode_scpi = FUNCTION_MODES.get(func_mode.lower(), func_mode.upper())
         self.write(f":SOUR:FUNC:MODE {mode_scpi}")
-        time.sleep(self.PACING)
 
         actual = self.query(":SOUR:FUNC:MODE?").strip()
         return {"function_mode": actual}
@@ -145,29 +141,26 @@ class DL3021A(BaseInstrument):
         Returns:
             Dict with applied settings
         """
-        self.write(":SOUR:FUNC CURRent")
-        time.sleep(self.PACING)
+        with self.batch():
+            self.write(":SOUR:FUNC CURRent")
 
-        self.write(f":SOUR:CURR:LEV:IMM {current_a}")
-        time.sleep(self.PACING)
+            self.write(f":SOUR:CURR:LEV:IMM {current_a}")
 
-        if slew_rate is not None:
-            self.write(f":SOUR:CURR:SLEW {slew_rate}")
-            time.sleep(self.PACING)
+            if slew_rate is not None:
+                self.write(f":SOUR:CURR:SLEW {slew_rate}")
 
-        if voltage_limit is not None:
-            self.write(f":SOUR:CURR:VLIM {voltage_limit}")
-            time.sleep(self.PACING)
+            if voltage_limit is not None:
+                self.write(f":SOUR:CURR:VLIM {voltage_limit}")
 
-        if von_voltage is not None:
-            self.write(f":SOUR:CURR:VON {von_voltage}")
-            time.sleep(self.PACING)
+            if von_voltage is not None:
+                self.write(f":SOUR:CURR:VON {von_voltage}")
 
         # Read back
+        level, limit = self.query_many([":SOUR:CURR:LEV:IMM?", ":SOUR:CURR:VLIM?"])
         return {
             "mode": "CC",
-            "current_a": float(self.query(":SOUR:CURR:LEV:IMM?")),
-            "voltage_limit_v": float(self.query(":SOUR:CURR:VLIM?")),
+            "current_a": float(level),
+            "voltage_limit_v": float(limit),
         }
 
     # ---- Constant Voltage (CV) Mode ----
@@ -187,20 +180,19 @@ class DL3021A(BaseInstrument):
         Returns:
             Dict with applied settings
         """
-        self.write(":SOUR:FUNC VOLTage")
-        time.sleep(self.PACING)
+        with self.batch():
+            self.write(":SOUR:FUNC VOLTage")
 
-        self.write(f":SOUR:VOLT:LEV:IMM {voltage_v}")
-        time.sleep(self.PACING)
+            self.write(f":SOUR:VOLT:LEV:IMM {voltage_v}")
 
-        if current_limit is not None:
-            self.write(f":SOUR:VOLT:ILIM {current_limit}")
-            time.sleep(self.PACING)
+            if current_limit is not None:
+                self.write(f":SOUR:VOLT:ILIM {current_limit}")
 
+        level, limit = self.query_many([":SOUR:VOLT:LEV:IMM?", ":SOUR:VOLT:ILIM?"])
         return {
             "mode": "CV",
-            "voltage_v": float(self.query(":SOUR:VOLT:LEV:IMM?")),
-            "current_limit_a": float(self.query(":SOUR:VOLT:ILIM?")),
+            "voltage_v": float(level),
+            "current_limit_a": float(limit),
         }
 
     # ---- Constant Resistance (CR) Mode ----
@@ -220,20 +212,19 @@ class DL3021A(BaseInstrument):
         Returns:
             Dict with applied settings
         """
-        self.write(":SOUR:FUNC RESistance")
-        time.sleep(self.PACING)
+        with self.batch():
+            self.write(":SOUR:FUNC RESistance")
 
-        self.write(f":SOUR:RES:LEV:IMM {resistance_ohm}")
-        time.sleep(self.PACING)
+            self.write(f":SOUR:RES:LEV:IMM {resistance_ohm}")
 
-        if current_limit is not None:
-            self.write(f":SOUR:RES:ILIM {current_limit}")
-            time.sleep(self.PACING)
+            if current_limit is not None:
+                self.write(f":SOUR:RES:ILIM {current_limit}")
 
+        level, limit = self.query_many([":SOUR:RES:LEV:IMM?", ":SOUR:RES:ILIM?"])
         return {
             "mode": "CR",
-            "resistance_ohm": float(self.query(":SOUR:RES:LEV:IMM?")),
-            "current_limit_a": float(self.query(":SOUR:RES:ILIM?")),
+            "resistance_ohm": float(level),
+            "current_limit_a": float(limit),
         }
 
     # ---- Constant Power (CP) Mode ----
@@ -253,20 +244,19 @@ class DL3021A(BaseInstrument):
         Returns:
             Dict with applied settings
         """
-        self.write(":SOUR:FUNC POWer")
-        time.sleep(self.PACING)
+        with self.batch():
+            self.write(":SOUR:FUNC POWer")
 
-        self.write(f":SOUR:POW:LEV:IMM {power_w}")
-        time.sleep(self.PACING)
+            self.write(f":SOUR:POW:LEV:IMM {power_w}")
 
-        if current_limit is not None:
-            self.write(f":SOUR:POW:ILIM {current_limit}")
-            time.sleep(self.PACING)
+            if current_limit is not None:
+                self.write(f":SOUR:POW:ILIM {current_limit}")
 
+        level, limit = self.query_many([":SOUR:POW:LEV:IMM?", ":SOUR:POW:ILIM?"])
         return {
             "mode": "CP",
-            "power_w": float(self.query(":SOUR:POW:LEV:IMM?")),
-            "current_limit_a": float(self.query(":SOUR:POW:ILIM?")),
+            "power_w": float(level),
+            "current_limit_a": float(limit),
         }
 
     # ---- Transient Mode ----
@@ -294,43 +284,39 @@ class DL3021A(BaseInstrument):
         Returns:
             Dict with applied settings
         """
-        # Set CC mode first
-        self.write(":SOUR:FUNC CURRent")
-        time.sleep(self.PACING)
-
-        # Set transient mode
-        mode_map = {"continuous": "CONT", "pulse": "PULS", "toggle": "TOGG"}
-        mode_scpi = mode_map.get(mode.lower(), mode.upper())
-        self.write(f":SOUR:CURR:TRAN:MODE {mode_scpi}")
-        time.sleep(self.PACING)
-
-        # Set levels
-        self.write(f":SOUR:CURR:TRAN:ALEV {level_a}")
-        time.sleep(self.PACING)
-        self.write(f":SOUR:CURR:TRAN:BLEV {level_b}")
-        time.sleep(self.PACING)
-
-        # Set timing
-        if frequency_hz is not None:
-            self.write(f":SOUR:CURR:TRAN:FREQ {frequency_hz}")
-            time.sleep(self.PACING)
-
-        if width_a_s is not None:
-            self.write(f":SOUR:CURR:TRAN:AWID {width_a_s}")
-            time.sleep(self.PACING)
-
-        if width_b_s is not None:
-            self.write(f":SOUR:CURR:TRAN:BWID {width_b_s}")
-            time.sleep(self.PACING)
-
-        # Enable transient
-        self.write(":SOUR:TRAN ON")
-        time.sleep(self.PACING)
+        with self.batch():
+            # Set CC mode first
+            self.write(":SOUR:FUNC CURRent")
 
+            # Set transient mode
+            mode_map = {"continuous": "CONT", "pulse": "PULS", "toggle": "TOGG"}
+            mode_scpi = mode_map.get(mode.lower(), mode.upper())
+            self.write(f":SOUR:CURR:TRAN:MODE {mode_scpi}")
+
+            # Set levels
+            self.write(f":SOUR:CURR:TRAN:ALEV {level_a}")
+            self.write(f":SOUR:CURR:TRAN:BLEV {level_b}")
+
+            # Set timing
+            if frequency_hz is not None:
+                self.write(f":SOUR:CURR:TRAN:FREQ {frequency_hz}")
+
+            if width_a_s is not None:
+                self.write(f":SOUR:CURR:TRAN:AWID {width_a_s}")
+
+            if width_b_s is not None:
+                self.write(f":SOUR:CURR:TRAN:BWID {width_b_s}")
+
+            # Enable transient
+            self.write(":SOUR:TRAN ON")
+
+        tran_mode, alev, blev = self.query_many([
+            ":SOUR:CURR:TRAN:MODE?", ":SOUR:CURR:TRAN:ALEV?", ":SOUR:CURR:TRAN:BLEV?"
+        ])
         return {
-            "transient_mode": self.query(":SOUR:CURR:TRAN:MODE?").strip(),
-            "level_a": float(self.query(":SOUR:CURR:TRAN:ALEV?")),
-            "level_b": float(self.query(":SOUR:CURR:TRAN:BLEV?")),
+            "transient_mode": tran_mode,
+            "level_a": float(alev),
+            "level_b": float(blev),
             "enabled": True
         }
 
@@ -353,9 +339,9 @@ class DL3021A(BaseInstrument):
         Returns:
             Dict with voltage_v, current_a, power_w
         """
-        voltage = float(self.query(":MEAS:VOLT?"))
-        current = float(self.query(":MEAS:CURR?"))
-        power = float(self.query(":MEAS:POW?"))
+        voltage, current, power = (
+            float(v) for v in self.query_many([":MEAS:VOLT?", ":MEAS:CURR?", ":MEAS:POW?"])
+        )
 
         return {
             "voltage_v": voltage,
@@ -400,21 +386,15 @@ class DL3021A(BaseInstrument):
         Returns:
             Dict with OCP test configuration
         """
-        self.write(":SOUR:FUNC:MODE OCP")
-        time.sleep(self.PACING)
-
-        self.write(f":SOUR:OCP:VON {von_voltage_v}")
-        time.sleep(self.PACING)
-        self.write(f":SOUR:OCP:ISET {start_current_a}")
-        time.sleep(self.PACING)
-        self.write(f":SOUR:OCP:ISTEP {step_current_a}")
-        time.sleep(self.PACING)
-        self.write(f":SOUR:OCP:IMAX {max_current_a}")
-        time.sleep(self.PACING)
-        self.write(f":SOUR:OCP:IDELAYSTEP {step_delay_s}")
-        time.sleep(self.PACING)
-        self.write(f":SOUR:OCP:VOCP {protection_voltage_v}")
-        time.sleep(self.PACING)
+        with self.batch():
+            self.write(":SOUR:FUNC:MODE OCP")
+
+            self.write(f":SOUR:OCP:VON {von_voltage_v}")
+            self.write(f":SOUR:OCP:ISET {start_current_a}")
+            self.write(f":SOUR:OCP:ISTEP {step_current_a}")
+            self.write(f":SOUR:OCP:IMAX {max_current_a}")
+            self.write(f":SOUR:OCP:IDELAYSTEP {step_delay_s}")
+            self.write(f":SOUR:OCP:VOCP {protection_voltage_v}")
 
         return {
             "mode": "OCP",
@@ -451,21 +431,15 @@ class DL3021A(BaseInstrument):
         Returns:
             Dict with OPP test configuration
         """
-        self.write(":SOUR:FUNC:MODE OPP")
-        time.sleep(self.PACING)
-
-        self.write(f":SOUR:OPP:VON {von_voltage_v}")
-        time.sleep(self.PACING)
-        self.write(f":SOUR:OPP:PSET {start_power_w}")
-        time.sleep(self.PACING)
-        self.write(f":SOUR:OPP:PSTEP {step_power_w}")
-        time.sleep(self.PACING)
-        self.write(f":SOUR:OPP:PMAX {max_power_w}")
-        time.sleep(self.PACING)
-        self.write(f":SOUR:OPP:PDELAYSTEP {step_delay_s}")
-        time.sleep(self.PACING)
-        self.write(f":SOUR:OPP:VOPP {protection_voltage_v}")
-        time.sleep(self.PACING)
+        with self.batch():
+            self.write(":SOUR:FUNC:MODE OPP")
+
+            self.write(f":SOUR:OPP:VON {von_voltage_v}")
+            self.write(f":SOUR:OPP:PSET {start_power_w}")
+            self.write(f":SOUR:OPP:PSTEP {step_power_w}")
+            self.write(f":SOUR:OPP:PMAX {max_power_w}")
+            self.write(f":SOUR:OPP:PDELAYSTEP {step_delay_s}")
+            self.write(f":SOUR:OPP:VOPP {protection_voltage_v}")
 
         return {
             "mode": "OPP",
@@ -490,7 +464,6 @@ class DL3021A(BaseInstrument):
             Dict with sense state
         """
         self.write(f":SOUR:SENS {'ON' if enabled else 'OFF'}")
-        time.sleep(self.PACING)
 
         actual = self.query(":SOUR:SENS?").strip()
         return {"remote_sense": actual in ["1", "ON"]}
@@ -510,7 +483,6 @@ class DL3021A(BaseInstrument):
             Dict with short state
         """
         self.write(f":SOUR:INP:SHOR {'ON' if enabled else 'OFF'}")
-        time.sleep(self.PACING)
 
         actual = self.query(":SOUR:INP:SHOR?").strip()
         return {"short_circuit": actual in ["1", "ON"]}
@@ -43,9 +43,6 @@ class DMM6500(BaseInstrument):
                Frequency, Period, Diode, Continuity, Capacitance
     """
 
-    # DMM uses 5025 port and needs less pacing
-    PACING = 0.03  # 30ms between commands
-
     def get_type(self) -> str:
         return "dmm6500"
 
@@ -82,7 +79,6 @@ class DMM6500(BaseInstrument):
 
         # Set function
         self.write(f':SENS:FUNC "{func_scpi}"')
-        time.sleep(self.PACING)
 
         # Get the function prefix for subsequent commands
         func_prefix = func_scpi.replace(":", "")
@@ -90,21 +86,17 @@ class DMM6500(BaseInstrument):
         # Range configuration
         if range_val is not None:
             self.write(f":SENS:{func_scpi}:RANG {range_val}")
-            time.sleep(self.PACING)
             self.write(f":SENS:{func_scpi}:RANG:AUTO OFF")
         elif auto_range:
             self.write(f":SENS:{func_scpi}:RANG:AUTO ON")
-        time.sleep(self.PACING)
 
         # NPLC (integration time)
         if nplc is not None:
             self.write(f":SENS:{func_scpi}:NPLC {nplc}")
-            time.sleep(self.PACING)
 
         # Auto-zero
         if func_scpi in ["VOLT:DC", "CURR:DC", "RES", "FRES"]:
             self.write(f":SENS:{func_scpi}:AZER {'ON' if auto_zero else 'OFF'}")
-            time.sleep(self.PACING)
 
         # Read back actual settings
         actual_func = self.query(":SENS:FUNC?").strip().strip('"')
@@ -241,15 +233,12 @@ class DMM6500(BaseInstrument):
             Dict with temperature_c
         """
         self.write(':SENS:FUNC "TEMP"')
-        time.sleep(self.PACING)
 
         if sensor.upper() == "RTD":
             self.write(":SENS:TEMP:TRAN FRTD")
-            time.sleep(self.PACING)
             self.write(f":SENS:TEMP:RTD:FOUR {rtd_type}")
         elif sensor.upper() == "THER":
             self.write(":SENS:TEMP:TRAN THER")
-        time.sleep(self.PACING)
 
         result = self.measure()
         if "error" not in result:
@@ -297,7 +286,6 @@ class DMM6500(BaseInstrument):
             Dict with forward_v
         """
         self.write(':SENS:FUNC "DIOD"')
-        time.sleep(self.PACING)
         result = self.measure()
         if "error" not in result:
             result["forward_v"] = result.pop("value")
@@ -311,7 +299,6 @@ class DMM6500(BaseInstrument):
             Dict with resistance_ohm and continuity (bool)
         """
         self.write(':SENS:FUNC "CONT"')
-        time.sleep(self.PACING)
         result = self.measure()
         if "error" not in result:
             val = result.pop("value")
@@ -334,10 +321,8 @@ class DMM6500(BaseInstrument):
         """
         if line1:
             self.write(f':DISP:USER1:TEXT "{line1}"')
-            time.sleep(self.PACING)
         if line2:
             self.write(f':DISP:USER2:TEXT "{line2}"')
-            time.sleep(self.PACING)
 
         self.write(":DISP:SCREEN USER")
         return {"ok": True, "line1": line1, "line2": line2}
@@ -350,7 +335,6 @@ class DMM6500(BaseInstrument):
             Dict with ok status
         """
         self.write(":DISP:CLEAR")
-        time.sleep(self.PACING)
         self.write(":DISP:SCREEN HOME")
         return {"ok": True}
 
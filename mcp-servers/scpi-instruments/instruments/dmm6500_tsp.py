@@ -9,15 +9,137 @@ access when the DMM6500 is set to TSP mode.
 TSP mode is set from front panel: System → Settings → Command Set → TSP
 """
 
+import hashlib
 import logging
+import re
+import sys
 import time
 import json
+from collections import deque
 from typing import Optional, Dict, Any, List, Union
 
+import numpy as np
+
+from scpi_transport import SCPIError
+
 from .base import BaseInstrument
 
 logger = logging.getLogger(__name__)
 
+# Binary buffer transfer: printbuffer() output as float32 in host byte order.
+# format.data also changes how print() shows numbers, so it is switched to
+# REAL32 only for the duration of a download. ASCII is restored by its own
+# command, so a failing printbuffer() cannot leave the meter in REAL32. A
+# download cut short by a lost connection cannot restore it at all, so the
+# first print() on every new connection carries BINARY_RESTORE as well.
+BINARY_BYTEORDER = "format.LITTLEENDIAN" if sys.byteorder == "little" else "format.BIGENDIAN"
+BINARY_PRINTBUFFER = (
+    "format.data = format.REAL32 format.byteorder = " + BINARY_BYTEORDER +
+    " printbuffer({start}, {end}, {buffer}.readings)"
+)
+BINARY_RESTORE = "format.data = format.ASCII"
+
+# On-instrument function library, uploaded once with loadscript/endscript.
+# Each function does a composite operation and returns all its results, so
+# a call is one print() round-trip.
+LIBRARY_NAME = "mcp_lib"
+LIBRARY_SOURCE = """
+local function mcp_value(x)
+    if type(x) == "table" then return x.reading end
+    return x
+end
+
+function mcp_configure(func, rng, autorange, nplc, autozero)
+    dmm.measure.func = func
+    if rng ~= nil then
+        dmm.measure.range = rng
+        dmm.measure.autorange = dmm.OFF
+    elseif autorange then
+        dmm.measure.autorange = dmm.ON
+    end
+    if nplc ~= nil then dmm.measure.nplc = nplc end
+    if autozero == true then dmm.measure.autozero.enable = dmm.ON end
+    if autozero == false then dmm.measure.autozero.enable = dmm.OFF end
+    return dmm.measure.func, dmm.measure.range, dmm.measure.nplc
+end
+
+function mcp_measure(func, rng, autorange, nplc, autozero)
+    mcp_configure(func, rng, autorange, nplc, autozero)
+    return dmm.measure.read(), dmm.measure.func, dmm.measure.range, dmm.measure.nplc
+end
+
+function mcp_stats(buf)
+    if buf.n == 0 then return 0 end
+    local s = buffer.getstats(buf)
+    return buf.n, mcp_value(s.min), mcp_value(s.max), s.mean, s.stddev
+end
+
+function mcp_digitize(func, rate, count, rng, buf)
+    dmm.digitize.func = func
+    dmm.digitize.samplerate = rate
+    dmm.digitize.count = count
+    if rng ~= nil then dmm.digitize.range = rng else dmm.digitize.range = dmm.RANGE_AUTO end
+    buf.clear()
+    dmm.digitize.read(buf)
+    return mcp_stats(buf)
+end
+"""
+
+# Global table on the instrument recording each loaded script's content hash
+SCRIPT_REGISTRY = "mcp_scripts"
+
+# Script names are Lua globals: a user script may not shadow the server's
+# own names (mcp_ prefix), Lua keywords and standard library, or TSP globals
+RESERVED_SCRIPT_PREFIX = "mcp_"
+RESERVED_SCRIPT_NAMES = frozenset("""
+    and break do else elseif end false for function goto if in local nil not
+    or repeat return then true until while
+    _G _VERSION assert collectgarbage coroutine debug dofile error gcinfo
+    getfenv getmetatable io ipairs load loadfile loadstring math module next
+    os package pairs pcall print rawequal rawget rawset require select
+    setfenv setmetatable string table tonumber tostring type unpack xpcall
+    acal beeper buffer channel createconfigscript dataqueue defbuffer1
+    defbuffer2 delay digio display dmm endscript eventlog exit file format
+    lan localnode loadscript node opc printbuffer printnumber reset scan
+    script slot status timer trigger tsplink tspnet upgrade userstring
+    waitcomplete
+""".split())
+
+# Functions that take auto-zero (others are passed nil)
+AUTOZERO_FUNCTIONS = ("dcv", "dci", "res", "fres")
+
+
+def lua_args(*args) -> str:
+    """
+    Format Python values as a Lua argument list.
+
+    None becomes nil, booleans true/false, numbers their repr; strings are
+    inserted as Lua expressions (TSP constants, buffer names).
+    """
+    parts = []
+    for arg in args:
+        if arg is None:
+            parts.append("nil")
+        elif isinstance(arg, bool):
+            parts.append("true" if arg else "false")
+        else:
+            parts.append(str(arg) if isinstance(arg, str) else repr(arg))
+    return ", ".join(parts)
+
+
+def _to_float(text: str) -> Optional[float]:
+    try:
+        return float(text)
+    except (TypeError, ValueError):
+        return None
+
+
+# Readings per binary transfer: starting size, then tuned from throughput
+CHUNK_START = 10000
+CHUNK_MIN = 1000
+CHUNK_MAX = 500000
+CHUNK_TARGET_S = 0.2   # Aim for transfers long enough to hide per-request latency
+
 # TSP function constants
 TSP_FUNCTIONS = {
     "dcv": "dmm.FUNC_DC_VOLTAGE",
@@ -69,8 +191,6 @@ class DMM6500_TSP(BaseInstrument):
     - trigger.model - Sequenced operations
     """
 
-    PACING = 0.03  # 30ms between commands
-
     def get_type(self) -> str:
         return "dmm6500_tsp"
 
@@ -92,7 +212,6 @@ class DMM6500_TSP(BaseInstrument):
             cmd: TSP Lua command (e.g., "dmm.measure.func = dmm.FUNC_DC_VOLTAGE")
         """
         self._sock.write(cmd)
-        time.sleep(self.PACING)
         logger.debug("TSP WRITE: %s", cmd)
 
     def tsp_query(self, expr: str) -> str:
@@ -113,32 +232,105 @@ class DMM6500_TSP(BaseInstrument):
         else:
             cmd = expr
 
+        # The cache starts empty on every connect; until ASCII output is
+        # confirmed on this connection, restore it in the same message
+        if self._sock.cache.get("dmm6500_tsp.format") != "ASCII":
+            cmd = f"{BINARY_RESTORE} {cmd}"
         response = self._sock.query(cmd)
+        self._sock.cache["dmm6500_tsp.format"] = "ASCII"
         logger.debug("TSP QUERY: %s -> %s", expr, response[:80] if len(response) > 80 else response)
         return response
 
-    def tsp_execute(self, script: str) -> dict:
+    def tsp_execute(self, script: str, name: Optional[str] = None) -> dict:
         """
         Execute arbitrary TSP Lua script.
 
         Args:
             script: Multi-line TSP Lua code
+            name: Keep the script on the instrument under this name and
+                run it from there; it is re-uploaded only when it changes
 
         Returns:
             Dict with ok status and any output
         """
         try:
-            # Split into lines and send each
-            lines = script.strip().split('\n')
-            for line in lines:
-                line = line.strip()
-                if line and not line.startswith('--'):
-                    self.tsp_write(line)
-
-            return {"ok": True, "lines_executed": len(lines)}
+            lines = [line.strip() for line in script.strip().split('\n')]
+            lines = [line for line in lines if line and not line.startswith('--')]
+
+            if name is None:
+                # The instrument reads the message line by line: one send, one pacing gap
+                self.tsp_write("\n".join(lines))
+                return {"ok": True, "lines_executed": len(lines)}
+
+            loaded = self.load_script(name, "\n".join(lines))
+            self.tsp_write(f"{name}.run()")
+            return {"ok": True, "lines_executed": len(lines), **loaded}
         except Exception as e:
             return {"ok": False, "error": str(e)}
 
+    # ========================================================================
+    # Script Manager
+    # ========================================================================
+
+    def load_script(self, name: str, source: str, run: bool = False) -> dict:
+        """
+        Upload a named script with loadscript/endscript unless already loaded.
+
+        Scripts are tracked by content hash, both on the connection and in
+        the SCRIPT_REGISTRY table on the instrument, so a script survives
+        reconnects and is uploaded again only when its source changes or
+        the instrument lost it.
+
+        Args:
+            name: Script name (a Lua identifier; not a TSP or Lua global,
+                and not starting with RESERVED_SCRIPT_PREFIX)
+            source: TSP Lua source
+            run: Run the script right after uploading it (e.g. to define
+                functions)
+
+        Returns:
+            Dict with script, hash and uploaded flag
+        """
+        if not re.fullmatch(r"[A-Za-z_][A-Za-z0-9_]*", name):
+            raise ValueError(f"Script name must be a Lua identifier, got {name!r}")
+        if name in RESERVED_SCRIPT_NAMES or name.startswith(RESERVED_SCRIPT_PREFIX):
+            raise ValueError(
+                f"Script name {name!r} is reserved (TSP/Lua global or {RESERVED_SCRIPT_PREFIX}* name)")
+        return self._upload_script(name, source, run)
+
+    def _upload_script(self, name: str, source: str, run: bool = False) -> dict:
+        """load_script() without the name checks, for the server's own scripts."""
+        digest = hashlib.sha256(source.encode()).hexdigest()[:16]
+        loaded = self._sock.cache.setdefault("dmm6500_tsp.scripts", {})
+        if loaded.get(name) == digest:
+            return {"script": name, "hash": digest, "uploaded": False}
+
+        on_instrument = self.tsp_query(f'{SCRIPT_REGISTRY} and {SCRIPT_REGISTRY}["{name}"]')
+        uploaded = on_instrument.strip() != digest
+        if uploaded:
+            lines = [f"loadscript {name}", *source.strip().split("\n"), "endscript"]
+            if run:
+                lines.append(f"{name}.run()")
+            lines.append(f'{SCRIPT_REGISTRY} = {SCRIPT_REGISTRY} or {{}} {SCRIPT_REGISTRY}["{name}"] = "{digest}"')
+            self.tsp_write("\n".join(lines))
+            logger.info("Loaded TSP script %s (%s, %d lines)", name, digest, len(lines) - 3)
+        loaded[name] = digest
+        return {"script": name, "hash": digest, "uploaded": uploaded}
+
+    def call_function(self, function: str, *args) -> List[str]:
+        """
+        Call a function from the on-instrument library in one round-trip.
+
+        The library is uploaded first if needed. Arguments are formatted
+        with lua_args().
+
+        Returns:
+            The function's return values as printed (tab-separated by print)
+        """
+        self._upload_script(LIBRARY_NAME, LIBRARY_SOURCE, run=True)
+        reply = self.tsp_query(f"{function}({lua_args(*args)})")
+        return [v.strip() for v in reply.split("\t")]
+
     # ========================================================================
     # Reset and Identification
     # ========================================================================
@@ -203,37 +395,58 @@ class DMM6500_TSP(BaseInstrument):
         if not func_tsp:
             return {"error": f"Unknown function: {function}"}
 
-        # Set function
-        self.tsp_write(f"dmm.measure.func = {func_tsp}")
-
-        # Range configuration
-        if range_val is not None:
-            self.tsp_write(f"dmm.measure.range = {range_val}")
-            self.tsp_write("dmm.measure.autorange = dmm.OFF")
-        elif auto_range:
-            self.tsp_write("dmm.measure.autorange = dmm.ON")
-
-        # NPLC (integration time)
-        if nplc is not None:
-            self.tsp_write(f"dmm.measure.nplc = {nplc}")
-
-        # Auto-zero (only for applicable functions)
-        if function.lower() in ["dcv", "dci", "res", "fres"]:
-            az_val = "dmm.ON" if auto_zero else "dmm.OFF"
-            self.tsp_write(f"dmm.measure.autozero.enable = {az_val}")
-
-        # Read back settings
-        actual_func = self.tsp_query("dmm.measure.func")
-        actual_range = self.tsp_query("dmm.measure.range")
-        actual_nplc = self.tsp_query("dmm.measure.nplc")
+        # Function, range, NPLC and auto-zero set and read back in one exchange
+        autozero = auto_zero if function.lower() in AUTOZERO_FUNCTIONS else None
+        actual_func, actual_range, actual_nplc = self.call_function(
+            "mcp_configure", func_tsp, range_val, auto_range, nplc, autozero)
 
         return {
             "function": actual_func,
-            "range": float(actual_range) if actual_range else None,
-            "nplc": float(actual_nplc) if actual_nplc else None,
+            "range": _to_float(actual_range),
+            "nplc": _to_float(actual_nplc),
             "mode": "tsp"
         }
 
+    def configure_measure(
+        self,
+        function: str,
+        range_val: Optional[float] = None,
+        nplc: Optional[float] = None,
+        auto_range: bool = True,
+        auto_zero: bool = True
+    ) -> dict:
+        """
+        Configure a measurement function and take one reading in one exchange.
+
+        Args:
+            function: Measurement function (dcv, acv, dci, aci, res, fres, temp, freq, cap)
+            range_val: Manual range value (None for auto)
+            nplc: Integration time in power line cycles (0.0005-15)
+            auto_range: Enable auto-ranging
+            auto_zero: Enable auto-zero
+
+        Returns:
+            Dict with value, function, unit, range and nplc
+        """
+        func_tsp = TSP_FUNCTIONS.get(function.lower())
+        if not func_tsp:
+            return {"error": f"Unknown function: {function}"}
+
+        try:
+            autozero = auto_zero if function.lower() in AUTOZERO_FUNCTIONS else None
+            reading, func, actual_range, actual_nplc = self.call_function(
+                "mcp_measure", func_tsp, range_val, auto_range, nplc, autozero)
+            return {
+                "value": float(reading),
+                "function": func,
+                "unit": UNITS.get(func, ""),
+                "range": _to_float(actual_range),
+                "nplc": _to_float(actual_nplc),
+                "mode": "tsp"
+            }
+        except Exception as e:
+            return {"error": str(e)}
+
     # ========================================================================
     # Basic Measurements
     # ========================================================================
@@ -246,10 +459,9 @@ class DMM6500_TSP(BaseInstrument):
             Dict with value, function, and unit
         """
         try:
-            reading = self.tsp_query("dmm.measure.read()")
+            reading, func = self.tsp_query("dmm.measure.read(), dmm.measure.func").split("\t")
             value = float(reading)
-
-            func = self.tsp_query("dmm.measure.func")
+            func = func.strip()
             unit = UNITS.get(func, "")
 
             return {
@@ -272,8 +484,7 @@ class DMM6500_TSP(BaseInstrument):
         Returns:
             Dict with voltage_v
         """
-        self.configure("dcv", range_val=range_val, nplc=nplc)
-        result = self.measure()
+        result = self.configure_measure("dcv", range_val=range_val, nplc=nplc)
         if "error" not in result:
             result["voltage_v"] = result.get("value")
         return result
@@ -289,8 +500,7 @@ class DMM6500_TSP(BaseInstrument):
         Returns:
             Dict with current_a
         """
-        self.configure("dci", range_val=range_val, nplc=nplc)
-        result = self.measure()
+        result = self.configure_measure("dci", range_val=range_val, nplc=nplc)
         if "error" not in result:
             result["current_a"] = result.get("value")
         return result
@@ -313,8 +523,7 @@ class DMM6500_TSP(BaseInstrument):
             Dict with resistance_ohm
         """
         func = "fres" if four_wire else "res"
-        self.configure(func, range_val=range_val, nplc=nplc)
-        result = self.measure()
+        result = self.configure_measure(func, range_val=range_val, nplc=nplc)
         if "error" not in result:
             result["resistance_ohm"] = result.get("value")
             result["four_wire"] = four_wire
@@ -391,42 +600,92 @@ class DMM6500_TSP(BaseInstrument):
             "mode": "tsp"
         }
 
-    def digitize_read(self, buffer_name: str = "defbuffer1") -> dict:
+    def digitize_capture(
+        self,
+        function: str = "dcv",
+        sample_rate: int = 1000,
+        count: int = 1000,
+        range_val: Optional[float] = None,
+        buffer_name: str = "defbuffer1"
+    ) -> dict:
+        """
+        Configure digitizing, capture into a buffer and summarise, in one exchange.
+
+        The on-instrument function clears the buffer, digitizes count
+        samples and returns the buffer statistics; samples stay in the
+        buffer for digitize_read().
+
+        Args:
+            function: Digitize function (dcv or dci)
+            sample_rate: Samples per second (1 to 1,000,000)
+            count: Number of samples to capture
+            range_val: Manual range (None for auto)
+            buffer_name: Buffer to capture into
+
+        Returns:
+            Dict with count, min, max, mean, stddev and elapsed_s
+        """
+        func_tsp = TSP_DIGITIZE_FUNCTIONS.get(function.lower())
+        if not func_tsp:
+            return {"error": f"Unknown digitize function: {function}. Use 'dcv' or 'dci'"}
+
+        # The reply only comes once the capture is done
+        timeout = self._sock.timeout
+        self._sock.timeout = max(timeout, 2 * count / sample_rate + 5)
+        t0 = time.time()
+        try:
+            values = self.call_function("mcp_digitize", func_tsp, sample_rate, count, range_val, buffer_name)
+        except Exception as e:
+            return {"error": str(e)}
+        finally:
+            self._sock.timeout = timeout
+
+        n = int(float(values[0]))
+        result = {
+            "function": func_tsp,
+            "sample_rate": sample_rate,
+            "count": n,
+            "buffer": buffer_name,
+            "elapsed_s": time.time() - t0,
+            "mode": "tsp"
+        }
+        if n:
+            result.update(zip(("min", "max", "mean", "stddev"), (float(v) for v in values[1:5])))
+        return result
+
+    def digitize_read(self, buffer_name: str = "defbuffer1", filename: Optional[str] = None) -> dict:
         """
         Read digitized samples from buffer.
 
         Args:
             buffer_name: Buffer to read from (default "defbuffer1")
+            filename: Save samples to this .npy file instead of returning them
 
         Returns:
-            Dict with samples list and statistics
+            Dict with samples list (unless filename is given), statistics
+            and transfer figures
         """
         try:
-            # Get buffer size
-            n = int(float(self.tsp_query(f"{buffer_name}.n")))
-
-            if n == 0:
+            result = self.buffer_download(buffer_name, filename=filename)
+            if result["count"] == 0:
                 return {"error": "Buffer is empty", "count": 0}
 
-            # Read all data
-            samples = []
-            # Read in chunks to avoid timeout
-            chunk_size = 100
-            for start in range(1, n + 1, chunk_size):
-                end = min(start + chunk_size - 1, n)
-                data = self.tsp_query(f"printbuffer({start}, {end}, {buffer_name}.readings)")
-                values = [float(x) for x in data.split(',')]
-                samples.extend(values)
-
-            return {
-                "samples": samples,
-                "count": len(samples),
-                "min": min(samples),
-                "max": max(samples),
-                "avg": sum(samples) / len(samples),
+            samples = result.pop("readings")
+            info = {
+                "count": result["count"],
+                "min": float(samples.min()),
+                "max": float(samples.max()),
+                "avg": float(samples.mean(dtype=np.float64)),
                 "buffer": buffer_name,
+                "filename": filename,
+                "chunks": result["chunks"],
+                "elapsed_s": result["elapsed_s"],
+                "throughput_mbps": result["throughput_mbps"],
                 "mode": "tsp"
             }
+            if filename is None:
+                info["samples"] = samples.tolist()
+            return info
         except Exception as e:
             return {"error": str(e)}
 
@@ -521,26 +780,156 @@ class DMM6500_TSP(BaseInstrument):
             Dict with readings list
         """
         try:
-            n = int(float(self.tsp_query(f"{buffer_name}.n")))
-            if n == 0:
+            result = self.buffer_download(buffer_name, start, count)
+            if result["count"] == 0:
                 return {"readings": [], "count": 0, "buffer": buffer_name}
 
-            end = n if count is None else min(start + count - 1, n)
-
-            data = self.tsp_query(f"printbuffer({start}, {end}, {buffer_name}.readings)")
-            readings = [float(x) for x in data.split(',')]
-
             return {
-                "readings": readings,
-                "count": len(readings),
+                "readings": result["readings"].tolist(),
+                "count": result["count"],
                 "buffer": buffer_name,
                 "start": start,
-                "end": end,
+                "end": result["end"],
                 "mode": "tsp"
             }
         except Exception as e:
             return {"error": str(e)}
 
+    def buffer_download(
+        self,
+        buffer_name: str = "defbuffer1",
+        start: int = 1,
+        count: Optional[int] = None,
+        out: Optional[np.ndarray] = None,
+        filename: Optional[str] = None,
+        chunk: Optional[int] = None
+    ) -> dict:
+        """
+        Download buffer readings as binary float32 blocks.
+
+        Each window is fetched with printbuffer() under format.REAL32 and
+        received straight into a preallocated float32 array (or a .npy
+        memory-mapped file), in host byte order so no decoding is needed.
+        The next window is requested before the current one is read.
+        Unless chunk is given, the window size starts at CHUNK_START and
+        is retuned after every transfer from the measured throughput, so
+        each takes about CHUNK_TARGET_S; the tuned size is kept for the
+        next download on this connection. If a transfer fails, windows
+        already requested are drained from the connection and ASCII
+        output is restored; if the connection is lost, the first query on
+        the next one restores it.
+
+        Args:
+            buffer_name: Buffer to read from
+            start: Starting index (1-based)
+            count: Number of readings (None for all)
+            out: Preallocated float32 array to fill (optional)
+            filename: Write to this .npy file via numpy memmap (optional)
+            chunk: Fixed readings per transfer (disables tuning)
+
+        Returns:
+            Dict with readings (array or memmap), count, start, end,
+            chunks, chunk_readings (last window size), bytes, elapsed_s
+            and throughput_mbps
+        """
+        if start < 1:
+            raise ValueError(f"start must be >= 1 (buffer indices are 1-based), got {start}")
+        n = int(float(self.tsp_query(f"{buffer_name}.n")))
+        end = n if count is None else min(start + count - 1, n)
+        total = max(end - start + 1, 0)
+
+        if out is None:
+            if filename is not None:
+                out = np.lib.format.open_memmap(filename, mode="w+", dtype=np.float32, shape=(total,))
+            else:
+                out = np.empty(total, dtype=np.float32)
+        elif out.dtype != np.float32 or out.size < total:
+            raise ValueError(f"out must be a float32 array of at least {total} readings")
+
+        size = chunk or self._sock.cache.get("dmm6500_tsp.chunk", CHUNK_START)
+        pending = deque()
+        next_start = start
+
+        def request() -> None:
+            nonlocal next_start
+            window_end = min(next_start + size - 1, end)
+            self._sock.send_query(BINARY_PRINTBUFFER.format(
+                start=next_start, end=window_end, buffer=buffer_name))
+            pending.append((next_start, window_end))
+            next_start = window_end + 1
+
+        t0 = time.time()
+        received = 0
+        chunks = 0
+        if total:
+            self._sock.cache["dmm6500_tsp.format"] = "REAL32"
+        try:
+            if total:
+                request()
+            while pending:
+                if next_start <= end:
+                    request()  # the meter prepares the next window while this one arrives
+                first, last = pending[0]
+                expected = (last - first + 1) * 4
+                t_read = time.time()
+                nbytes = self._sock.read_block_into(out[first - start:last - start + 1], expected)
+                dt = time.time() - t_read
+                pending.popleft()
+                if nbytes != expected:
+                    raise SCPIError(
+                        f"printbuffer({first}, {last}) returned {nbytes} bytes, expected {expected}")
+                received += nbytes
+                chunks += 1
+                if chunk is None and dt > 0:
+                    size = self._tune_chunk(size, nbytes / dt)
+        except Exception:
+            if pending and self._sock.connected:
+                # Windows already requested would answer the next query
+                try:
+                    self._sock.flush_input()
+                except SCPIError as e:
+                    logger.warning("Could not drain pending printbuffer windows: %s", e)
+            raise
+        finally:
+            if total and self._sock.connected:
+                self._sock.write(BINARY_RESTORE)
+                self._sock.cache["dmm6500_tsp.format"] = "ASCII"
+        elapsed = time.time() - t0
+
+        if chunk is None and chunks:
+            self._sock.cache["dmm6500_tsp.chunk"] = size
+        if filename is not None and isinstance(out, np.memmap):
+            out.flush()
+
+        throughput = received / elapsed / 1e6 if elapsed > 0 else None
+        logger.info("Buffer %s: %d readings in %d chunks, %.2fs (%.1f MB/s)",
+                    buffer_name, total, chunks, elapsed, throughput or 0)
+        return {
+            "readings": out[:total],
+            "count": total,
+            "start": start,
+            "end": end,
+            "buffer": buffer_name,
+            "filename": filename,
+            "chunks": chunks,
+            "chunk_readings": size,
+            "bytes": received,
+            "elapsed_s": elapsed,
+            "throughput_mbps": throughput,
+            "mode": "tsp"
+        }
+
+    def _tune_chunk(self, size: int, rate_bps: float) -> int:
+        """
+        Next window size for a measured transfer rate (bytes/s).
+
+        Aims for CHUNK_TARGET_S per transfer, grows at most 4x per step and
+        stays well inside the socket timeout.
+        """
+        target = int(rate_bps * CHUNK_TARGET_S / 4)
+        limit = int(rate_bps * self._sock.timeout / 2 / 4)
+        return max(CHUNK_MIN, min(target, size * 4, limit, CHUNK_MAX))
+
     def buffer_clear(self, buffer_name: str = "defbuffer1") -> dict:
         """
         Clear a buffer.
@@ -565,16 +954,12 @@ class DMM6500_TSP(BaseInstrument):
             Dict with min, max, avg, count
         """
         try:
-            n = int(float(self.tsp_query(f"{buffer_name}.n")))
+            values = self.call_function("mcp_stats", buffer_name)
+            n = int(float(values[0]))
             if n == 0:
                 return {"count": 0, "buffer": buffer_name, "mode": "tsp"}
 
-            # Use buffer statistics functions
-            stats_min = float(self.tsp_query(f"buffer.getstats({buffer_name}).min"))
-            stats_max = float(self.tsp_query(f"buffer.getstats({buffer_name}).max"))
-            stats_mean = float(self.tsp_query(f"buffer.getstats({buffer_name}).mean"))
-            stats_stddev = float(self.tsp_query(f"buffer.getstats({buffer_name}).stddev"))
-
+            stats_min, stats_max, stats_mean, stats_stddev = (float(v) for v in values[1:5])
             return {
                 "count": n,
                 "min": stats_min,
@@ -27,9 +27,6 @@ class DP932A(BaseInstrument):
     - Resolution: 1mV, 1mA
     """
 
-    # DP932A uses 5025 port
-    PACING = 0.03  # 30ms between commands
-
     def get_type(self) -> str:
         return "dp932a"
 
@@ -37,12 +34,10 @@ class DP932A(BaseInstrument):
         """Post-reset initialization."""
         time.sleep(0.5)
         # Ensure all outputs are OFF after reset
-        self.write(":OUTP OFF,CH1")
-        time.sleep(self.PACING)
-        self.write(":OUTP OFF,CH2")
-        time.sleep(self.PACING)
-        self.write(":OUTP OFF,CH3")
-        time.sleep(self.PACING)
+        with self.batch():
+            self.write(":OUTP OFF,CH1")
+            self.write(":OUTP OFF,CH2")
+            self.write(":OUTP OFF,CH3")
         self.clear_errors()
 
     # ---- Output Control ----
@@ -61,7 +56,6 @@ class DP932A(BaseInstrument):
             Dict with output state
         """
         self.write(f":OUTP {'ON' if enabled else 'OFF'},CH{channel}")
-        time.sleep(self.PACING)
 
         actual = self.query(f":OUTP? CH{channel}").strip()
         return {
@@ -93,18 +87,17 @@ class DP932A(BaseInstrument):
         Returns:
             Dict with ok status
         """
-        self.write(":OUTP OFF,CH1")
-        time.sleep(self.PACING)
-        self.write(":OUTP OFF,CH2")
-        time.sleep(self.PACING)
-        self.write(":OUTP OFF,CH3")
-        time.sleep(self.PACING)
+        with self.batch():
+            self.write(":OUTP OFF,CH1")
+            self.write(":OUTP OFF,CH2")
+            self.write(":OUTP OFF,CH3")
 
+        ch1, ch2, ch3 = self.query_many([":OUTP? CH1", ":OUTP? CH2", ":OUTP? CH3"])
         return {
             "all_off": True,
-            "ch1": self.query(":OUTP? CH1").strip() in ["0", "OFF"],
-            "ch2": self.query(":OUTP? CH2").strip() in ["0", "OFF"],
-            "ch3": self.query(":OUTP? CH3").strip() in ["0", "OFF"],
+            "ch1": ch1 in ["0", "OFF"],
+            "ch2": ch2 in ["0", "OFF"],
+            "ch3": ch3 in ["0", "OFF"],
         }
 
     # ---- Channel Configuration ----
@@ -126,17 +119,17 @@ class DP932A(BaseInstrument):
         Returns:
             Dict with applied settings
         """
-        # Set voltage
-        self.write(f":VOLT {voltage_v},CH{channel}")
-        time.sleep(self.PACING)
+        with self.batch():
+            # Set voltage
+            self.write(f":VOLT {voltage_v},CH{channel}")
 
-        # Set current limit
-        self.write(f":CURR {current_a},CH{channel}")
-        time.sleep(self.PACING)
+            # Set current limit
+            self.write(f":CURR {current_a},CH{channel}")
 
         # Read back
-        actual_v = float(self.query(f":VOLT? CH{channel}"))
-        actual_i = float(self.query(f":CURR? CH{channel}"))
+        actual_v, actual_i = (
+            float(v) for v in self.query_many([f":VOLT? CH{channel}", f":CURR? CH{channel}"])
+        )
 
         return {
             "channel": channel,
@@ -156,7 +149,6 @@ class DP932A(BaseInstrument):
             Dict with voltage setting
         """
         self.write(f":VOLT {voltage_v},CH{channel}")
-        time.sleep(self.PACING)
 
         actual = float(self.query(f":VOLT? CH{channel}"))
         return {
@@ -176,7 +168,6 @@ class DP932A(BaseInstrument):
             Dict with current setting
         """
         self.write(f":CURR {current_a},CH{channel}")
-        time.sleep(self.PACING)
 
         actual = float(self.query(f":CURR? CH{channel}"))
         return {
@@ -199,16 +190,18 @@ class DP932A(BaseInstrument):
             Dict with OVP settings
         """
         self.write(f":OUTP:OVP {'ON' if enabled else 'OFF'},CH{channel}")
-        time.sleep(self.PACING)
 
         if voltage_v is not None and enabled:
             self.write(f":OUTP:OVP:VAL {voltage_v},CH{channel}")
-            time.sleep(self.PACING)
 
+        cmds = [f":OUTP:OVP? CH{channel}"]
+        if enabled:
+            cmds.append(f":OUTP:OVP:VAL? CH{channel}")
+        actual = self.query_many(cmds)
         return {
             "channel": channel,
-            "ovp_enabled": self.query(f":OUTP:OVP? CH{channel}").strip() in ["1", "ON"],
-            "ovp_voltage_v": float(self.query(f":OUTP:OVP:VAL? CH{channel}")) if enabled else None
+            "ovp_enabled": actual[0] in ["1", "ON"],
+            "ovp_voltage_v": float(actual[1]) if enabled else None
         }
 
     def set_ocp(
@@ -231,20 +224,21 @@ class DP932A(BaseInstrument):
             Dict with OCP settings
         """
         self.write(f":OUTP:OCP {'ON' if enabled else 'OFF'},CH{channel}")
-        time.sleep(self.PACING)
 
         if current_a is not None and enabled:
             self.write(f":OUTP:OCP:VAL {current_a},CH{channel}")
-            time.sleep(self.PACING)
 
         if delay_ms is not None and enabled:
             self.write(f":OUTP:OCP:DEL {delay_ms},CH{channel}")
-            time.sleep(self.PACING)
 
+        cmds = [f":OUTP:OCP? CH{channel}"]
+        if enabled:
+            cmds.append(f":OUTP:OCP:VAL? CH{channel}")
+        actual = self.query_many(cmds)
         return {
             "channel": channel,
-            "ocp_enabled": self.query(f":OUTP:OCP? CH{channel}").strip() in ["1", "ON"],
-            "ocp_current_a": float(self.query(f":OUTP:OCP:VAL? CH{channel}")) if enabled else None
+            "ocp_enabled": actual[0] in ["1", "ON"],
+            "ocp_current_a": float(actual[1]) if enabled else None
         }
 
     def clear_protection(self, channel: int) -> dict:
@@ -272,9 +266,11 @@ class DP932A(BaseInstrument):
         Returns:
             Dict with voltage_v, current_a, power_w
         """
-        voltage = float(self.query(f":MEAS:VOLT? CH{channel}"))
-        current = float(self.query(f":MEAS:CURR? CH{channel}"))
-        power = float(self.query(f":MEAS:POW? CH{channel}"))
+        voltage, current, power = (
+            float(v) for v in self.query_many([
+                f":MEAS:VOLT? CH{channel}", f":MEAS:CURR? CH{channel}", f":MEAS:POW? CH{channel}"
+            ])
+        )
 
         return {
             "channel": channel,
@@ -323,7 +319,6 @@ class DP932A(BaseInstrument):
             Dict with tracking mode
         """
         self.write(f":OUTP:TRACK {mode}")
-        time.sleep(self.PACING)
 
         actual = int(self.query(":OUTP:TRACK?"))
         mode_names = {0: "independent", 1: "series", 2: "parallel"}
@@ -6,9 +6,16 @@ MSO8204 - Rigol Mixed Signal Oscilloscope Driver.
 2 GHz bandwidth, 10 GSa/s sample rate.
 """
 
+import base64
 import logging
+import re
 import time
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
+
+import numpy as np
+
+from scpi_transport import SCPIError
+from waveform_analysis import analyse_spectrum, characterise
 
 from .base import BaseInstrument
 
@@ -28,6 +35,97 @@ CHARACTERISE_MEASUREMENTS = [
     "OVERshoot", "PREShoot"
 ]
 
+# :MEASure:<name>? names -> :MEASure:ITEM names (statistics table)
+MEASURE_ITEMS = {
+    **{m: m for m in MEASUREMENTS},
+    "VAMPlitude": "VAMP",
+    "VAVerage": "VAVG",
+    "RISetime": "RTIMe",
+    "FALLtime": "FTIMe",
+}
+
+# Accepted spellings (long, short, ITEM name; any case) -> MEASURE_ITEMS key
+MEASURE_ALIASES = {
+    alias.upper(): m
+    for m, item in MEASURE_ITEMS.items()
+    for alias in (m, re.sub(r"[a-z]", "", m), item, re.sub(r"[a-z]", "", item))
+}
+
+
+def measure_name(name: str) -> Optional[str]:
+    """MEASURE_ITEMS key for a measurement name in any accepted spelling."""
+    return MEASURE_ALIASES.get(name.strip().lstrip(":").upper())
+
+
+# Statistics table columns: result key -> :MEASure:STATistic:ITEM? type
+STATISTIC_TYPES = {
+    "current": "CURRent",
+    "average": "AVERages",
+    "max": "MAXimum",
+    "min": "MINimum",
+    "deviation": "DEViation",
+    "count": "CNT",
+}
+
+# characterise_channel result keys
+CHARACTERISE_KEYS = {
+    "FREQuency": "frequency_hz",
+    "PERiod": "period_s",
+    "VPP": "vpp_v",
+    "VAMPlitude": "amplitude_v",
+    "VTOP": "vtop_v",
+    "VBASe": "vbase_v",
+    "VRMS": "vrms_v",
+    "VMAX": "vmax_v",
+    "VMIN": "vmin_v",
+    "RISetime": "rise_time_s",
+    "FALLtime": "fall_time_s",
+    "PDUTy": "duty_cycle_pos_pct",
+    "NDUTy": "duty_cycle_neg_pct",
+    "OVERshoot": "overshoot_pct",
+    "PREShoot": "preshoot_pct"
+}
+
+# Binary waveform formats: :WAVeform:FORMat -> sample dtype
+WAVEFORM_DTYPES = {
+    "BYTE": np.dtype(np.uint8),
+    "WORD": np.dtype("<u2"),  # little-endian, LSB first
+}
+
+# Maximum points per :WAVeform:DATA? transfer in RAW mode
+MAX_TRANSFER_POINTS = {
+    "BYTE": 250000,
+    "WORD": 125000,
+}
+
+# Longest a :SINGle acquisition takes to show as armed (status leaves STOP)
+SINGLE_ARM_S = 0.5
+
+
+def decode_waveform(raw, fmt: str, yinc: float, yorig: float, yref: float,
+                    out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Convert a BYTE/WORD waveform block to volts.
+
+    volts = (code - yorig - yref) * yinc, computed in float32 without
+    intermediate copies. raw is any buffer (bytes, bytearray, memoryview);
+    out may be a preallocated float32 array of matching length.
+
+    Returns:
+        float32 array of voltages
+    """
+    codes = np.frombuffer(raw, dtype=WAVEFORM_DTYPES[fmt.upper()])
+    if out is None:
+        out = np.empty(codes.size, dtype=np.float32)
+    np.subtract(codes, np.float32(yorig + yref), out=out, dtype=np.float32)
+    out *= np.float32(yinc)
+    return out
+
+
+def time_axis(n: int, xinc: float, xorig: float) -> np.ndarray:
+    """Sample times in seconds for n points (float64 to keep ps resolution)."""
+    return xorig + np.arange(n, dtype=np.float64) * xinc
+
 
 class MSO8204(BaseInstrument):
     """
@@ -38,6 +136,20 @@ class MSO8204(BaseInstrument):
     Sample rate: 10 GSa/s
     """
 
+    INVALIDATED_BY = {
+        **BaseInstrument.INVALIDATED_BY,
+        ":AUTOSCALE": (":CHANnel", ":TIMebase", ":TRIGger"),
+        ":SINGLE": (":TRIGger:SWEep",),  # :SINGle switches the sweep to SINGle
+    }
+
+    # Upper-case header prefixes whose writes change waveform scaling and so
+    # drop cached preambles (a :CHANnel<n> write only that channel's)
+    PREAMBLE_INVALIDATED_BY: Tuple[str, ...] = (
+        "*RST", "*RCL", ":AUTOSCALE", ":AUT", ":TIMEBASE", ":TIM",
+        ":ACQUIRE:MDEPTH", ":ACQ:MDEP", ":ACQUIRE:TYPE", ":ACQ:TYPE",
+        ":ACQUIRE:SRATE", ":ACQ:SRAT",
+    )
+
     def get_type(self) -> str:
         return "mso8204"
 
@@ -46,6 +158,20 @@ class MSO8204(BaseInstrument):
         time.sleep(0.5)
         self.clear_errors()
 
+    def _track_write(self, cmd: str) -> None:
+        """Also drop the cached preambles a write makes stale."""
+        super()._track_write(cmd)
+        for part in cmd.split(";"):
+            fields = part.split(None, 1)
+            if not fields:
+                continue
+            header = fields[0].upper()
+            channel = re.match(r":CHAN(?:NEL)?([1-4])", header)
+            if channel:
+                self.invalidate_preamble(int(channel.group(1)))
+            elif header.startswith(self.PREAMBLE_INVALIDATED_BY):
+                self.invalidate_preamble()
+
     # ---- Channel Configuration ----
 
     def channel_config(
@@ -75,39 +201,42 @@ class MSO8204(BaseInstrument):
         """
         ch = f":CHANnel{channel}"
 
-        # Enable/disable
-        self.write(f"{ch}:DISPlay {'ON' if enabled else 'OFF'}")
-        time.sleep(self.PACING)
+        # Only settings that differ from the shadow state are sent
+        with self.batch():
+            # Enable/disable
+            written = [self.write_setting(f"{ch}:DISPlay", "ON" if enabled else "OFF")]
 
-        if scale_v_div is not None:
-            self.write(f"{ch}:SCALe {scale_v_div}")
-            time.sleep(self.PACING)
+            if scale_v_div is not None:
+                written.append(self.write_setting(f"{ch}:SCALe", scale_v_div))
 
-        if offset_v is not None:
-            self.write(f"{ch}:OFFSet {offset_v}")
-            time.sleep(self.PACING)
+            if offset_v is not None:
+                written.append(self.write_setting(f"{ch}:OFFSet", offset_v))
 
-        if coupling is not None:
-            self.write(f"{ch}:COUPling {coupling}")
-            time.sleep(self.PACING)
+            if coupling is not None:
+                written.append(self.write_setting(f"{ch}:COUPling", coupling))
 
-        if probe_ratio is not None:
-            self.write(f"{ch}:PROBe {probe_ratio}")
-            time.sleep(self.PACING)
+            if probe_ratio is not None:
+                # Scale and offset are in probe-corrected volts
+                if self.write_setting(f"{ch}:PROBe", probe_ratio):
+                    self.forget(f"{ch}:SCALe", f"{ch}:OFFSet")
+                    written.append(True)
 
-        if bw_limit is not None:
-            self.write(f"{ch}:BWLimit {'20M' if bw_limit else 'OFF'}")
-            time.sleep(self.PACING)
+            if bw_limit is not None:
+                written.append(self.write_setting(f"{ch}:BWLimit", "20M" if bw_limit else "OFF"))
 
-        # Read back settings
+        # Read back settings (from the shadow state when nothing changed)
+        display, scale, offset, coupling, probe, bw_limit = self.read_settings([
+            f"{ch}:DISPlay", f"{ch}:SCALe", f"{ch}:OFFSet",
+            f"{ch}:COUPling", f"{ch}:PROBe", f"{ch}:BWLimit"
+        ], fresh=any(written))
         return {
             "channel": channel,
-            "enabled": self.query(f"{ch}:DISPlay?").strip() == "1",
-            "scale_v_div": float(self.query(f"{ch}:SCALe?")),
-            "offset_v": float(self.query(f"{ch}:OFFSet?")),
-            "coupling": self.query(f"{ch}:COUPling?").strip(),
-            "probe_ratio": float(self.query(f"{ch}:PROBe?")),
-            "bw_limit": self.query(f"{ch}:BWLimit?").strip()
+            "enabled": display.upper() in ("1", "ON"),
+            "scale_v_div": float(scale),
+            "offset_v": float(offset),
+            "coupling": coupling,
+            "probe_ratio": float(probe),
+            "bw_limit": bw_limit
         }
 
     # ---- Timebase Configuration ----
@@ -129,17 +258,20 @@ class MSO8204(BaseInstrument):
         Returns:
             Dict with applied settings
         """
-        self.write(f":TIMebase:MODE {mode}")
-        time.sleep(self.PACING)
-        self.write(f":TIMebase:MAIN:SCALe {scale_s_div}")
-        time.sleep(self.PACING)
-        self.write(f":TIMebase:MAIN:OFFSet {offset_s}")
-        time.sleep(self.PACING)
-
+        with self.batch():
+            written = [
+                self.write_setting(":TIMebase:MODE", mode),
+                self.write_setting(":TIMebase:MAIN:SCALe", scale_s_div),
+                self.write_setting(":TIMebase:MAIN:OFFSet", offset_s),
+            ]
+
+        scale, offset, actual_mode = self.read_settings([
+            ":TIMebase:MAIN:SCALe", ":TIMebase:MAIN:OFFSet", ":TIMebase:MODE"
+        ], fresh=any(written))
         return {
-            "scale_s_div": float(self.query(":TIMebase:MAIN:SCALe?")),
-            "offset_s": float(self.query(":TIMebase:MAIN:OFFSet?")),
-            "mode": self.query(":TIMebase:MODE?").strip()
+            "scale_s_div": float(scale),
+            "offset_s": float(offset),
+            "mode": actual_mode
         }
 
     # ---- Trigger Configuration ----
@@ -165,26 +297,31 @@ class MSO8204(BaseInstrument):
         Returns:
             Dict with trigger settings
         """
-        self.write(f":TRIGger:MODE {mode}")
-        time.sleep(self.PACING)
-        self.write(f":TRIGger:SWEep {sweep}")
-        time.sleep(self.PACING)
-
-        if mode.upper() == "EDGE":
-            self.write(f":TRIGger:EDGe:SOURce {source}")
-            time.sleep(self.PACING)
-            self.write(f":TRIGger:EDGe:LEVel {level_v}")
-            time.sleep(self.PACING)
-            self.write(f":TRIGger:EDGe:SLOPe {slope}")
-            time.sleep(self.PACING)
-
+        with self.batch():
+            written = [
+                self.write_setting(":TRIGger:MODE", mode),
+                self.write_setting(":TRIGger:SWEep", sweep),
+            ]
+
+            if mode.upper() == "EDGE":
+                written += [
+                    self.write_setting(":TRIGger:EDGe:SOURce", source),
+                    self.write_setting(":TRIGger:EDGe:LEVel", level_v),
+                    self.write_setting(":TRIGger:EDGe:SLOPe", slope),
+                ]
+
+        # Settings from the shadow state unless changed; status is always live
+        actual = self.read_settings([
+            ":TRIGger:MODE", ":TRIGger:EDGe:SOURce", ":TRIGger:EDGe:LEVel",
+            ":TRIGger:EDGe:SLOPe", ":TRIGger:SWEep"
+        ], fresh=any(written), live=[":TRIGger:STATus?"])
         return {
-            "mode": self.query(":TRIGger:MODE?").strip(),
-            "source": self.query(":TRIGger:EDGe:SOURce?").strip(),
-            "level_v": float(self.query(":TRIGger:EDGe:LEVel?")),
-            "slope": self.query(":TRIGger:EDGe:SLOPe?").strip(),
-            "sweep": self.query(":TRIGger:SWEep?").strip(),
-            "status": self.query(":TRIGger:STATus?").strip()
+            "mode": actual[0],
+            "source": actual[1],
+            "level_v": float(actual[2]),
+            "slope": actual[3],
+            "sweep": actual[4],
+            "status": actual[5]
         }
 
     # ---- Acquisition Control ----
@@ -220,7 +357,6 @@ class MSO8204(BaseInstrument):
         else:
             return {"error": f"Invalid mode: {mode}"}
 
-        time.sleep(self.PACING)
         return {
             "mode": mode.upper(),
             "trigger_status": self.query(":TRIGger:STATus?").strip()
@@ -228,28 +364,127 @@ class MSO8204(BaseInstrument):
 
     # ---- Measurements ----
 
-    def measure(self, channel: int, measurements: List[str]) -> dict:
+    @staticmethod
+    def _to_float(text: str) -> Optional[float]:
+        try:
+            return float(text)
+        except ValueError:
+            return None
+
+    def measure(
+        self,
+        channel: int,
+        measurements: List[str],
+        single: bool = False,
+        timeout_s: float = 5.0
+    ) -> dict:
         """
         Take measurements on a channel.
 
+        The source selection and every :MEASure:<m>? query go out as one
+        program message and are answered in one round-trip. With
+        single=True a single acquisition is triggered first, so every
+        value is computed from the same trigger.
+
         Args:
             channel: Channel number (1-4)
-            measurements: List of measurement names (e.g., ["FREQuency", "VPP"])
+            measurements: List of measurement names (e.g., ["FREQuency", "VPP"]);
+                long or short form in any case
+            single: Trigger one acquisition and measure the stopped waveform
+            timeout_s: Maximum wait for the trigger when single is set
 
         Returns:
-            Dict with channel and results mapping
+            Dict with channel and results mapping (keyed by the names given)
         """
-        self.write(f":MEASure:SOURce CHANnel{channel}")
-        time.sleep(self.PACING)
+        unknown = [m for m in measurements if measure_name(m) is None]
+        if unknown:
+            return {"error": f"Unknown measurements {unknown}. Valid: {MEASUREMENTS}"}
+        headers = [measure_name(m) for m in measurements]
+        results = {m: None for m in measurements}
+
+        if single:
+            if not self._single(timeout_s):
+                return {"error": f"No trigger within {timeout_s}s", "channel": channel}
+
+        try:
+            with self.batch() as b:
+                self.write(f":MEASure:SOURce CHANnel{channel}")
+                for header in headers:
+                    b.query(f":MEASure:{header}?")
+            values = b.results
+        except SCPIError as e:
+            # One bad reply desynchronises the combined read; drop whatever
+            # is left of it and fall back to individual queries so the
+            # others still come back
+            logger.warning("Combined measurement read failed (%s), querying individually", e)
+            if not self._sock.connected:
+                return {"error": str(e), "channel": channel}
+            self._sock.flush_input()
+            values = []
+            for header in headers:
+                try:
+                    values.append(self.query(f":MEASure:{header}?"))
+                except SCPIError as e:
+                    logger.warning("Measurement %s failed: %s", header, e)
+                    values.append("")
+
+        for m, val in zip(measurements, values):
+            results[m] = self._to_float(val)
 
-        results = {}
+        return {
+            "channel": channel,
+            "results": results
+        }
+
+    def measure_statistics(
+        self,
+        channel: int,
+        measurements: List[str],
+        stats: Optional[List[str]] = None,
+        reset: bool = False
+    ) -> dict:
+        """
+        Read measurements from the scope's statistics table.
+
+        Adds every item to the measurement list and reads all requested
+        statistics columns in one round-trip. The statistics accumulate
+        over successive triggers, so average/min/max/deviation describe
+        the signal over many acquisitions.
+
+        Args:
+            channel: Channel number (1-4)
+            measurements: List of measurement names (e.g., ["FREQuency", "VPP"]),
+                long or short form in any case
+            stats: Columns to read ("current", "average", "max", "min",
+                   "deviation", "count"); default all
+            reset: Clear accumulated statistics before reading
+
+        Returns:
+            Dict with channel and results mapping measurement -> {stat: value}
+        """
+        stats = stats or list(STATISTIC_TYPES)
+        bad = [st for st in stats if st not in STATISTIC_TYPES]
+        if bad:
+            return {"error": f"Unknown statistics {bad}. Valid: {list(STATISTIC_TYPES)}"}
+        unknown = [m for m in measurements if measure_name(m) is None]
+        if unknown:
+            return {"error": f"Unknown measurements {unknown}. Valid: {MEASUREMENTS}"}
+        items = [MEASURE_ITEMS[measure_name(m)] for m in measurements]
+        results = {m: None for m in measurements}
+        src = f"CHANnel{channel}"
+
+        with self.batch():
+            self.write(":MEASure:STATistic:DISPlay ON")
+            for item in items:
+                self.write(f":MEASure:ITEM {item},{src}")
+            if reset:
+                self.write(":MEASure:STATistic:RESet")
+
+        queries = [f":MEASure:STATistic:ITEM? {STATISTIC_TYPES[st]},{item},{src}"
+                   for item in items for st in stats]
+        values = iter(self.query_many(queries))
         for m in measurements:
-            try:
-                val = self.query(f":MEASure:{m}?")
-                results[m] = float(val)
-            except (ValueError, Exception) as e:
-                logger.warning("Measurement %s failed: %s", m, e)
-                results[m] = None
+            results[m] = {st: self._to_float(next(values)) for st in stats}
 
         return {
             "channel": channel,
@@ -272,13 +507,12 @@ class MSO8204(BaseInstrument):
         Returns:
             Dict with frequency_hz (authoritative) and source
         """
-        # Enable the counter
-        self.write(":COUNter:ENABle ON")
-        time.sleep(self.PACING)
+        with self.batch():
+            # Enable the counter
+            self.write(":COUNter:ENABle ON")
 
-        # Set source channel
-        self.write(f":COUNter:SOURce CHANnel{channel}")
-        time.sleep(self.PACING)
+            # Set source channel
+            self.write(f":COUNter:SOURce CHANnel{channel}")
 
         # Wait for counter to settle (hardware gating needs a measurement window)
         time.sleep(0.3)
@@ -311,18 +545,19 @@ class MSO8204(BaseInstrument):
         Returns:
             Dict with phase measurements in degrees
         """
-        self.write(f":MEASure:SetUp:PSA CHANnel{source_a}")
-        time.sleep(self.PACING)
-        self.write(f":MEASure:SetUp:PSB CHANnel{source_b}")
-        time.sleep(self.PACING)
+        with self.batch():
+            self.write(f":MEASure:SetUp:PSA CHANnel{source_a}")
+            self.write(f":MEASure:SetUp:PSB CHANnel{source_b}")
+
+        rphase_str, fphase_str = self.query_many([":MEASure:RPHase?", ":MEASure:FPHase?"])
 
         try:
-            rphase = float(self.query(":MEASure:RPHase?"))
+            rphase = float(rphase_str)
         except ValueError:
             rphase = None
 
         try:
-            fphase = float(self.query(":MEASure:FPHase?"))
+            fphase = float(fphase_str)
         except ValueError:
             fphase = None
 
@@ -335,79 +570,447 @@ class MSO8204(BaseInstrument):
 
     # ---- Waveform Data ----
 
+    @property
+    def _preambles(self) -> Dict[tuple, dict]:
+        """Parsed preambles cached on the connection, keyed by (channel, mode, fmt, points)."""
+        return self._sock.cache.setdefault("mso8204.preamble", {})
+
+    def invalidate_preamble(self, channel: Optional[int] = None) -> None:
+        """
+        Drop cached waveform preambles.
+
+        Args:
+            channel: Channel whose scaling changed (None = all channels)
+        """
+        if channel is None:
+            self._preambles.clear()
+            return
+        for key in [k for k in self._preambles if k[0] == channel]:
+            del self._preambles[key]
+
+    @staticmethod
+    def _parse_preamble(text: str, srate: str) -> dict:
+        """
+        Parse a :WAVeform:PREamble? reply.
+
+        Fields: format, type, points, count, xincrement, xorigin,
+        xreference, yincrement, yorigin, yreference.
+        """
+        fields = text.split(",")
+        if len(fields) < 10:
+            raise ValueError(f"Unexpected waveform preamble: {text!r}")
+        xinc, xorig = float(fields[4]), float(fields[5])
+        try:
+            sample_rate = float(srate)
+        except ValueError:
+            sample_rate = 1.0 / xinc if xinc > 0 else None
+        return {
+            "points": int(float(fields[2])),
+            "xinc_s": xinc,
+            "xorig_s": xorig,
+            "yinc_v": float(fields[7]),
+            "yorig_v": float(fields[8]),
+            "yref": float(fields[9]),
+            "sample_rate": sample_rate
+        }
+
+    def _waveform_setup(
+        self,
+        channel: int,
+        mode: str,
+        fmt: str,
+        points: Optional[int],
+        fresh: bool = False
+    ) -> dict:
+        """
+        Select waveform source/mode/format and return the scaling.
+
+        The setup writes and, when not cached, :WAVeform:PREamble? and
+        :ACQuire:SRATe? go out as one program message. The parsed preamble
+        is cached per channel until a write that changes the scaling
+        (see PREAMBLE_INVALIDATED_BY) or a reset.
+        """
+        key = (channel, mode.upper(), fmt.upper(), points)
+        scaling = None if fresh else self._preambles.get(key)
+
+        with self.batch() as b:
+            self.write(f":WAVeform:SOURce CHANnel{channel}")
+            self.write(f":WAVeform:MODE {mode}")
+            self.write(f":WAVeform:FORMat {fmt}")
+
+            if points is not None:
+                self.write(f":WAVeform:POINts {points}")
+
+            if scaling is None:
+                b.query(":WAVeform:PREamble?")
+                b.query(":ACQuire:SRATe?")
+
+        if scaling is None:
+            scaling = self._parse_preamble(b.results[0], b.results[1])
+            self._preambles[key] = scaling
+        return {k: v for k, v in scaling.items() if k != "points"}
+
+    def waveform_array(
+        self,
+        channel: int,
+        mode: str = "NORMal",
+        fmt: str = "BYTE",
+        points: Optional[int] = None,
+        with_time: bool = False
+    ) -> dict:
+        """
+        Capture a waveform as a float32 NumPy array of volts.
+
+        Reads a BYTE or WORD block and scales it in one vectorised pass,
+        so million-point captures decode in milliseconds.
+
+        Args:
+            channel: Channel number (1-4)
+            mode: Data mode ("NORMal" = screen, "RAW" = full memory)
+            fmt: Binary format ("BYTE" or "WORD")
+            points: Number of points to read (optional)
+            with_time: Also return the time axis
+
+        Returns:
+            Dict with volts (float32 ndarray), time_s (float64 ndarray or
+            None), points and scaling parameters
+        """
+        if fmt.upper() not in WAVEFORM_DTYPES:
+            raise ValueError(f"Binary format must be BYTE or WORD, got {fmt}")
+
+        scaling = self._waveform_setup(channel, mode, fmt, points)
+        raw = self.query_block(":WAVeform:DATA?")
+        volts = decode_waveform(raw, fmt, scaling["yinc_v"], scaling["yorig_v"], scaling["yref"])
+
+        return {
+            "channel": channel,
+            "points": volts.size,
+            **scaling,
+            "format": fmt,
+            "volts": volts,
+            "time_s": time_axis(volts.size, scaling["xinc_s"], scaling["xorig_s"]) if with_time else None
+        }
+
     def waveform(
         self,
         channel: int,
         mode: str = "NORMal",
         fmt: str = "ASCii",
-        points: Optional[int] = None
+        points: Optional[int] = None,
+        with_time: bool = False
     ) -> dict:
         """
         Capture raw waveform data from a channel.
 
+        BYTE/WORD captures are decoded and scaled to volts on the host and
+        returned as base64 little-endian float32 (decode with
+        numpy.frombuffer(base64.b64decode(data), "<f4")).
+
         Args:
             channel: Channel number (1-4)
             mode: Data mode ("NORMal" = screen, "RAW" = full memory)
             fmt: Data format ("ASCii", "BYTE", "WORD")
             points: Number of points to read (optional)
+            with_time: Include the time axis (base64 float64 for binary formats)
 
         Returns:
             Dict with waveform data and scaling parameters
         """
-        self.write(f":WAVeform:SOURce CHANnel{channel}")
-        time.sleep(self.PACING)
-        self.write(f":WAVeform:MODE {mode}")
-        time.sleep(self.PACING)
-        self.write(f":WAVeform:FORMat {fmt}")
-        time.sleep(self.PACING)
-
-        if points is not None:
-            self.write(f":WAVeform:POINts {points}")
-            time.sleep(self.PACING)
-
-        # Get scaling parameters
-        xinc = float(self.query(":WAVeform:XINCrement?"))
-        xorig = float(self.query(":WAVeform:XORigin?"))
-        yinc = float(self.query(":WAVeform:YINCrement?"))
-        yorig = float(self.query(":WAVeform:YORigin?"))
-        yref = float(self.query(":WAVeform:YREFerence?"))
-
-        # Get sample rate
-        try:
-            srate = float(self.query(":ACQuire:SRATe?"))
-        except ValueError:
-            srate = 1.0 / xinc if xinc > 0 else None
+        if fmt.upper() in WAVEFORM_DTYPES:
+            wf = self.waveform_array(channel, mode, fmt, points, with_time)
+            volts, times = wf.pop("volts"), wf.pop("time_s")
+            wf["encoding"] = "float32-le-base64"
+            wf["data"] = base64.b64encode(volts.astype("<f4", copy=False).tobytes()).decode("ascii")
+            if times is not None:
+                wf["time_s"] = base64.b64encode(times.astype("<f8", copy=False).tobytes()).decode("ascii")
+            return wf
+
+        scaling = self._waveform_setup(channel, mode, fmt, points)
 
         # Get data
-        if fmt.upper() == "ASCII":
-            text = self.query(":WAVeform:DATA?")
-            # ASCII format returns comma-separated values
-            if text.startswith("#"):
-                # Block header, strip it
-                d = int(text[1])
-                text = text[2 + d:]
-            raw_values = [float(v) for v in text.split(",") if v.strip()]
-            # Convert to voltage
-            data = [(v - yref - yorig) * yinc for v in raw_values]
-        else:
-            # Binary format - return as base64
-            import base64
-            raw_data = self.query_block(":WAVeform:DATA?")
-            data = base64.b64encode(raw_data).decode("ascii")
+        text = self.query(":WAVeform:DATA?")
+        # ASCII format returns comma-separated values
+        if text.startswith("#"):
+            # Block header, strip it
+            d = int(text[1])
+            text = text[2 + d:]
+        raw_values = np.array([v for v in text.split(",") if v.strip()], dtype=np.float64)
+        # Convert to voltage
+        data = (raw_values - scaling["yref"] - scaling["yorig_v"]) * scaling["yinc_v"]
+
+        result = {
+            "channel": channel,
+            "points": data.size,
+            **scaling,
+            "format": fmt,
+            "data": data.tolist()
+        }
+        if with_time:
+            result["time_s"] = time_axis(data.size, scaling["xinc_s"], scaling["xorig_s"]).tolist()
+        return result
+
+    def waveform_deep(
+        self,
+        channel: int,
+        fmt: str = "BYTE",
+        points: Optional[int] = None,
+        out: Optional[np.ndarray] = None,
+        filename: Optional[str] = None,
+        chunk_points: Optional[int] = None,
+        stop: bool = True
+    ) -> dict:
+        """
+        Download deep acquisition memory in :WAVeform:STARt/:STOP windows.
+
+        A single :WAVeform:DATA? returns at most MAX_TRANSFER_POINTS in
+        RAW mode, so the memory is walked window by window. The request
+        for the next window is sent before the current one is decoded, so
+        the scope prepares and transmits it while the host scales. Samples
+        land directly in a preallocated float32 array, or in a .npy
+        memory-mapped file when filename is given. The :WAVeform:STARt/STOP
+        window is put back afterwards, even if a transfer fails.
+
+        Args:
+            channel: Channel number (1-4)
+            fmt: Binary format ("BYTE" or "WORD")
+            points: Points to read (default: full memory depth, from the
+                RAW preamble)
+            out: Preallocated float32 array to fill (optional)
+            filename: Write to this .npy file via numpy memmap (optional)
+            chunk_points: Points per transfer (default: per-format maximum)
+            stop: Stop acquisition first (RAW memory is only readable stopped)
+
+        Returns:
+            Dict with volts (array or memmap), points, chunks, elapsed_s,
+            throughput_mbps and scaling parameters
+        """
+        fmt = fmt.upper()
+        if fmt not in WAVEFORM_DTYPES:
+            raise ValueError(f"Binary format must be BYTE or WORD, got {fmt}")
+        if points is not None and points <= 0:
+            raise ValueError(f"points must be positive, got {points}")
 
-        actual_points = int(self.query(":WAVeform:POINts?"))
+        if stop:
+            self.write(":STOP")
+        # Always re-read the RAW preamble: it goes out with the setup writes,
+        # and its point count is the depth of the memory just acquired
+        # (:ACQuire:MDEPth? may just answer AUTO)
+        scaling = self._waveform_setup(channel, "RAW", fmt, None, fresh=True)
+        if points is None:
+            points = self._preambles[(channel, "RAW", fmt, None)]["points"]
+            if points <= 0:
+                raise SCPIError(f"Scope reports no acquisition memory ({points} points)")
+        # The data window is restored afterwards, so later reads are unaffected
+        saved = self.query_many([":WAVeform:STARt?", ":WAVeform:STOP?"])
+        chunk = min(chunk_points or MAX_TRANSFER_POINTS[fmt], MAX_TRANSFER_POINTS[fmt], points)
+
+        if out is None:
+            if filename is not None:
+                out = np.lib.format.open_memmap(filename, mode="w+", dtype=np.float32, shape=(points,))
+            else:
+                out = np.empty(points, dtype=np.float32)
+        elif out.dtype != np.float32 or out.size < points:
+            raise ValueError(f"out must be a float32 array of at least {points} points")
+
+        itemsize = WAVEFORM_DTYPES[fmt].itemsize
+        raw = bytearray(chunk * itemsize)
+        windows = [(start, min(start + chunk - 1, points)) for start in range(1, points + 1, chunk)]
+
+        def request(window) -> None:
+            self._sock.send_query(
+                f":WAVeform:STARt {window[0]};:WAVeform:STOP {window[1]};:WAVeform:DATA?")
 
+        t0 = time.time()
+        received = 0
+        try:
+            request(windows[0])
+            for i, (start, stop_point) in enumerate(windows):
+                n = self._sock.read_block_into(raw)
+                expected = (stop_point - start + 1) * itemsize
+                if n != expected:
+                    raise SCPIError(
+                        f"Window {start}-{stop_point} returned {n} bytes, expected {expected}")
+                received += n
+                if i + 1 < len(windows):
+                    request(windows[i + 1])  # scope works on the next window while we decode
+                decode_waveform(memoryview(raw)[:n], fmt, scaling["yinc_v"], scaling["yorig_v"],
+                                scaling["yref"], out=out[start - 1:stop_point])
+        finally:
+            if self._sock.connected:
+                self.write(f":WAVeform:STARt {int(float(saved[0]))};"
+                           f":WAVeform:STOP {int(float(saved[1]))}")
+        elapsed = time.time() - t0
+
+        if filename is not None and isinstance(out, np.memmap):
+            out.flush()
+
+        throughput = received / elapsed / 1e6 if elapsed > 0 else None
+        logger.info("Deep waveform CH%d: %d points in %d chunks, %.2fs (%.1f MB/s)",
+                    channel, points, len(windows), elapsed, throughput or 0)
         return {
             "channel": channel,
-            "points": actual_points,
+            "points": points,
+            **scaling,
+            "format": fmt,
+            "volts": out[:points],
+            "filename": filename,
+            "chunks": len(windows),
+            "bytes": received,
+            "elapsed_s": elapsed,
+            "throughput_mbps": throughput
+        }
+
+    def _single(self, timeout_s: float) -> bool:
+        """
+        Trigger one :SINGle acquisition and wait until it has completed.
+
+        The status still reads STOP from the previous acquisition until the
+        scope has armed, so :SINGle is confirmed with *OPC? and the status
+        must first leave STOP before a STOP counts as completion. If it
+        never leaves STOP within SINGLE_ARM_S, the acquisition triggered
+        and finished between polls.
+        """
+        deadline = time.time() + timeout_s
+        self.write(":SINGle")
+        self.query_opc()
+        arm_deadline = min(time.time() + SINGLE_ARM_S, deadline)
+        armed = False
+        while time.time() < deadline:
+            stopped = self.query(":TRIGger:STATus?").strip().upper() == "STOP"
+            if not stopped:
+                armed = True
+            elif armed or time.time() >= arm_deadline:
+                return True
+            time.sleep(0.05)
+        return False
+
+    def capture_channels(
+        self,
+        channels: List[int],
+        mode: str = "NORMal",
+        fmt: str = "BYTE",
+        points: Optional[int] = None,
+        single: bool = True,
+        timeout_s: float = 5.0,
+        with_time: bool = False
+    ) -> dict:
+        """
+        Capture several channels from one acquisition as an aligned 2-D array.
+
+        Triggers a single acquisition (or uses the current stopped one),
+        then reads every uncached channel's preamble in one round-trip
+        (horizontal scaling is shared, vertical scaling is per channel).
+        Channel data blocks are pipelined: the next channel's
+        :WAVeform:DATA? is sent before the current one is decoded.
+
+        Args:
+            channels: Channel numbers (1-4), e.g. [1, 2, 3, 4]
+            mode: Data mode ("NORMal" = screen, "RAW" = full memory)
+            fmt: Binary format ("BYTE" or "WORD")
+            points: Number of points per channel (optional)
+            single: Trigger one :SINGle acquisition first; if False, stop
+                    and read what is on screen
+            timeout_s: Maximum wait for the trigger
+            with_time: Also return the shared time axis
+
+        Returns:
+            Dict with volts (float32 ndarray, one row per channel),
+            channels, points, shared horizontal scaling, per-channel
+            vertical scaling and optional time_s
+        """
+        fmt = fmt.upper()
+        if fmt not in WAVEFORM_DTYPES:
+            raise ValueError(f"Binary format must be BYTE or WORD, got {fmt}")
+        if not channels:
+            raise ValueError("At least one channel is required")
+
+        if single:
+            if not self._single(timeout_s):
+                return {"error": f"No trigger within {timeout_s}s", "channels": channels}
+        else:
+            self.write(":STOP")
+
+        keys = {ch: (ch, mode.upper(), fmt, points) for ch in channels}
+        missing = [ch for ch in channels if keys[ch] not in self._preambles]
+        with self.batch() as b:
+            self.write(f":WAVeform:MODE {mode}")
+            self.write(f":WAVeform:FORMat {fmt}")
+            if points is not None:
+                self.write(f":WAVeform:POINts {points}")
+            if missing:
+                b.query(":ACQuire:SRATe?")
+            for ch in missing:
+                self.write(f":WAVeform:SOURce CHANnel{ch}")
+                b.query(":WAVeform:PREamble?")
+        for i, ch in enumerate(missing):
+            self._preambles[keys[ch]] = self._parse_preamble(b.results[1 + i], b.results[0])
+
+        preambles = [self._preambles[keys[ch]] for ch in channels]
+        xinc, xorig = preambles[0]["xinc_s"], preambles[0]["xorig_s"]
+        srate = preambles[0]["sample_rate"]
+        n = max(p["points"] for p in preambles)
+        vertical = [(p["yinc_v"], p["yorig_v"], p["yref"]) for p in preambles]
+
+        itemsize = WAVEFORM_DTYPES[fmt].itemsize
+        volts = np.empty((len(channels), n), dtype=np.float32)
+        raw = bytearray(n * itemsize)
+
+        def request(ch: int) -> None:
+            self._sock.send_query(f":WAVeform:SOURce CHANnel{ch};:WAVeform:DATA?")
+
+        request(channels[0])
+        for i, ch in enumerate(channels):
+            size = self._sock.read_block_into(raw)
+            if i + 1 < len(channels):
+                request(channels[i + 1])  # scope sends the next channel while we decode
+            count = size // itemsize
+            n = min(n, count)
+            yinc, yorig, yref = vertical[i]
+            decode_waveform(memoryview(raw)[:size], fmt, yinc, yorig, yref, out=volts[i, :count])
+
+        volts = volts[:, :n]  # align all rows to the shortest block
+        return {
+            "channels": channels,
+            "points": n,
             "xinc_s": xinc,
             "xorig_s": xorig,
-            "yinc_v": yinc,
-            "yorig_v": yorig,
-            "yref": yref,
             "sample_rate": srate,
             "format": fmt,
-            "data": data
+            "vertical": {
+                ch: {"yinc_v": yinc, "yorig_v": yorig, "yref": yref}
+                for ch, (yinc, yorig, yref) in zip(channels, vertical)
+            },
+            "volts": volts,
+            "time_s": time_axis(n, xinc, xorig) if with_time else None
+        }
+
+    def stream_segment(
+        self,
+        channels: List[int],
+        mode: str = "NORMal",
+        points: Optional[int] = None,
+        timeout_s: float = 2.0
+    ) -> Optional[tuple]:
+        """
+        Capture one segment for an AcquisitionStream.
+
+        Arms a single acquisition and downloads the channels from it.
+
+        Returns:
+            (volts, info) with volts shaped (channels, points) and info
+            holding bytes transferred and the horizontal scaling, or None
+            if no trigger arrived within timeout_s
+        """
+        capture = self.capture_channels(channels, mode, "BYTE", points, True, timeout_s)
+        if "error" in capture:
+            return None
+        volts = capture["volts"]
+        return volts, {
+            "bytes": volts.size,  # BYTE transfer: one byte per sample
+            "channels": channels,
+            "xinc_s": capture["xinc_s"],
+            "xorig_s": capture["xorig_s"],
+            "sample_rate": capture["sample_rate"]
         }
 
     # ---- FFT ----
@@ -429,16 +1032,12 @@ class MSO8204(BaseInstrument):
         Returns:
             Dict with FFT configuration
         """
-        self.write(":MATH:DISPlay ON")
-        time.sleep(self.PACING)
-        self.write(":MATH:OPERator FFT")
-        time.sleep(self.PACING)
-        self.write(f":MATH:SOURce1 CHANnel{source_channel}")
-        time.sleep(self.PACING)
-        self.write(f":MATH:FFT:WINDow {window}")
-        time.sleep(self.PACING)
-        self.write(f":MATH:FFT:UNIT {unit}")
-        time.sleep(self.PACING)
+        with self.batch():
+            self.write(":MATH:DISPlay ON")
+            self.write(":MATH:OPERator FFT")
+            self.write(f":MATH:SOURce1 CHANnel{source_channel}")
+            self.write(f":MATH:FFT:WINDow {window}")
+            self.write(f":MATH:FFT:UNIT {unit}")
 
         return {
             "enabled": True,
@@ -447,6 +1046,62 @@ class MSO8204(BaseInstrument):
             "unit": unit
         }
 
+    def spectrum(
+        self,
+        channel: int,
+        window: str = "HANNing",
+        unit: str = "DBV",
+        averages: int = 1,
+        mode: str = "NORMal",
+        points: Optional[int] = None,
+        n_peaks: int = 10,
+        n_harmonics: int = 5,
+        timeout_s: float = 5.0
+    ) -> dict:
+        """
+        Host-side FFT of captured waveforms.
+
+        Triggers `averages` single acquisitions, stacks them in one
+        preallocated array and power-averages their spectra with
+        waveform_analysis.analyse_spectrum(). Only the peak and harmonic
+        tables are returned, not the bins.
+
+        Args:
+            channel: Channel number (1-4)
+            window: Window function ("RECTangle", "HANNing", "HAMMing", "BLACkman", "FLATtop")
+            unit: Level unit ("VRMS", "DBV", "DBM" into 50 ohm)
+            averages: Number of captures to average
+            mode: Data mode ("NORMal" = screen, "RAW" = full memory)
+            points: Number of points per capture (optional)
+            n_peaks: Rows in the peak table
+            n_harmonics: Harmonics (including the fundamental) to analyse
+            timeout_s: Maximum wait for each trigger
+
+        Returns:
+            Dict with sample_rate, resolution_hz, fundamental, THD, SNR,
+            SINAD, SFDR, harmonics and peaks
+        """
+        if averages < 1:
+            return {"error": "averages must be at least 1"}
+
+        stack = None
+        for i in range(averages):
+            capture = self.capture_channels([channel], mode, "BYTE", points, True, timeout_s)
+            if "error" in capture:
+                return capture
+            row = capture["volts"][0]
+            if stack is None:
+                stack = np.empty((averages, row.size), dtype=np.float32)
+            n = min(row.size, stack.shape[1])
+            stack = stack[:, :n]
+            stack[i] = row[:n]
+
+        return {
+            "channel": channel,
+            "sample_rate": capture["sample_rate"],
+            **analyse_spectrum(stack, capture["xinc_s"], window, unit, n_peaks, n_harmonics)
+        }
+
     # ---- Screenshot ----
 
     def screenshot(self, filename: str, fmt: str = "PNG") -> dict:
@@ -461,17 +1116,15 @@ class MSO8204(BaseInstrument):
             Dict with filename, size_bytes, format
         """
         try:
-            data = self.query_block(f":DISPlay:DATA? ON,OFF,{fmt}")
+            with open(filename, "wb") as f:
+                size = self.query_block_stream(f":DISPlay:DATA? ON,OFF,{fmt}", f)
         except Exception as e:
             return {"error": f"Screenshot failed: {e}"}
 
-        with open(filename, "wb") as f:
-            f.write(data)
-
-        logger.info("Screenshot saved: %s (%d bytes)", filename, len(data))
+        logger.info("Screenshot saved: %s (%d bytes)", filename, size)
         return {
             "filename": filename,
-            "size_bytes": len(data),
+            "size_bytes": size,
             "format": fmt
         }
 
@@ -489,66 +1142,89 @@ class MSO8204(BaseInstrument):
             Comprehensive measurement results
         """
         # Enable channel
-        self.write(f":CHANnel{channel}:DISPlay ON")
-        time.sleep(self.PACING)
+        self.write_setting(f":CHANnel{channel}:DISPlay", "ON")
 
         if autoscale:
             self.autoscale()
 
         # Set up trigger
-        self.write(":TRIGger:MODE EDGE")
-        time.sleep(self.PACING)
-        self.write(f":TRIGger:EDGe:SOURce CHANnel{channel}")
-        time.sleep(self.PACING)
-        self.write(":TRIGger:SWEep NORMal")
-        time.sleep(self.PACING)
-
-        # Single acquisition
-        self.write(":SINGle")
+        with self.batch():
+            self.write_setting(":TRIGger:MODE", "EDGE")
+            self.write_setting(":TRIGger:EDGe:SOURce", f"CHANnel{channel}")
+            self.write_setting(":TRIGger:SWEep", "NORMal")
+
+            # Single acquisition
+            self.write(":SINGle")
         time.sleep(0.5)
         self.query_opc()
 
-        # Take measurements
-        self.write(f":MEASure:SOURce CHANnel{channel}")
-        time.sleep(self.PACING)
-
+        coupling, probe = self.read_settings([
+            f":CHANnel{channel}:COUPling", f":CHANnel{channel}:PROBe"
+        ])
         results = {
             "channel": channel,
-            "coupling": self.query(f":CHANnel{channel}:COUPling?").strip(),
-            "probe_ratio": float(self.query(f":CHANnel{channel}:PROBe?"))
+            "coupling": coupling,
+            "probe_ratio": float(probe)
         }
 
-        # Measure all parameters
-        for m in CHARACTERISE_MEASUREMENTS:
-            try:
-                val = float(self.query(f":MEASure:{m}?"))
-                # Map SCPI names to result keys
-                key_map = {
-                    "FREQuency": "frequency_hz",
-                    "PERiod": "period_s",
-                    "VPP": "vpp_v",
-                    "VAMPlitude": "amplitude_v",
-                    "VTOP": "vtop_v",
-                    "VBASe": "vbase_v",
-                    "VRMS": "vrms_v",
-                    "VMAX": "vmax_v",
-                    "VMIN": "vmin_v",
-                    "RISetime": "rise_time_s",
-                    "FALLtime": "fall_time_s",
-                    "PDUTy": "duty_cycle_pos_pct",
-                    "NDUTy": "duty_cycle_neg_pct",
-                    "OVERshoot": "overshoot_pct",
-                    "PREShoot": "preshoot_pct"
-                }
-                results[key_map.get(m, m.lower())] = val
-            except (ValueError, Exception):
-                results[m.lower()] = None
+        # Measure all parameters in one round-trip
+        measured = self.measure(channel, CHARACTERISE_MEASUREMENTS)["results"]
+        for m, val in measured.items():
+            results[CHARACTERISE_KEYS.get(m, m.lower())] = val
 
         # Infer waveform shape from measurements
         results["waveform_shape"] = self._infer_waveform_shape(results)
 
         return results
 
+    def characterise_waveform(
+        self,
+        channel: int,
+        autoscale: bool = True,
+        mode: str = "NORMal",
+        points: Optional[int] = None,
+        timeout_s: float = 5.0
+    ) -> dict:
+        """
+        Signal characterisation computed on the host from one capture.
+
+        Triggers a single acquisition, downloads the channel once as BYTE
+        data and derives the characterise_channel() parameters with
+        waveform_analysis.characterise(), instead of asking the scope for
+        each measurement.
+
+        Args:
+            channel: Channel number (1-4)
+            autoscale: Run autoscale before capturing
+            mode: Data mode ("NORMal" = screen, "RAW" = full memory)
+            points: Number of points to read (optional)
+            timeout_s: Maximum wait for the trigger
+
+        Returns:
+            Dict with the characterise_channel() keys plus vavg_v, points,
+            edge counts and sample_rate
+        """
+        self.write_setting(f":CHANnel{channel}:DISPlay", "ON")
+
+        if autoscale:
+            self.autoscale()
+
+        with self.batch():
+            self.write_setting(":TRIGger:MODE", "EDGE")
+            self.write_setting(":TRIGger:EDGe:SOURce", f"CHANnel{channel}")
+            self.write_setting(":TRIGger:SWEep", "NORMal")
+
+        capture = self.capture_channels([channel], mode, "BYTE", points, True, timeout_s)
+        if "error" in capture:
+            return capture
+
+        return {
+            "channel": channel,
+            "method": "host",
+            "sample_rate": capture["sample_rate"],
+            **characterise(capture["volts"][0], capture["xinc_s"])
+        }
+
     def _infer_waveform_shape(self, measurements: dict) -> str:
         """Infer waveform shape from duty cycle and edge times."""
         duty = measurements.get("duty_cycle_pos_pct")
@@ -8,20 +8,104 @@ Handles all RSA5065N-specific SCPI commands and quirks:
 - 50 ms pacing required between commands
 - :POW:ATT (not :INP:ATT), minimum 10 dB
 - FORM:DATA persists across *RST
+- REAL,32 traces honour :FORM:BORD (SWAPped = little-endian)
 """
 
 import logging
 import time
 from typing import List, Optional
 
+import numpy as np
+
 from .base import BaseInstrument
-from scpi_transport import SCPISocket
+from scpi_transport import SCPIError, SCPISocket
 
 logger = logging.getLogger(__name__)
 
 # Valid sweep point counts for RSA5065N
 VALID_POINTS = [201, 401, 601, 801, 1001, 1601, 2001, 3201, 4001, 8001]
 
+# Trace transfer formats: name -> commands selecting it
+TRACE_FORMATS = {
+    "REAL32": [":FORM:DATA REAL,32", ":FORM:BORD SWAP"],  # little-endian float32 block
+    "ASCII": [":FORM:DATA ASC"],                         # comma-separated text (fallback)
+}
+DEFAULT_TRACE_FORMAT = "REAL32"
+
+# REAL,32 sample dtype with :FORM:BORD SWAP
+TRACE_DTYPE = np.dtype("<f4")
+
+
+def frequency_axis(start_hz: float, stop_hz: float, points: int) -> np.ndarray:
+    """Frequency of each trace point in Hz (points evenly spaced, ends included)."""
+    return np.linspace(start_hz, stop_hz, points)
+
+
+def mask_limits(mask: Optional[List[List[float]]], freqs: np.ndarray) -> Optional[np.ndarray]:
+    """
+    Interpolate a limit mask onto a trace's frequency axis.
+
+    Args:
+        mask: Breakpoints [[freq_hz, limit_dbm], ...] joined by straight
+              lines; a step needs two points at the same frequency
+        freqs: Trace frequency axis
+
+    Returns:
+        float32 limit per trace point (NaN outside the mask's frequency
+        range, i.e. unchecked), or None for no mask
+    """
+    if not mask:
+        return None
+    points = np.asarray(mask, dtype=np.float64)
+    if points.ndim != 2 or points.shape[1] != 2:
+        raise ValueError("Mask must be a list of [freq_hz, limit_dbm] pairs")
+    points = points[np.argsort(points[:, 0], kind="stable")]
+    limits = np.interp(freqs, points[:, 0], points[:, 1], left=np.nan, right=np.nan)
+    return limits.astype(np.float32)
+
+
+def limit_violations(
+    trace: np.ndarray,
+    freqs: np.ndarray,
+    upper: Optional[np.ndarray] = None,
+    lower: Optional[np.ndarray] = None
+) -> List[dict]:
+    """
+    Find where a trace breaks its limit masks.
+
+    Each contiguous run of failing points is one violation, reported at
+    its worst point.
+
+    Returns:
+        List of dicts with kind ("upper"/"lower"), freq_hz, level_dbm,
+        limit_dbm, margin_db (how far past the limit), start_hz, stop_hz
+    """
+    events = []
+    for kind, limits in (("upper", upper), ("lower", lower)):
+        if limits is None:
+            continue
+        with np.errstate(invalid="ignore"):
+            excess = trace - limits if kind == "upper" else limits - trace
+        fail = excess > 0  # NaN limits compare False
+        if not fail.any():
+            continue
+        edges = np.diff(fail.astype(np.int8), prepend=0, append=0)
+        starts = np.flatnonzero(edges == 1)
+        stops = np.flatnonzero(edges == -1)
+        worst = np.maximum.reduceat(np.where(fail, excess, -np.inf), starts)
+        for start, stop, margin in zip(starts, stops, worst):
+            i = start + int(np.argmax(excess[start:stop]))
+            events.append({
+                "kind": kind,
+                "freq_hz": float(freqs[i]),
+                "level_dbm": float(trace[i]),
+                "limit_dbm": float(limits[i]),
+                "margin_db": float(margin),
+                "start_hz": float(freqs[start]),
+                "stop_hz": float(freqs[stop - 1])
+            })
+    return events
+
 
 class RSA5065N(BaseInstrument):
     """
@@ -31,6 +115,16 @@ class RSA5065N(BaseInstrument):
     Modes: SA (swept), RTSA (real-time)
     """
 
+    INVALIDATED_BY = {
+        **BaseInstrument.INVALIDATED_BY,
+        ":INST:SEL": ("",),  # Each mode has its own settings
+        ":FREQ:STAR": (":FREQ:CENT", ":FREQ:SPAN"),
+        ":FREQ:STOP": (":FREQ:CENT", ":FREQ:SPAN"),
+        ":FREQ:CENT": (":FREQ:STAR", ":FREQ:STOP"),
+        ":FREQ:SPAN": (":FREQ:STAR", ":FREQ:STOP"),
+        ":DISP:WIND:TRAC:Y:RLEV": (":POW:ATT",),  # Auto attenuation follows the reference level
+    }
+
     def get_type(self) -> str:
         return "rsa5065n"
 
@@ -38,8 +132,60 @@ class RSA5065N(BaseInstrument):
         """Switch to SA mode after reset (RST leaves in RTSA mode)."""
         self.write(":INST:SEL SA")
         time.sleep(1.5)  # Mode switch needs settling
-        self.write(":FORM:DATA ASC")  # Force ASCII format
-        time.sleep(self.PACING)
+        self.remember(":INST:SEL", "SA")
+        self.set_trace_format(DEFAULT_TRACE_FORMAT)  # FORM:DATA is not reset by *RST
+
+    def _ensure_sa_mode(self) -> bool:
+        """
+        Switch to swept SA mode unless the shadow state (or one query) says
+        the analyser is already there.
+
+        Returns:
+            True if the mode was switched
+        """
+        if self.read_setting(":INST:SEL").upper() == "SA":
+            return False
+        self.write(":INST:SEL SA")
+        time.sleep(1.5)  # Mode switch needs settling
+        self.remember(":INST:SEL", "SA")
+        return True
+
+    # ---- Trace Format ----
+
+    def set_trace_format(self, fmt: str = DEFAULT_TRACE_FORMAT) -> None:
+        """
+        Select how :TRAC:DATA? transfers traces.
+
+        Args:
+            fmt: "REAL32" (binary float32 block) or "ASCII" (text fallback)
+        """
+        fmt = fmt.upper()
+        if fmt not in TRACE_FORMATS:
+            raise ValueError(f"Trace format must be one of {list(TRACE_FORMATS)}, got {fmt}")
+        cache = self._sock.cache
+        outer = self._sock.batching
+        with self.batch():
+            for cmd in TRACE_FORMATS[fmt]:
+                self.write(cmd)
+        if outer is None:
+            cache["rsa5065n.trace_format"] = fmt
+        else:
+            # Only known once the enclosing batch has been sent
+            cache.pop("rsa5065n.trace_format", None)
+            outer.on_flush(lambda: cache.__setitem__("rsa5065n.trace_format", fmt))
+
+    def get_trace_format(self) -> str:
+        """Current trace format, read from the instrument once per connection."""
+        fmt = self._sock.cache.get("rsa5065n.trace_format")
+        if fmt is None:
+            fmt = "REAL32" if "REAL" in self.query(":FORM:DATA?").upper() else "ASCII"
+            self._sock.cache["rsa5065n.trace_format"] = fmt
+        return fmt
+
+    def _trace_axis(self) -> dict:
+        """Start/stop/points of the current sweep, from the shadow state."""
+        start, stop, points = self.read_settings([":FREQ:STAR", ":FREQ:STOP", ":SENS:SWE:POIN"])
+        return {"start_hz": float(start), "stop_hz": float(stop), "points": int(float(points))}
 
     def reset(self) -> dict:
         """Reset and initialize for swept SA mode."""
@@ -57,7 +203,8 @@ class RSA5065N(BaseInstrument):
         vbw_hz: float = 10e3,
         ref_level_dbm: float = -20.0,
         att_db: float = 0,
-        points: int = 1001
+        points: int = 1001,
+        trace_format: str = DEFAULT_TRACE_FORMAT
     ) -> dict:
         """
         Configure the RSA5065N for a swept spectrum measurement.
@@ -70,6 +217,7 @@ class RSA5065N(BaseInstrument):
             ref_level_dbm: Reference level in dBm
             att_db: Input attenuation in dB (10, 20, 30...). 0 = auto.
             points: Number of sweep points (will be rounded to valid value)
+            trace_format: "REAL32" (binary, default) or "ASCII"
 
         Returns:
             Dict with actual_points, actual_rbw_hz, actual_vbw_hz
@@ -79,46 +227,52 @@ class RSA5065N(BaseInstrument):
             start_hz / 1e6, stop_hz / 1e6, rbw_hz / 1e3, points
         )
 
-        # Ensure SA (swept) mode
-        self.write(":INST:SEL SA")
-        time.sleep(1.5)
-
-        # Force ASCII trace format (NOT reset by *RST)
-        self.write(":FORM:DATA ASC")
-        time.sleep(self.PACING)
-
-        # Frequency span - use :FREQ: not :SENS:FREQ:
-        self.write(f":FREQ:STAR {start_hz:.0f}")
-        time.sleep(self.PACING)
-        self.write(f":FREQ:STOP {stop_hz:.0f}")
-        time.sleep(self.PACING)
-
-        # Bandwidth
-        self.write(f":SENS:BAND:RES {rbw_hz:.0f}")
-        time.sleep(self.PACING)
-        self.write(f":SENS:BAND:VID {vbw_hz:.0f}")
-        time.sleep(self.PACING)
-
-        # Reference level
-        self.write(f":DISP:WIND:TRAC:Y:RLEV {ref_level_dbm:.1f}")
-        time.sleep(self.PACING)
-
-        # Attenuation: :POW:ATT not :INP:ATT, min 10 dB
-        if att_db > 0:
-            self.write(f":POW:ATT {int(att_db)}")
-        else:
-            self.write(":POW:ATT:AUTO ON")
-        time.sleep(self.PACING)
-
-        # Sweep points (instrument rounds to valid values)
-        self.write(f":SENS:SWE:POIN {points}")
-        time.sleep(self.PACING)
-        self.clear_errors()  # Absorb any rounding errors
-
-        # Read back actual values
-        actual_points = int(self.query(":SENS:SWE:POIN?"))
-        actual_rbw = float(self.query(":SENS:BAND:RES?"))
-        actual_vbw = float(self.query(":SENS:BAND:VID?"))
+        # Ensure SA (swept) mode; the switch and its settling are skipped when already there
+        switched = self._ensure_sa_mode()
+
+        # Only parameters that differ from the shadow state are sent
+        written = [switched]
+        with self.batch():
+            # Trace format is NOT reset by *RST; set it once per connection
+            if self._sock.cache.get("rsa5065n.trace_format") != trace_format.upper():
+                self.set_trace_format(trace_format)
+
+            # Frequency span - use :FREQ: not :SENS:FREQ:
+            written.append(self.write_setting(":FREQ:STAR", f"{start_hz:.0f}"))
+            written.append(self.write_setting(":FREQ:STOP", f"{stop_hz:.0f}"))
+
+            # Bandwidth
+            written.append(self.write_setting(":SENS:BAND:RES", f"{rbw_hz:.0f}"))
+            written.append(self.write_setting(":SENS:BAND:VID", f"{vbw_hz:.0f}"))
+
+            # Reference level
+            written.append(self.write_setting(":DISP:WIND:TRAC:Y:RLEV", f"{ref_level_dbm:.1f}"))
+
+            # Attenuation: :POW:ATT not :INP:ATT, min 10 dB
+            if att_db > 0:
+                if self.shadow.get(":POW:ATT:AUTO") != "OFF":
+                    self.forget(":POW:ATT")  # A manual value only holds with auto off
+                if self.write_setting(":POW:ATT", int(att_db)):
+                    self.remember(":POW:ATT:AUTO", "OFF")
+                    written.append(True)
+            elif self.write_setting(":POW:ATT:AUTO", "ON"):
+                self.forget(":POW:ATT")
+                self.remember(":POW:ATT:AUTO", "ON")
+                written.append(True)
+
+            # Sweep points (instrument rounds to valid values)
+            written.append(self.write_setting(":SENS:SWE:POIN", points))
+        if any(written):
+            self.clear_errors()  # Absorb any rounding errors
+
+        # Read back actual values (from the shadow state when nothing changed)
+        readback = self.read_settings([
+            ":SENS:SWE:POIN", ":SENS:BAND:RES", ":SENS:BAND:VID",
+            ":FREQ:STAR", ":FREQ:STOP"
+        ], fresh=any(written))
+        actual_points = int(float(readback[0]))
+        actual_rbw = float(readback[1])
+        actual_vbw = float(readback[2])
 
         if actual_points != points:
             logger.warning(
@@ -127,8 +281,8 @@ class RSA5065N(BaseInstrument):
             )
 
         # Verify frequency settings
-        actual_start = float(self.query(":FREQ:STAR?"))
-        actual_stop = float(self.query(":FREQ:STOP?"))
+        actual_start = float(readback[3])
+        actual_stop = float(readback[4])
 
         if abs(actual_start - start_hz) > 1e3 or abs(actual_stop - stop_hz) > 1e3:
             logger.warning(
@@ -159,44 +313,84 @@ class RSA5065N(BaseInstrument):
         logger.info("Sweep completed in %.3fs", elapsed)
         return {"elapsed_s": elapsed}
 
-    def get_trace(self, trace: int = 1) -> dict:
+    def trace_array(self, trace: int = 1) -> dict:
         """
-        Read trace data from instrument.
+        Read trace data as NumPy arrays.
+
+        REAL32 traces arrive as one binary block decoded with
+        numpy.frombuffer; ASCII traces are parsed as a fallback.
 
         Args:
             trace: Trace number (1, 2, or 3)
 
         Returns:
-            Dict with trace_dbm (list of floats) and points count
+            Dict with trace_dbm (float32 ndarray), freq_hz (float64
+            ndarray), points and format
         """
         cmd = f":TRAC:DATA? TRACE{trace}"
-        text = self.query(cmd)
-        values = [float(v) for v in text.split(",")]
+        fmt = self.get_trace_format()
+        if fmt == "REAL32":
+            values = np.frombuffer(self.query_block(cmd), dtype=TRACE_DTYPE)
+        else:
+            text = self.query(cmd)
+            values = np.array(text.split(","), dtype=np.float32)
+
+        axis = self._trace_axis()
+        if axis["points"] != values.size:
+            logger.warning("Trace has %d points, sweep configured for %d", values.size, axis["points"])
+        return {
+            "trace_dbm": values,
+            "freq_hz": frequency_axis(axis["start_hz"], axis["stop_hz"], values.size),
+            "points": values.size,
+            "format": fmt
+        }
+
+    def get_trace(self, trace: int = 1, with_freq: bool = False) -> dict:
+        """
+        Read trace data from instrument.
+
+        Args:
+            trace: Trace number (1, 2, or 3)
+            with_freq: Include the frequency of each point
+
+        Returns:
+            Dict with trace_dbm (list of floats), points count, start/stop
+            frequency and optional freq_hz list
+        """
+        data = self.trace_array(trace)
+        values, freqs = data["trace_dbm"], data["freq_hz"]
 
         logger.info(
             "Trace %d: %d points, min=%.1f dBm, max=%.1f dBm",
-            trace, len(values), min(values), max(values)
+            trace, values.size, values.min(), values.max()
         )
 
-        return {
-            "trace_dbm": values,
-            "points": len(values),
-            "min_dbm": min(values),
-            "max_dbm": max(values)
+        result = {
+            "trace_dbm": values.tolist(),
+            "points": values.size,
+            "min_dbm": float(values.min()),
+            "max_dbm": float(values.max()),
+            "start_hz": float(freqs[0]),
+            "stop_hz": float(freqs[-1]),
+            "format": data["format"]
         }
+        if with_freq:
+            result["freq_hz"] = freqs.tolist()
+        return result
 
-    def sweep(self, trace: int = 1) -> dict:
+    def sweep(self, trace: int = 1, with_freq: bool = False) -> dict:
         """
         Execute single sweep and return trace data.
 
         Args:
             trace: Trace number to read (1-3)
+            with_freq: Include the frequency of each point
 
         Returns:
             Dict with trace_dbm, points, elapsed_s
         """
         sweep_result = self.single_sweep()
-        trace_result = self.get_trace(trace)
+        trace_result = self.get_trace(trace, with_freq)
         return {
             **trace_result,
             "elapsed_s": sweep_result["elapsed_s"]
@@ -208,10 +402,16 @@ class RSA5065N(BaseInstrument):
         start_hz: float,
         stop_hz: float,
         rbw_hz: float = 10e3,
-        points: int = 1001
+        points: int = 1001,
+        filename: Optional[str] = None
     ) -> dict:
         """
-        Capture N consecutive sweeps.
+        Capture N consecutive sweeps into one preallocated array.
+
+        Sweeps land in an (n, points) float32 array, or in a
+        memory-mapped .npy file when filename is given; REAL32 traces
+        are received straight into their row. Max-hold, min-hold and
+        average traces are updated as each sweep arrives.
 
         Args:
             n: Number of sweeps to capture
@@ -219,32 +419,117 @@ class RSA5065N(BaseInstrument):
             stop_hz: Stop frequency in Hz
             rbw_hz: Resolution bandwidth in Hz
             points: Sweep points
+            filename: Write sweeps to this .npy file (optional)
 
         Returns:
-            Dict with sweeps list and actual_points
+            Dict with traces (ndarray or memmap), timestamps, freq_hz,
+            max_hold_dbm, min_hold_dbm, average_dbm, peak, elapsed_s and
+            sweeps_per_s
         """
+        if n < 1:
+            return {"error": "n must be at least 1"}
+
         config = self.configure_sweep(
             start_hz=start_hz,
             stop_hz=stop_hz,
             rbw_hz=rbw_hz,
             points=points
         )
+        width = config["actual_points"]
 
-        sweeps = []
+        if filename is not None:
+            traces = np.lib.format.open_memmap(filename, mode="w+", dtype=TRACE_DTYPE, shape=(n, width))
+        else:
+            traces = np.empty((n, width), dtype=TRACE_DTYPE)
+        timestamps = np.empty(n, dtype=np.float64)
+        max_hold = np.full(width, -np.inf, dtype=np.float32)
+        min_hold = np.full(width, np.inf, dtype=np.float32)
+        total = np.zeros(width, dtype=np.float64)
+
+        cmd = ":TRAC:DATA? TRACE1"
+        binary = self.get_trace_format() == "REAL32"
+        t0 = time.time()
         for i in range(n):
-            logger.info("Capturing sweep %d/%d", i + 1, n)
-            ts = time.time()
+            logger.debug("Capturing sweep %d/%d", i + 1, n)
+            timestamps[i] = time.time()
             self.single_sweep()
-            trace = self.get_trace(1)
-            sweeps.append({
-                "timestamp": ts,
-                "trace_dbm": trace["trace_dbm"]
-            })
+            row = traces[i]
+            if binary:
+                count = self.query_block_into(cmd, row) // TRACE_DTYPE.itemsize
+                if count != width:
+                    raise SCPIError(f"Sweep {i} returned {count} points, expected {width}")
+            else:
+                row[:] = self.trace_array(1)["trace_dbm"]
+            np.maximum(max_hold, row, out=max_hold)
+            np.minimum(min_hold, row, out=min_hold)
+            total += row
+        elapsed = time.time() - t0
+
+        if isinstance(traces, np.memmap):
+            traces.flush()
 
+        freqs = frequency_axis(config["start_hz"], config["stop_hz"], width)
+        average = (total / n).astype(np.float32)
+        peak = int(np.argmax(max_hold))
+        logger.info("Burst of %d sweeps in %.2fs (%.1f sweeps/s)", n, elapsed, n / elapsed if elapsed > 0 else 0)
         return {
-            "sweeps": sweeps,
-            "actual_points": config["actual_points"],
-            "count": n
+            "count": n,
+            "actual_points": width,
+            "start_hz": config["start_hz"],
+            "stop_hz": config["stop_hz"],
+            "filename": filename,
+            "traces": traces,
+            "timestamps": timestamps,
+            "freq_hz": freqs,
+            "max_hold_dbm": max_hold,
+            "min_hold_dbm": min_hold,
+            "average_dbm": average,
+            "peak": {
+                "freq_hz": float(freqs[peak]),
+                "dbm": float(max_hold[peak]),
+                "sweep": int(np.argmax(traces[:, peak]))
+            },
+            "elapsed_s": elapsed,
+            "sweeps_per_s": n / elapsed if elapsed > 0 else None
+        }
+
+    def monitor_sweep(
+        self,
+        upper_mask: Optional[List[List[float]]] = None,
+        lower_mask: Optional[List[List[float]]] = None
+    ) -> tuple:
+        """
+        Capture one sweep for a monitor AcquisitionStream.
+
+        Runs a single sweep, reads trace 1 and checks it against the
+        limit masks. Mask limits are interpolated onto the trace axis
+        once per sweep configuration and cached on the connection.
+
+        Args:
+            upper_mask: [[freq_hz, limit_dbm], ...] the trace must stay below
+            lower_mask: [[freq_hz, limit_dbm], ...] the trace must stay above
+
+        Returns:
+            (trace_dbm, info) with info holding bytes transferred, the
+            frequency range and any limit violation events
+        """
+        self.single_sweep()
+        data = self.trace_array(1)
+        trace, freqs = data["trace_dbm"], data["freq_hz"]
+
+        key = (float(freqs[0]), float(freqs[-1]), freqs.size, repr(upper_mask), repr(lower_mask))
+        cached = self._sock.cache.get("rsa5065n.masks")
+        if cached is None or cached[0] != key:
+            cached = (key, mask_limits(upper_mask, freqs), mask_limits(lower_mask, freqs))
+            self._sock.cache["rsa5065n.masks"] = cached
+        _, upper, lower = cached
+
+        return trace, {
+            "bytes": trace.nbytes,
+            "start_hz": float(freqs[0]),
+            "stop_hz": float(freqs[-1]),
+            "points": trace.size,
+            "events": limit_violations(trace, freqs, upper, lower)
         }
 
     def screenshot(self, filename: str, fmt: str = "BMP") -> dict:
@@ -254,45 +539,61 @@ class RSA5065N(BaseInstrument):
         RSA5065N uses :PRIV:SNAP? BMP as primary command.
         """
         try:
-            data = self.query_block(f":PRIV:SNAP? {fmt}")
+            with open(filename, "wb") as f:
+                size = self.query_block_stream(f":PRIV:SNAP? {fmt}", f)
         except Exception:
             logger.info("PRIV:SNAP failed, trying DISP:DATA")
             try:
-                data = self.query_block(":DISP:DATA?")
+                with open(filename, "wb") as f:
+                    size = self.query_block_stream(":DISP:DATA?", f)
             except Exception as e:
                 return {"error": f"Screenshot failed: {e}"}
 
-        with open(filename, "wb") as f:
-            f.write(data)
-
-        logger.info("Screenshot saved: %s (%d bytes)", filename, len(data))
+        logger.info("Screenshot saved: %s (%d bytes)", filename, size)
         return {
             "filename": filename,
-            "size_bytes": len(data),
+            "size_bytes": size,
             "format": fmt
         }
 
     # ---- Query methods ----
 
-    def get_frequency_range(self) -> dict:
-        """Get current frequency range."""
+    def get_frequency_range(self, fresh: bool = False) -> dict:
+        """
+        Get current frequency range.
+
+        Args:
+            fresh: Query the analyser instead of using the shadow state
+        """
+        start, stop, center, span = self.read_settings([
+            ":FREQ:STAR", ":FREQ:STOP", ":FREQ:CENT", ":FREQ:SPAN"
+        ], fresh=fresh)
         return {
-            "start_hz": float(self.query(":FREQ:STAR?")),
-            "stop_hz": float(self.query(":FREQ:STOP?")),
-            "center_hz": float(self.query(":FREQ:CENT?")),
-            "span_hz": float(self.query(":FREQ:SPAN?"))
+            "start_hz": float(start),
+            "stop_hz": float(stop),
+            "center_hz": float(center),
+            "span_hz": float(span)
         }
 
-    def get_sweep_config(self) -> dict:
-        """Get current sweep configuration."""
+    def get_sweep_config(self, fresh: bool = False) -> dict:
+        """
+        Get current sweep configuration.
+
+        Args:
+            fresh: Query the analyser instead of using the shadow state
+        """
+        points, rbw, vbw, ref_level, att = self.read_settings([
+            ":SENS:SWE:POIN", ":SENS:BAND:RES", ":SENS:BAND:VID",
+            ":DISP:WIND:TRAC:Y:RLEV", ":POW:ATT"
+        ], fresh=fresh)
         return {
-            "points": int(self.query(":SENS:SWE:POIN?")),
-            "rbw_hz": float(self.query(":SENS:BAND:RES?")),
-            "vbw_hz": float(self.query(":SENS:BAND:VID?")),
-            "ref_level_dbm": float(self.query(":DISP:WIND:TRAC:Y:RLEV?")),
-            "attenuation_db": float(self.query(":POW:ATT?"))
+            "points": int(float(points)),
+            "rbw_hz": float(rbw),
+            "vbw_hz": float(vbw),
+            "ref_level_dbm": float(ref_level),
+            "attenuation_db": float(att)
         }
 
-    def get_mode(self) -> str:
+    def get_mode(self, fresh: bool = False) -> str:
         """Get current instrument mode (SA or RTSA)."""
-        return self.query(":INST:SEL?").strip()
+        return self.read_setting(":INST:SEL", fresh)
@@ -0,0 +1,522 @@
+#!/usr/bin/env python3
+"""
+AsyncSCPISocket - asyncio-native raw TCP SCPI transport.
+
+Same wire behaviour as SCPISocket on asyncio streams, so one event loop
+can drive every bench instrument concurrently without a thread per call.
+Only the I/O lives here: pacing (PacingPolicy), reply completion
+(ReplyReader), query framing and learning (ResponseFramer), block headers
+and batch planning (SCPIBatch) are the helpers SCPISocket itself uses.
+
+Usage:
+    from scpi_async import AsyncSCPISocket
+
+    async with AsyncSCPISocket("10.0.1.106") as inst:
+        idn = await inst.query("*IDN?")
+        async with inst.batch():
+            await inst.write(":CHANnel1:SCALe 0.5")
+            await inst.write(":CHANnel1:OFFSet 0")
+        vpp, freq = await inst.query_many([":MEASure:VPP?", ":MEASure:FREQuency?"])
+
+    # Several instruments at once
+    socks = await open_async_sockets(INSTRUMENTS)
+    results = await asyncio.gather(socks["dp932a-1"].query(":MEAS:VOLT? CH1"),
+                                   socks["dmm6500"].query(":READ?"))
+"""
+
+import asyncio
+import socket
+import time
+import logging
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, AsyncIterator, Callable, Dict, List, Optional
+
+from scpi_transport import (
+    DEFAULT_PORT, DEFAULT_TIMEOUT, PACING_DELAY, RECV_CHUNK,
+    KEEPALIVE_IDLE, KEEPALIVE_INTERVAL, KEEPALIVE_COUNT,
+    PACING_GAP, PACING_MODES, PacingPolicy, READ_TERMINATED,
+    ReplyReader, ReplyShape, ResponseFramer, SCPIBatch, SCPIError, SCPIConnectionError,
+    SCPITimeoutError, block_header_digits, block_length, _SENTINEL_SHAPE, _opc_done,
+)
+
+if TYPE_CHECKING:
+    from connection_pool import InstrumentConfig
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncSCPIBatch(SCPIBatch):
+    """SCPIBatch whose flush() is a coroutine. Created by AsyncSCPISocket.batch()."""
+
+    async def flush(self) -> List[str]:
+        """Send all queued commands and collect query responses."""
+        sock = self._sock
+        for message, n_queries, key, sentinel, sync in self._plan():
+            await sock._paced_send(message)
+            logger.debug("BATCH: %s", message)
+            if sentinel:
+                self.results.extend(
+                    (await sock._read_responses(n_queries + 1, key, _SENTINEL_SHAPE))[:-1])
+            elif n_queries:
+                self.results.extend(await sock._read_responses(n_queries, key))
+            elif sync:
+                await sock._recv_until(complete=_opc_done)
+        return self._sent()
+
+
+class AsyncSCPISocket:
+    """
+    asyncio stream SCPI transport for Rigol and Keithley instruments.
+
+    Mirrors SCPISocket with every I/O method a coroutine. Each
+    command/response exchange holds a per-socket asyncio.Lock, so
+    coroutines sharing one instrument never interleave replies.
+    """
+
+    def __init__(self, ip: str, port: int = DEFAULT_PORT,
+                 timeout: float = DEFAULT_TIMEOUT,
+                 pacing: float = PACING_DELAY,
+                 policy: Optional[PacingPolicy] = None,
+                 framer: Optional[ResponseFramer] = None):
+        if policy is None:
+            policy = PacingPolicy(PACING_GAP, pacing)
+        if policy.mode not in PACING_MODES:
+            raise ValueError(f"Unknown pacing mode: {policy.mode}")
+        self.ip = ip
+        self.port = port
+        self.timeout = timeout
+        self.policy = policy
+        self.framer = framer or ResponseFramer()
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._idn: Optional[str] = None
+        self._last_send = 0.0
+        self._batch: Optional[AsyncSCPIBatch] = None
+        self._lock = asyncio.Lock()
+        self._read_end = READ_TERMINATED
+
+    @property
+    def pacing(self) -> float:
+        """Minimum inter-command gap in seconds."""
+        return self.policy.min_gap
+
+    # ---- Connection management ----
+
+    async def connect(self) -> str:
+        """Open TCP connection and query *IDN?. Return identity string."""
+        if self._writer is not None:
+            await self.close()
+
+        try:
+            self._reader, self._writer = await asyncio.wait_for(
+                asyncio.open_connection(self.ip, self.port), self.timeout)
+        except asyncio.TimeoutError:
+            raise SCPIConnectionError(
+                f"Connection timed out ({self.timeout}s) to {self.ip}:{self.port}")
+        except ConnectionRefusedError:
+            raise SCPIConnectionError(
+                f"Connection refused by {self.ip}:{self.port}")
+        except OSError as e:
+            raise SCPIConnectionError(
+                f"Network error connecting to {self.ip}:{self.port}: {e}")
+
+        sock = self._writer.get_extra_info("socket")
+        if sock is not None:
+            # Enable TCP keepalive to detect dead peers quickly
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, KEEPALIVE_IDLE)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, KEEPALIVE_INTERVAL)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT, KEEPALIVE_COUNT)
+
+        self._idn = await self.query("*IDN?")
+        logger.info("Connected to: %s", self._idn)
+        return self._idn
+
+    async def close(self) -> None:
+        """Close the connection cleanly."""
+        if self._writer is not None:
+            writer = self._writer
+            self._drop()
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except OSError:
+                pass
+            logger.info("Connection closed")
+
+    def _drop(self) -> None:
+        """Forget the streams so the next use reconnects."""
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = None
+        self._writer = None
+        self._idn = None
+
+    @property
+    def connected(self) -> bool:
+        return self._writer is not None
+
+    @property
+    def identity(self) -> Optional[str]:
+        return self._idn
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+        return False
+
+    # ---- Low-level transport ----
+
+    async def _paced_send(self, cmd: str) -> None:
+        """Send one command line, applying the pacing policy."""
+        wait = self.policy.delay_before_send(self._last_send, time.monotonic())
+        if wait > 0:
+            await asyncio.sleep(wait)
+        await self._send((cmd + "\n").encode())
+        self._last_send = time.monotonic()
+        after = self.policy.delay_after_send()
+        if after:
+            await asyncio.sleep(after)
+
+    async def _send(self, data: bytes) -> None:
+        """Send raw bytes."""
+        if self._writer is None:
+            raise SCPIConnectionError("Not connected")
+        try:
+            self._writer.write(data)
+            await self._writer.drain()
+        except (BrokenPipeError, ConnectionResetError, OSError) as e:
+            self._drop()
+            raise SCPIConnectionError(f"Send failed: {e}")
+
+    async def _recv_until(self, terminator: bytes = b"\n",
+                          max_bytes: int = 65536,
+                          complete: Optional[Callable[[bytes], bool]] = None) -> bytes:
+        """
+        Read until terminator, complete(buf) or quiet timeout.
+
+        Same two-phase timeout as SCPISocket._recv_until, decided by the
+        same ReplyReader.
+        """
+        if self._reader is None:
+            raise SCPIConnectionError("Not connected")
+
+        reader = ReplyReader(terminator, max_bytes, complete)
+        while True:
+            try:
+                chunk = await asyncio.wait_for(
+                    self._reader.read(RECV_CHUNK), reader.timeout(self.timeout))
+            except asyncio.TimeoutError:
+                if reader.quiet():
+                    break
+                self._drop()
+                raise SCPITimeoutError(
+                    f"Read timed out after {self.timeout}s (no data received)")
+            except OSError as e:
+                self._drop()
+                raise SCPIConnectionError(f"Receive failed: {e}")
+            if not chunk:
+                if reader.closed():
+                    break
+                self._drop()
+                raise SCPIConnectionError("Connection closed by instrument")
+            if reader.feed(chunk):
+                break
+
+        self._read_end = reader.end
+        self.framer.record(reader.end)
+        return bytes(reader.buf)
+
+    async def _read_responses(self, n: int, key: Optional[str] = None,
+                              shape: Optional[ReplyShape] = None) -> List[str]:
+        """Read n ';'-separated responses to a compound query."""
+        complete = shape.complete if shape is not None else None
+        responses: List[str] = []
+        while len(responses) < n:
+            raw = await self._recv_until(complete=complete)
+            self.framer.add_responses(responses, raw, self._read_end, key)
+        if len(responses) != n:
+            raise SCPIError(
+                f"Expected {n} responses to compound query, got {len(responses)}")
+        return responses
+
+    async def _recv_exact(self, n: int, what: str = "read") -> bytes:
+        """Read exactly n bytes."""
+        if self._reader is None:
+            raise SCPIConnectionError("Not connected")
+        try:
+            return await asyncio.wait_for(self._reader.readexactly(n), self.timeout)
+        except asyncio.TimeoutError:
+            self._drop()
+            raise SCPITimeoutError(f"Timeout during {what} ({n} bytes)")
+        except asyncio.IncompleteReadError as e:
+            self._drop()
+            raise SCPIConnectionError(
+                f"Connection closed during {what} ({len(e.partial)}/{n} bytes)")
+
+    async def _read_block_header(self, length: Optional[int] = None) -> int:
+        """
+        Read an IEEE 488.2 block header. Return payload length.
+
+        An indefinite-length (#0) header needs the expected length.
+        """
+        d = block_header_digits(await self._recv_exact(2, "block header"))
+        count = await self._recv_exact(d, "block header") if d else b""
+        payload_len = block_length(count, length)
+        logger.debug("Block data: %d bytes expected", payload_len)
+        return payload_len
+
+    async def _consume_block_terminator(self) -> None:
+        """Consume trailing newline after block data, if present."""
+        try:
+            await asyncio.wait_for(self._reader.read(1), 0.2)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _stream_block(self, emit: Callable[[bytes], None],
+                            progress: Optional[Callable[[int, int], None]] = None,
+                            chunk_size: int = RECV_CHUNK,
+                            length: Optional[int] = None) -> int:
+        """Read a block and pass its payload to emit() chunk by chunk."""
+        total = await self._read_block_header(length)
+        received = 0
+        while received < total:
+            chunk = await self._recv_exact(min(total - received, chunk_size), "block read")
+            emit(chunk)
+            received += len(chunk)
+            if progress is not None:
+                progress(received, total)
+        await self._consume_block_terminator()
+        return total
+
+    # ---- SCPI commands ----
+
+    async def write(self, cmd: str) -> None:
+        """
+        Send a SCPI command (no response expected). Applies pacing policy.
+
+        Inside batch() the command is queued instead of sent.
+        """
+        if self._batch is not None:
+            self._batch.write(cmd)
+            return
+        message, wait = self.policy.frame_write(cmd)
+        async with self._lock:
+            await self._paced_send(message)
+            if wait:
+                await self._recv_until(complete=_opc_done)
+        logger.debug("WRITE: %s", cmd)
+
+    async def query(self, cmd: str) -> str:
+        """Send a SCPI query and return the text response (stripped)."""
+        self._check_not_batching(cmd)
+        async with self._lock:
+            message, complete, sentinel = self.framer.frame_query(cmd)
+            await self._paced_send(message)
+            raw = await self._recv_until(complete=complete)
+            response, opc_pending = self.framer.finish_query(cmd, raw, self._read_end, sentinel)
+            if opc_pending:
+                await self._recv_until(complete=_opc_done)  # Sentinel answered as a separate line
+        logger.debug("QUERY: %s -> %s", cmd, response[:80] if len(response) > 80 else response)
+        return response
+
+    async def query_many(self, cmds: List[str]) -> List[str]:
+        """Send several queries in one compound message and return the responses."""
+        if not cmds:
+            return []
+        self._check_not_batching(cmds[0])
+        batch = AsyncSCPIBatch(self)
+        for cmd in cmds:
+            batch.query(cmd)
+        async with self._lock:
+            responses = await batch.flush()
+        logger.debug("QUERY_MANY: %d queries", len(cmds))
+        return responses
+
+    async def query_block(self, cmd: str) -> bytearray:
+        """Send a SCPI query and return IEEE 488.2 block data (binary)."""
+        self._check_not_batching(cmd)
+        data = bytearray()
+        async with self._lock:
+            await self._paced_send(cmd)
+            await self._stream_block(data.extend)
+        logger.debug("BLOCK: %s -> %d bytes", cmd, len(data))
+        return data
+
+    async def query_block_into(self, cmd: str, buf) -> int:
+        """
+        Send a SCPI query and read its block payload into buf.
+
+        Returns the payload length. If the payload does not fit, it is
+        drained and SCPIError is raised.
+        """
+        self._check_not_batching(cmd)
+        view = memoryview(buf).cast("B")
+        offset = 0
+
+        def emit(chunk: bytes) -> None:
+            nonlocal offset
+            end = offset + len(chunk)
+            if end <= len(view):
+                view[offset:end] = chunk
+            offset = end
+
+        async with self._lock:
+            await self._paced_send(cmd)
+            n = await self._stream_block(emit)
+        if n > len(view):
+            raise SCPIError(
+                f"Block payload ({n} bytes) exceeds buffer ({len(view)} bytes)")
+        logger.debug("BLOCK: %s -> %d bytes (into buffer)", cmd, n)
+        return n
+
+    async def query_block_stream(self, cmd: str, sink,
+                                 progress: Optional[Callable[[int, int], None]] = None,
+                                 chunk_size: int = RECV_CHUNK) -> int:
+        """
+        Send a SCPI query and stream its block payload to a sink.
+
+        See SCPISocket.query_block_stream(). Returns payload length.
+        """
+        if hasattr(sink, "write"):
+            emit = sink.write
+        elif hasattr(sink, "update"):
+            emit = sink.update
+        elif callable(sink):
+            emit = sink
+        else:
+            raise TypeError("sink must have write() or update(), or be callable")
+
+        self._check_not_batching(cmd)
+        async with self._lock:
+            await self._paced_send(cmd)
+            total = await self._stream_block(emit, progress, chunk_size)
+        logger.debug("BLOCK STREAM: %s -> %d bytes", cmd, total)
+        return total
+
+    def _check_not_batching(self, cmd: str) -> None:
+        if self._batch is not None:
+            raise SCPIError(
+                f"Cannot query '{cmd}' inside batch(); use batch.query() instead")
+
+    @asynccontextmanager
+    async def batch(self) -> AsyncIterator[AsyncSCPIBatch]:
+        """
+        Coalesce commands into one compound program message.
+
+        See SCPISocket.batch(). The queued message is sent when the
+        async with block exits. Only queue writes inside the block:
+        awaiting other I/O there would let concurrent coroutines on the
+        same socket see the open batch.
+        """
+        if self._batch is not None:
+            yield self._batch
+            return
+        batch = AsyncSCPIBatch(self)
+        self._batch = batch
+        try:
+            yield batch
+        except BaseException:
+            self._batch = None
+            batch.abort()
+            raise
+        self._batch = None
+        try:
+            async with self._lock:
+                await batch.flush()
+        except BaseException:
+            batch.abort()
+            raise
+
+    @property
+    def batching(self) -> Optional[AsyncSCPIBatch]:
+        """The batch currently open on this socket, if any."""
+        return self._batch
+
+    async def query_opc(self) -> bool:
+        """Wait for *OPC? to return '1'."""
+        resp = await self.query("*OPC?")
+        return resp.strip() == "1"
+
+    # ---- Convenience methods ----
+
+    async def reset(self) -> None:
+        """Send *RST, wait for OPC, drain error queue."""
+        await self.write("*RST")
+        await asyncio.sleep(1.0)  # RST needs settling time
+        await self.query_opc()
+        n = await self.clear_errors()
+        if n > 0:
+            logger.info("Drained %d post-reset errors", n)
+
+    async def check_error(self) -> tuple:
+        """Query :SYST:ERR? and return (code, message)."""
+        resp = await self.query(":SYST:ERR?")
+        parts = resp.split(",", 1)
+        code = int(parts[0])
+        msg = parts[1].strip().strip('"') if len(parts) > 1 else ""
+        return (code, msg)
+
+    async def clear_errors(self) -> int:
+        """Drain error queue until empty. Return number of errors drained."""
+        count = 0
+        while True:
+            code, msg = await self.check_error()
+            if code == 0:
+                break
+            logger.warning("Error %d: %s", code, msg)
+            count += 1
+            if count > 50:
+                logger.error("Error queue stuck after 50 reads")
+                break
+        return count
+
+    async def screenshot(self, filename: str, fmt: str = "PNG") -> int:
+        """Capture instrument display and save to file. Return bytes written."""
+        commands = [
+            f":DISPlay:DATA? ON,OFF,{fmt}",  # MSO8204 style
+            f":PRIV:SNAP? {fmt}",             # RSA5065N style
+            ":DISPlay:DATA?",                 # Generic fallback
+        ]
+
+        for cmd in commands:
+            try:
+                with open(filename, "wb") as f:
+                    size = await self.query_block_stream(cmd, f)
+                logger.info("Screenshot saved: %s (%d bytes)", filename, size)
+                return size
+            except SCPIError:
+                logger.debug("Screenshot command failed: %s", cmd)
+                continue
+
+        raise SCPIError("All screenshot commands failed")
+
+
+async def open_async_sockets(configs: Dict[str, "InstrumentConfig"]) -> Dict[str, AsyncSCPISocket]:
+    """
+    Connect to several instruments concurrently.
+
+    Args:
+        configs: Dict mapping instrument names to InstrumentConfig
+
+    Returns:
+        Dict mapping names to connected AsyncSCPISocket instances.
+        Instruments that fail to connect are logged and omitted.
+    """
+    names = list(configs)
+    socks = [
+        AsyncSCPISocket(c.ip, c.port, c.timeout, policy=c.pacing_policy())
+        for c in configs.values()
+    ]
+    results = await asyncio.gather(*(s.connect() for s in socks), return_exceptions=True)
+
+    connected = {}
+    for name, sock, result in zip(names, socks, results):
+        if isinstance(result, BaseException):
+            logger.error("Failed to connect to %s: %s", name, result)
+        else:
+            connected[name] = sock
+    return connected
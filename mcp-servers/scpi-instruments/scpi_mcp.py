@@ -16,10 +16,16 @@ Protocol: Streamable HTTP for MCP communication (/mcp endpoint)
 
 import os
 import sys
+import time
 import base64
+import hashlib
 import logging
-from typing import Optional, List
+import functools
+import threading
+from contextlib import ExitStack
+from typing import Dict, Optional, List
 
+import numpy as np
 from fastmcp import FastMCP
 
 # Add parent directory to path for imports
@@ -28,6 +34,9 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from scpi_transport import SCPISocket, SCPIError, SCPIConnectionError
 from connection_pool import ConnectionPool, InstrumentConfig, get_pool, init_pool
 from instruments import RSA5065N, MSO8204, DMM6500, DMM6500_TSP, DL3021A, DG2052, DP932A
+from instruments.rsa5065n import mask_limits
+from waveform_analysis import characterise
+from acquisition_stream import AcquisitionStream
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, stream=sys.stderr)
@@ -92,11 +101,48 @@ INSTRUMENTS = {
 # Initialize pool on import
 init_pool(INSTRUMENTS)
 
+# Background acquisition streams by instrument name
+_streams: Dict[str, AcquisitionStream] = {}
+
+# Instrument locks held by the tool call running on this thread
+_call = threading.local()
+
+
+def instrument_tool():
+    """
+    Register a function as an MCP tool whose instrument access is exclusive.
+
+    Every instrument the tool reaches through get_socket(), get_instrument()
+    or get_dmm_tsp() stays locked (pool.instrument_lock) until the call
+    returns, so its commands never interleave with a stream or monitor
+    worker, run_parallel() or another call on the same instrument.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def locked(*args, **kwargs):
+            with ExitStack() as stack:
+                _call.locks = stack
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    _call.locks = None
+        return mcp.tool()(locked)
+    return decorator
+
+
+def get_socket(name: str) -> SCPISocket:
+    """Get an instrument's socket, locked for the rest of the tool call."""
+    pool = get_pool()
+    locks = getattr(_call, "locks", None)
+    if locks is not None:
+        locks.enter_context(pool.instrument_lock(name))
+    return pool.get_socket(name)
+
 
 def get_instrument(name: str):
     """Get instrument driver instance."""
     pool = get_pool()
-    sock = pool.get_socket(name)
+    sock = get_socket(name)
 
     # Get config to determine type
     config = pool._resolve_instrument(name)
@@ -125,7 +171,7 @@ def get_dmm_tsp() -> DMM6500_TSP:
     TSP commands will fail - switch mode from front panel.
     """
     pool = get_pool()
-    sock = pool.get_socket("dmm6500")
+    sock = get_socket("dmm6500")
 
     # Detect mode if not already done
     mode = pool.get_detected_mode("dmm6500")
@@ -141,7 +187,7 @@ def get_dmm_tsp() -> DMM6500_TSP:
 # Connection Management Tools (3)
 # ==============================================================================
 
-@mcp.tool()
+@instrument_tool()
 def scpi_connect(instrument: str, port: int = 5555) -> dict:
     """
     Connect to an instrument by name or IP.
@@ -159,10 +205,11 @@ def scpi_connect(instrument: str, port: int = 5555) -> dict:
     if instrument not in INSTRUMENTS and "." in instrument:
         pool.register_instrument(instrument, instrument, port, "generic")
 
-    return pool.connect(instrument)
+    # An explicit connect always probes, even if the circuit breaker is open
+    return pool.connect(instrument, force=True)
 
 
-@mcp.tool()
+@instrument_tool()
 def scpi_disconnect(instrument: str) -> dict:
     """
     Disconnect from an instrument.
@@ -176,22 +223,23 @@ def scpi_disconnect(instrument: str) -> dict:
     return get_pool().disconnect(instrument)
 
 
-@mcp.tool()
+@instrument_tool()
 def scpi_status() -> dict:
     """
     List connected instruments and their status.
 
     Returns:
-        Dict with list of instruments and their connection status
+        Dict with list of instruments and their connection status, and
+        warm-up progress (state, ready, failed) when SCPI_WARMUP=1
     """
     return get_pool().status()
 
 
 # ==============================================================================
-# Raw SCPI Access Tools (3)
+# Raw SCPI Access Tools (6)
 # ==============================================================================
 
-@mcp.tool()
+@instrument_tool()
 def scpi_write(instrument: str, command: str) -> dict:
     """
     Send a SCPI command (no response expected).
@@ -204,14 +252,15 @@ def scpi_write(instrument: str, command: str) -> dict:
         Dict with ok status
     """
     try:
-        sock = get_pool().get_socket(instrument)
+        sock = get_socket(instrument)
+        sock.cache.clear()  # a raw write may change anything drivers have cached
         sock.write(command)
         return {"ok": True, "command": command}
     except SCPIError as e:
         return {"ok": False, "error": str(e), "command": command}
 
 
-@mcp.tool()
+@instrument_tool()
 def scpi_query(instrument: str, command: str) -> dict:
     """
     Send a SCPI query and return the text response.
@@ -224,14 +273,14 @@ def scpi_query(instrument: str, command: str) -> dict:
         Dict with response text
     """
     try:
-        sock = get_pool().get_socket(instrument)
+        sock = get_socket(instrument)
         response = sock.query(command)
         return {"response": response, "command": command}
     except SCPIError as e:
         return {"error": str(e), "command": command}
 
 
-@mcp.tool()
+@instrument_tool()
 def scpi_query_block(instrument: str, command: str) -> dict:
     """
     Send a SCPI query and return binary block data (base64 encoded).
@@ -244,7 +293,7 @@ def scpi_query_block(instrument: str, command: str) -> dict:
         Dict with base64-encoded data and size
     """
     try:
-        sock = get_pool().get_socket(instrument)
+        sock = get_socket(instrument)
         data = sock.query_block(command)
         return {
             "data_b64": base64.b64encode(data).decode("ascii"),
@@ -255,14 +304,119 @@ def scpi_query_block(instrument: str, command: str) -> dict:
         return {"error": str(e), "command": command}
 
 
+@instrument_tool()
+def scpi_query_parallel(queries: dict) -> dict:
+    """
+    Send SCPI queries to several instruments at once.
+
+    Each instrument is queried on its own thread, so the call takes as
+    long as the slowest instrument rather than the sum of all of them.
+
+    Args:
+        queries: Dict mapping instrument name or IP to a SCPI query
+                 (e.g. {"dmm6500": ":READ?", "mso8204": ":MEASure:VPP?"})
+
+    Returns:
+        Dict with per-instrument response or error and elapsed_s, plus
+        total elapsed_s
+    """
+    t0 = time.time()
+    results = get_pool().run_parallel({
+        instrument: (lambda sock, cmd=command: sock.query(cmd))
+        for instrument, command in queries.items()
+    })
+    return {
+        "results": {
+            name: {
+                "command": queries[name],
+                **({"response": r["result"]} if r["ok"] else {"error": r["error"]}),
+                "elapsed_s": r["elapsed_s"]
+            }
+            for name, r in results.items()
+        },
+        "elapsed_s": time.time() - t0
+    }
+
+
+@instrument_tool()
+def scpi_query_block_file(instrument: str, command: str, filename: str) -> dict:
+    """
+    Send a SCPI query and stream binary block data straight to a file.
+
+    Use instead of scpi_query_block for large payloads (long-memory
+    waveforms, screenshots): data is written as it arrives and never
+    held in memory or returned inline.
+
+    Args:
+        instrument: Instrument name or IP
+        command: SCPI query command for block data
+        filename: Output file path
+
+    Returns:
+        Dict with filename, size_bytes, sha256, elapsed_s and throughput_mbps
+    """
+    digest = hashlib.sha256()
+    last_logged = [0]
+
+    def progress(received: int, total: int) -> None:
+        # Log roughly every 10% of large transfers
+        if received - last_logged[0] >= max(total // 10, 1 << 20) or received == total:
+            last_logged[0] = received
+            logger.info("%s: %d/%d bytes", command, received, total)
+
+    try:
+        sock = get_socket(instrument)
+        t0 = time.time()
+        with open(filename, "wb") as f:
+            def sink(chunk):
+                f.write(chunk)
+                digest.update(chunk)
+            size = sock.query_block_stream(command, sink, progress)
+        elapsed = time.time() - t0
+        return {
+            "filename": filename,
+            "size_bytes": size,
+            "sha256": digest.hexdigest(),
+            "elapsed_s": elapsed,
+            "throughput_mbps": size / elapsed / 1e6 if elapsed > 0 else None,
+            "command": command
+        }
+    except (SCPIError, OSError) as e:
+        return {"error": str(e), "command": command}
+
+
+@instrument_tool()
+def scpi_settings(instrument: str, refresh: bool = False) -> dict:
+    """
+    Show the settings the server has cached for an instrument.
+
+    Drivers remember setting values they have written or read back and
+    skip re-sending or re-querying them. Use refresh=True after changing
+    the instrument from its front panel.
+
+    Args:
+        instrument: Instrument name
+        refresh: Re-read every cached setting from the instrument first
+
+    Returns:
+        Dict with settings (SCPI header -> value) and refreshed flag
+    """
+    try:
+        inst = get_instrument(instrument)
+        settings = inst.refresh() if refresh else dict(inst.shadow)
+        return {"instrument": instrument, "settings": settings, "refreshed": refresh}
+    except Exception as e:
+        return {"error": str(e)}
+
+
 # ==============================================================================
-# RSA5065N - Spectrum Analyser Tools (5)
+# RSA5065N - Spectrum Analyser Tools (10)
 # ==============================================================================
 
-@mcp.tool()
+@instrument_tool()
 def rsa_reset() -> dict:
     """
-    Reset the RSA5065N to known state (SA mode, ASCII format, errors drained).
+    Reset the RSA5065N to known state (SA mode, binary trace format, errors drained).
 
     Returns:
         Dict with ok status and errors_drained count
@@ -274,7 +428,7 @@ def rsa_reset() -> dict:
         return {"ok": False, "error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
 def rsa_configure_sweep(
     start_hz: float,
     stop_hz: float,
@@ -282,7 +436,8 @@ def rsa_configure_sweep(
     vbw_hz: float = 10e3,
     ref_level_dbm: float = -20.0,
     att_db: float = 0,
-    points: int = 1001
+    points: int = 1001,
+    trace_format: str = "REAL32"
 ) -> dict:
     """
     Configure a swept spectrum analysis.
@@ -295,6 +450,7 @@ def rsa_configure_sweep(
         ref_level_dbm: Reference level in dBm (default -20)
         att_db: Attenuation in dB (0 = auto, min 10 dB)
         points: Sweep points (default 1001). Valid: 201, 401, 601, 801, 1001, etc.
+        trace_format: "REAL32" (binary, default) or "ASCII" (fallback)
 
     Returns:
         Dict with actual_points, actual_rbw_hz, actual_vbw_hz
@@ -308,40 +464,49 @@ def rsa_configure_sweep(
             vbw_hz=vbw_hz,
             ref_level_dbm=ref_level_dbm,
             att_db=att_db,
-            points=points
+            points=points,
+            trace_format=trace_format
         )
     except Exception as e:
         return {"error": str(e)}
 
 
-@mcp.tool()
-def rsa_sweep(trace: int = 1) -> dict:
+@instrument_tool()
+def rsa_sweep(trace: int = 1, with_freq: bool = False) -> dict:
     """
     Execute a single sweep and return trace data.
 
     Args:
         trace: Trace number (1-3, default 1)
+        with_freq: Include freq_hz, the frequency of each point
 
     Returns:
-        Dict with trace_dbm (list of dBm values), points, elapsed_s
+        Dict with trace_dbm (list of dBm values), points, start_hz,
+        stop_hz, elapsed_s
     """
     try:
         rsa = get_instrument("rsa5065n")
-        return rsa.sweep(trace)
+        return rsa.sweep(trace, with_freq)
     except Exception as e:
         return {"error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
 def rsa_capture_burst(
     n: int,
     start_hz: float,
     stop_hz: float,
     rbw_hz: float = 10e3,
-    points: int = 1001
+    points: int = 1001,
+    filename: Optional[str] = None,
+    include_holds: bool = False
 ) -> dict:
     """
-    Capture N consecutive sweeps.
+    Capture N consecutive sweeps and summarise them.
+
+    Sweeps are stored in an (n, points) float32 array; pass filename to
+    keep them as a .npy file (load with numpy.load). Max-hold, min-hold
+    and average traces are computed while capturing.
 
     Args:
         n: Number of sweeps to capture
@@ -349,18 +514,200 @@ def rsa_capture_burst(
         stop_hz: Stop frequency in Hz
         rbw_hz: Resolution bandwidth in Hz (default 10 kHz)
         points: Sweep points (default 1001)
+        filename: Save all sweeps to this .npy file (optional)
+        include_holds: Include the max/min-hold and average traces as lists
 
     Returns:
-        Dict with sweeps list (each has timestamp and trace_dbm), actual_points
+        Dict with count, actual_points, filename, peak (max-hold peak
+        freq_hz/dbm and the sweep it came from), overall min/max, noise
+        floor estimate, timing and optional hold traces
     """
     try:
         rsa = get_instrument("rsa5065n")
-        return rsa.capture_burst(n, start_hz, stop_hz, rbw_hz, points)
+        burst = rsa.capture_burst(n, start_hz, stop_hz, rbw_hz, points, filename)
+        if "error" in burst:
+            return burst
+        stamps = burst["timestamps"]
+        result = {
+            "count": burst["count"],
+            "actual_points": burst["actual_points"],
+            "start_hz": burst["start_hz"],
+            "stop_hz": burst["stop_hz"],
+            "filename": burst["filename"],
+            "peak": burst["peak"],
+            "max_dbm": float(burst["max_hold_dbm"].max()),
+            "min_dbm": float(burst["min_hold_dbm"].min()),
+            "noise_floor_dbm": float(np.median(burst["average_dbm"])),
+            "first_timestamp": float(stamps[0]),
+            "last_timestamp": float(stamps[-1]),
+            "elapsed_s": burst["elapsed_s"],
+            "sweeps_per_s": burst["sweeps_per_s"]
+        }
+        if include_holds:
+            for key in ("max_hold_dbm", "min_hold_dbm", "average_dbm"):
+                result[key] = burst[key].tolist()
+        return result
+    except Exception as e:
+        return {"error": str(e)}
+
+
+@instrument_tool()
+def rsa_monitor_start(
+    start_hz: float,
+    stop_hz: float,
+    rbw_hz: float = 10e3,
+    points: int = 1001,
+    upper_mask: Optional[List[List[float]]] = None,
+    lower_mask: Optional[List[List[float]]] = None,
+    capacity: int = 600
+) -> dict:
+    """
+    Start continuous spectrum monitoring in the background.
+
+    Configures the sweep, then a worker thread sweeps back-to-back,
+    keeps the last `capacity` traces as a rolling spectrogram and checks
+    each one against the limit masks. Violations are recorded as events
+    (rsa_monitor_events), so a band can be watched for hours without
+    pulling traces. Other RSA tools wait for the sweep in progress.
+
+    Args:
+        start_hz: Start frequency in Hz
+        stop_hz: Stop frequency in Hz
+        rbw_hz: Resolution bandwidth in Hz (default 10 kHz)
+        points: Sweep points (default 1001)
+        upper_mask: [[freq_hz, limit_dbm], ...] breakpoints the trace must
+                    stay below; straight lines between points, repeat a
+                    frequency for a step
+        lower_mask: Breakpoints the trace must stay above
+        capacity: Spectrogram depth in sweeps
+
+    Returns:
+        Dict with sweep configuration and monitor status
+    """
+    # Reject malformed masks here rather than on the worker thread
+    for label, mask in (("upper_mask", upper_mask), ("lower_mask", lower_mask)):
+        try:
+            mask_limits(mask, np.array([start_hz, stop_hz]))
+        except (TypeError, ValueError) as e:
+            return {"error": f"Invalid {label}: {e}"}
+
+    try:
+        stream = _streams.get("rsa5065n")
+        if stream is not None and stream.running:
+            return {"error": "Monitor already running", **stream.status()}
+        pool = get_pool()
+        with pool.instrument_lock("rsa5065n"):
+            config = get_instrument("rsa5065n").configure_sweep(
+                start_hz=start_hz, stop_hz=stop_hz, rbw_hz=rbw_hz, points=points)
+
+        def capture():
+            with pool.instrument_lock("rsa5065n"):
+                return get_instrument("rsa5065n").monitor_sweep(upper_mask, lower_mask)
+
+        stream = AcquisitionStream("rsa5065n", capture, capacity)
+        _streams["rsa5065n"] = stream
+        stream.start()
+        return {**config, **stream.status()}
     except Exception as e:
         return {"error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
+def rsa_monitor_events(since_id: int = -1, max_events: int = 100) -> dict:
+    """
+    Limit violations recorded by the spectrum monitor.
+
+    Each event has id, seq (sweep number), timestamp, kind
+    (upper/lower), freq_hz, level_dbm, limit_dbm, margin_db and the
+    start_hz/stop_hz of the failing run. Pass the last id seen as
+    since_id to get only new events.
+
+    Args:
+        since_id: Return events with a greater id
+        max_events: Maximum events to return
+
+    Returns:
+        Dict with events list, last_id and monitor status
+    """
+    stream = _streams.get("rsa5065n")
+    if stream is None:
+        return {"error": "No monitor started"}
+    events = stream.pull_events(since_id, max_events)
+    return {
+        "events": events,
+        "last_id": events[-1]["id"] if events else since_id,
+        **stream.status()
+    }
+
+
+@instrument_tool()
+def rsa_monitor_spectrogram(sweeps: int = 50, decimate: int = 1) -> dict:
+    """
+    Latest traces from the monitor's rolling spectrogram.
+
+    Does not consume the buffer. Data is base64 little-endian float32
+    dBm shaped (sweeps, points) (decode with numpy.frombuffer(
+    base64.b64decode(data), "<f4").reshape(shape)).
+
+    Args:
+        sweeps: Number of most recent sweeps
+        decimate: Keep every Nth point along frequency (max-hold within each group)
+
+    Returns:
+        Dict with seq, timestamps, shape, data, start_hz, stop_hz
+    """
+    try:
+        stream = _streams.get("rsa5065n")
+        if stream is None:
+            return {"error": "No monitor started"}
+        seqs, stamps, traces = stream.ring.latest(sweeps)
+        if decimate > 1 and traces.size:
+            width = traces.shape[1] // decimate * decimate
+            traces = traces[:, :width].reshape(len(traces), -1, decimate).max(axis=2)
+        return {
+            "seq": seqs.tolist(),
+            "timestamps": stamps.tolist(),
+            "shape": list(traces.shape),
+            "encoding": "float32-le-base64",
+            "data": base64.b64encode(traces.astype("<f4", copy=False).tobytes()).decode("ascii"),
+            "start_hz": stream.info.get("start_hz"),
+            "stop_hz": stream.info.get("stop_hz")
+        }
+    except Exception as e:
+        return {"error": str(e)}
+
+
+@instrument_tool()
+def rsa_monitor_status() -> dict:
+    """
+    Spectrum monitor counters.
+
+    Returns:
+        Dict with running, segments (sweeps), segments_per_s, events,
+        dropped, errors and the monitored range
+    """
+    stream = _streams.get("rsa5065n")
+    if stream is None:
+        return {"running": False, "error": "No monitor started"}
+    return stream.status()
+
+
+@instrument_tool()
+def rsa_monitor_stop() -> dict:
+    """
+    Stop the spectrum monitor. Events and spectrogram stay readable.
+
+    Returns:
+        Dict with final monitor status
+    """
+    stream = _streams.get("rsa5065n")
+    if stream is None:
+        return {"error": "No monitor started"}
+    stream.stop()
+    return stream.status()
+
+
+@instrument_tool()
 def rsa_screenshot(filename: str) -> dict:
     """
     Capture the RSA5065N display.
@@ -379,10 +726,10 @@ def rsa_screenshot(filename: str) -> dict:
 
 
 # ==============================================================================
-# MSO8204 - Oscilloscope Tools (12)
+# MSO8204 - Oscilloscope Tools (20)
 # ==============================================================================
 
-@mcp.tool()
+@instrument_tool()
 def scope_reset() -> dict:
     """
     Reset the MSO8204 to known state.
@@ -397,7 +744,7 @@ def scope_reset() -> dict:
         return {"ok": False, "error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
 def scope_channel_config(
     channel: int,
     enabled: bool = True,
@@ -437,7 +784,7 @@ def scope_channel_config(
         return {"error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
 def scope_timebase(
     scale_s_div: float,
     offset_s: float = 0,
@@ -461,7 +808,7 @@ def scope_timebase(
         return {"error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
 def scope_trigger(
     mode: str = "EDGE",
     source: str = "CHANnel1",
@@ -489,7 +836,7 @@ def scope_trigger(
         return {"error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
 def scope_autoscale() -> dict:
     """
     Run autoscale on all active channels.
@@ -504,7 +851,7 @@ def scope_autoscale() -> dict:
         return {"ok": False, "error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
 def scope_acquire(mode: str = "RUN") -> dict:
     """
     Start acquisition (run/stop/single).
@@ -522,27 +869,58 @@ def scope_acquire(mode: str = "RUN") -> dict:
         return {"error": str(e)}
 
 
-@mcp.tool()
-def scope_measure(channel: int, measurements: List[str]) -> dict:
+@instrument_tool()
+def scope_measure(channel: int, measurements: List[str], single: bool = False) -> dict:
     """
     Take measurements on a channel.
 
+    All measurements are read in one round-trip.
+
     Args:
         channel: Channel number (1-4)
-        measurements: List of measurement names, e.g.:
+        measurements: List of measurement names (long or short form, any
+            case), e.g.:
             ["FREQuency", "VPP", "VRMS", "RISetime", "FALLtime", "PDUTy", "OVERshoot"]
+        single: Trigger one acquisition first so all values share a trigger
 
     Returns:
         Dict with channel and results mapping measurement names to values
     """
     try:
         scope = get_instrument("mso8204")
-        return scope.measure(channel, measurements)
+        return scope.measure(channel, measurements, single)
     except Exception as e:
         return {"error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
+def scope_measure_statistics(
+    channel: int,
+    measurements: List[str],
+    stats: Optional[List[str]] = None,
+    reset: bool = False
+) -> dict:
+    """
+    Read measurement statistics accumulated over many triggers.
+
+    Args:
+        channel: Channel number (1-4)
+        measurements: List of measurement names, e.g. ["FREQuency", "VPP"]
+        stats: Columns to read: "current", "average", "max", "min",
+               "deviation", "count" (default all)
+        reset: Clear accumulated statistics first
+
+    Returns:
+        Dict with channel and results mapping measurement -> {stat: value}
+    """
+    try:
+        scope = get_instrument("mso8204")
+        return scope.measure_statistics(channel, measurements, stats, reset)
+    except Exception as e:
+        return {"error": str(e)}
+
+
+@instrument_tool()
 def scope_measure_phase(source_a: int, source_b: int) -> dict:
     """
     Measure phase relationship between two channels.
@@ -561,33 +939,123 @@ def scope_measure_phase(source_a: int, source_b: int) -> dict:
         return {"error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
 def scope_waveform(
     channel: int,
     mode: str = "NORMal",
     fmt: str = "ASCii",
-    points: Optional[int] = None
+    points: Optional[int] = None,
+    with_time: bool = False
 ) -> dict:
     """
     Capture raw waveform data from a channel.
 
+    BYTE/WORD are much faster for large captures: samples are scaled to
+    volts on the host and returned as base64 little-endian float32.
+
     Args:
         channel: Channel number (1-4)
         mode: Data mode ("NORMal" = screen, "RAW" = full memory)
         fmt: Data format ("ASCii", "BYTE", "WORD")
         points: Number of points to read (optional)
+        with_time: Include the time axis
 
     Returns:
         Dict with waveform data, scaling parameters, and sample rate
     """
     try:
         scope = get_instrument("mso8204")
-        return scope.waveform(channel, mode, fmt, points)
+        return scope.waveform(channel, mode, fmt, points, with_time)
+    except Exception as e:
+        return {"error": str(e)}
+
+
+@instrument_tool()
+def scope_waveform_deep(
+    channel: int,
+    filename: str,
+    fmt: str = "BYTE",
+    points: Optional[int] = None
+) -> dict:
+    """
+    Download full deep-memory (RAW) waveform to a .npy file.
+
+    Stops acquisition and reads the memory in chunked windows, scaling
+    to float32 volts into a memory-mapped .npy file (load with
+    numpy.load). Use for captures beyond a single transfer's limit.
+
+    Args:
+        channel: Channel number (1-4)
+        filename: Output .npy file path
+        fmt: Transfer format ("BYTE" or "WORD")
+        points: Points to read (default: full memory depth)
+
+    Returns:
+        Dict with filename, points, chunks, throughput_mbps, scaling
+        and min/max/mean volts
+    """
+    try:
+        scope = get_instrument("mso8204")
+        result = scope.waveform_deep(channel, fmt, points, filename=filename)
+        volts = result.pop("volts")
+        result.update({
+            "min_v": float(volts.min()),
+            "max_v": float(volts.max()),
+            "mean_v": float(volts.mean())
+        })
+        return result
     except Exception as e:
         return {"error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
+def scope_capture_channels(
+    channels: List[int],
+    mode: str = "NORMal",
+    fmt: str = "BYTE",
+    points: Optional[int] = None,
+    single: bool = True,
+    timeout_s: float = 5.0,
+    with_time: bool = False
+) -> dict:
+    """
+    Capture several channels from one trigger as an aligned 2-D array.
+
+    Triggers one :SINGle acquisition and reads every channel from it, so
+    the rows share one time axis. Data is returned as base64 little-endian
+    float32 in row-major order (decode with numpy.frombuffer(
+    base64.b64decode(data), "<f4").reshape(shape)).
+
+    Args:
+        channels: Channel numbers, e.g. [1, 2, 3, 4]
+        mode: Data mode ("NORMal" = screen, "RAW" = full memory)
+        fmt: Transfer format ("BYTE" or "WORD")
+        points: Number of points per channel (optional)
+        single: Trigger a single acquisition first (False = stop and read)
+        timeout_s: Maximum wait for the trigger
+        with_time: Include the shared time axis (base64 float64)
+
+    Returns:
+        Dict with shape, data, shared horizontal scaling and per-channel
+        vertical scaling
+    """
+    try:
+        scope = get_instrument("mso8204")
+        result = scope.capture_channels(channels, mode, fmt, points, single, timeout_s, with_time)
+        if "error" in result:
+            return result
+        volts, times = result.pop("volts"), result.pop("time_s")
+        result["shape"] = list(volts.shape)
+        result["encoding"] = "float32-le-base64"
+        result["data"] = base64.b64encode(volts.astype("<f4", copy=False).tobytes()).decode("ascii")
+        if times is not None:
+            result["time_s"] = base64.b64encode(times.astype("<f8", copy=False).tobytes()).decode("ascii")
+        return result
+    except Exception as e:
+        return {"error": str(e)}
+
+
+@instrument_tool()
 def scope_screenshot(filename: str, fmt: str = "PNG") -> dict:
     """
     Capture the oscilloscope display.
@@ -606,7 +1074,7 @@ def scope_screenshot(filename: str, fmt: str = "PNG") -> dict:
         return {"error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
 def scope_fft(
     source_channel: int,
     window: str = "HANNing",
@@ -630,7 +1098,46 @@ def scope_fft(
         return {"error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
+def scope_spectrum(
+    channel: int,
+    window: str = "HANNing",
+    unit: str = "DBV",
+    averages: int = 1,
+    mode: str = "NORMal",
+    points: Optional[int] = None,
+    n_peaks: int = 10,
+    n_harmonics: int = 5
+) -> dict:
+    """
+    Host-side FFT of captured waveforms, returned as a peak table.
+
+    Unlike scope_fft (on-screen math only), this captures the channel,
+    computes the spectrum with NumPy and returns peaks, harmonics and
+    distortion figures. Use mode "RAW" with points for finer resolution.
+
+    Args:
+        channel: Channel number (1-4)
+        window: Window function ("RECTangle", "HANNing", "HAMMing", "BLACkman", "FLATtop")
+        unit: Level unit ("VRMS", "DBV", "DBM" into 50 ohm)
+        averages: Number of captures to power-average
+        mode: Data mode ("NORMal" = screen, "RAW" = full memory)
+        points: Number of points per capture (optional)
+        n_peaks: Rows in the peak table
+        n_harmonics: Harmonics (including the fundamental) to analyse
+
+    Returns:
+        Dict with fundamental, thd_db, thd_pct, snr_db, sinad_db, sfdr_db,
+        harmonics and peaks tables
+    """
+    try:
+        scope = get_instrument("mso8204")
+        return scope.spectrum(channel, window, unit, averages, mode, points, n_peaks, n_harmonics)
+    except Exception as e:
+        return {"error": str(e)}
+
+
+@instrument_tool()
 def scope_counter(channel: int) -> dict:
     """
     Read frequency using the hardware frequency counter.
@@ -656,11 +1163,119 @@ def scope_counter(channel: int) -> dict:
         return {"error": str(e)}
 
 
+@instrument_tool()
+def scope_stream_start(
+    channels: List[int],
+    mode: str = "NORMal",
+    points: Optional[int] = None,
+    capacity: int = 256,
+    timeout_s: float = 2.0
+) -> dict:
+    """
+    Start continuous acquisition streaming in the background.
+
+    A worker thread re-arms the scope with :SINGle after every trigger,
+    downloads the channels and stores each segment with its timestamp in
+    a ring buffer of `capacity` segments. Pull them with scope_stream_pull.
+    Other scope tools wait for the segment in progress: they share the
+    connection.
+
+    Args:
+        channels: Channel numbers, e.g. [1, 2]
+        mode: Data mode ("NORMal" = screen, "RAW" = full memory)
+        points: Number of points per channel (optional)
+        capacity: Ring buffer size in segments
+        timeout_s: Wait per trigger before counting it as missed
+
+    Returns:
+        Dict with stream status
+    """
+    try:
+        stream = _streams.get("mso8204")
+        if stream is not None and stream.running:
+            return {"error": "Stream already running", **stream.status()}
+        pool = get_pool()
+
+        def capture():
+            with pool.instrument_lock("mso8204"):
+                return get_instrument("mso8204").stream_segment(channels, mode, points, timeout_s)
+
+        stream = AcquisitionStream("mso8204", capture, capacity)
+        _streams["mso8204"] = stream
+        stream.start()
+        return stream.status()
+    except Exception as e:
+        return {"error": str(e)}
+
+
+@instrument_tool()
+def scope_stream_pull(max_segments: int = 16) -> dict:
+    """
+    Take buffered segments from the acquisition stream, oldest first.
+
+    Data is base64 little-endian float32 shaped (segments, channels,
+    points) (decode with numpy.frombuffer(base64.b64decode(data),
+    "<f4").reshape(shape)). Gaps in seq are segments dropped because the
+    buffer overflowed.
+
+    Args:
+        max_segments: Maximum segments to return
+
+    Returns:
+        Dict with seq, timestamps (Unix s), shape, data and counters
+    """
+    try:
+        stream = _streams.get("mso8204")
+        if stream is None:
+            return {"error": "No stream started"}
+        seqs, stamps, segments = stream.pull(max_segments)
+        return {
+            "seq": seqs.tolist(),
+            "timestamps": stamps.tolist(),
+            "shape": list(segments.shape),
+            "encoding": "float32-le-base64",
+            "data": base64.b64encode(segments.astype("<f4", copy=False).tobytes()).decode("ascii"),
+            **stream.status()
+        }
+    except Exception as e:
+        return {"error": str(e)}
+
+
+@instrument_tool()
+def scope_stream_status() -> dict:
+    """
+    Acquisition stream counters.
+
+    Returns:
+        Dict with running, segments, unread, dropped, missed_triggers,
+        errors, segments_per_s and throughput_mbps
+    """
+    stream = _streams.get("mso8204")
+    if stream is None:
+        return {"running": False, "error": "No stream started"}
+    return stream.status()
+
+
+@instrument_tool()
+def scope_stream_stop() -> dict:
+    """
+    Stop the acquisition stream. Unread segments stay pullable.
+
+    Returns:
+        Dict with final stream status
+    """
+    stream = _streams.get("mso8204")
+    if stream is None:
+        return {"error": "No stream started"}
+    stream.stop()
+    return stream.status()
+
+
 # ==============================================================================
-# Composite / Workflow Tools (2)
+# Composite / Workflow Tools (4)
 # ==============================================================================
 
-@mcp.tool()
+@instrument_tool()
 def scope_characterise_channel(channel: int, autoscale: bool = True) -> dict:
     """
     Full signal characterisation on one channel.
@@ -685,7 +1300,7 @@ def scope_characterise_channel(channel: int, autoscale: bool = True) -> dict:
         return {"error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
 def scope_characterise_dual(
     channel_a: int,
     channel_b: int,
@@ -709,7 +1324,59 @@ def scope_characterise_dual(
         return {"error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
+def scope_characterise_waveform(
+    channel: int,
+    autoscale: bool = True,
+    mode: str = "NORMal",
+    points: Optional[int] = None
+) -> dict:
+    """
+    Full signal characterisation computed on the host from one capture.
+
+    Same results as scope_characterise_channel, but from a single
+    waveform download analysed with NumPy instead of 15 scope queries.
+    Use mode "RAW" for more points and finer edge timing.
+
+    Args:
+        channel: Channel number (1-4)
+        autoscale: Run autoscale before capturing (default true)
+        mode: Data mode ("NORMal" = screen, "RAW" = full memory)
+        points: Number of points to read (optional)
+
+    Returns:
+        Dict with frequency, edges, levels, duty, overshoot and waveform_shape
+    """
+    try:
+        scope = get_instrument("mso8204")
+        return scope.characterise_waveform(channel, autoscale, mode, points)
+    except Exception as e:
+        return {"error": str(e)}
+
+
+@instrument_tool()
+def waveform_analyse_file(filename: str, xinc_s: float) -> dict:
+    """
+    Characterise an archived waveform (.npy of volts) offline.
+
+    Works on files written by scope_waveform_deep or any 1-D NumPy
+    array of voltages; no instrument is contacted.
+
+    Args:
+        filename: Path to a .npy file
+        xinc_s: Sample interval in seconds (1 / sample rate)
+
+    Returns:
+        Dict with frequency, edges, levels, duty, overshoot and waveform_shape
+    """
+    try:
+        volts = np.load(filename, mmap_mode="r")
+        return {"filename": filename, **characterise(volts, xinc_s)}
+    except Exception as e:
+        return {"error": str(e)}
+
+
+@instrument_tool()
 def scope_reference_status() -> dict:
     """
     Query oscilloscope reference clock source and lock status.
@@ -734,7 +1401,7 @@ def scope_reference_status() -> dict:
 # DMM6500 - Multimeter Tools (7)
 # ==============================================================================
 
-@mcp.tool()
+@instrument_tool()
 def dmm_reset() -> dict:
     """
     Reset the DMM6500 to known state.
@@ -749,7 +1416,7 @@ def dmm_reset() -> dict:
         return {"ok": False, "error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
 def dmm_configure(
     function: str,
     range_val: Optional[float] = None,
@@ -775,7 +1442,7 @@ def dmm_configure(
         return {"error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
 def dmm_measure() -> dict:
     """
     Take a single measurement with current configuration.
@@ -790,7 +1457,7 @@ def dmm_measure() -> dict:
         return {"error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
 def dmm_measure_dcv(range_val: Optional[float] = None, nplc: float = 1) -> dict:
     """
     Quick DC voltage measurement.
@@ -809,7 +1476,7 @@ def dmm_measure_dcv(range_val: Optional[float] = None, nplc: float = 1) -> dict:
         return {"error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
 def dmm_measure_dci(range_val: Optional[float] = None, nplc: float = 1) -> dict:
     """
     Quick DC current measurement.
@@ -828,7 +1495,7 @@ def dmm_measure_dci(range_val: Optional[float] = None, nplc: float = 1) -> dict:
         return {"error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
 def dmm_measure_resistance(four_wire: bool = False, range_val: Optional[float] = None) -> dict:
     """
     Resistance measurement (2-wire or 4-wire).
@@ -847,7 +1514,7 @@ def dmm_measure_resistance(four_wire: bool = False, range_val: Optional[float] =
         return {"error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
 def dmm_measure_temperature(sensor: str = "RTD", rtd_type: str = "PT100") -> dict:
     """
     Temperature measurement.
@@ -870,7 +1537,7 @@ def dmm_measure_temperature(sensor: str = "RTD", rtd_type: str = "PT100") -> dic
 # DL3021A - DC Electronic Load Tools (8)
 # ==============================================================================
 
-@mcp.tool()
+@instrument_tool()
 def load_reset() -> dict:
     """
     Reset the DL3021A to known state (input OFF).
@@ -885,7 +1552,7 @@ def load_reset() -> dict:
         return {"ok": False, "error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
 def load_input(enabled: bool) -> dict:
     """
     Enable or disable load input.
@@ -905,7 +1572,7 @@ def load_input(enabled: bool) -> dict:
         return {"error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
 def load_cc(current_a: float, slew_rate: Optional[float] = None, voltage_limit: Optional[float] = None) -> dict:
     """
     Configure Constant Current mode.
@@ -925,7 +1592,7 @@ def load_cc(current_a: float, slew_rate: Optional[float] = None, voltage_limit:
         return {"error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
 def load_cv(voltage_v: float, current_limit: Optional[float] = None) -> dict:
     """
     Configure Constant Voltage mode.
@@ -944,7 +1611,7 @@ def load_cv(voltage_v: float, current_limit: Optional[float] = None) -> dict:
         return {"error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
 def load_cr(resistance_ohm: float, current_limit: Optional[float] = None) -> dict:
     """
     Configure Constant Resistance mode.
@@ -963,7 +1630,7 @@ def load_cr(resistance_ohm: float, current_limit: Optional[float] = None) -> dic
         return {"error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
 def load_cp(power_w: float, current_limit: Optional[float] = None) -> dict:
     """
     Configure Constant Power mode.
@@ -982,7 +1649,7 @@ def load_cp(power_w: float, current_limit: Optional[float] = None) -> dict:
         return {"error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
 def load_measure() -> dict:
     """
     Read voltage, current, and power measurements.
@@ -997,7 +1664,7 @@ def load_measure() -> dict:
         return {"error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
 def load_transient(
     mode: str = "continuous",
     level_a: float = 0.5,
@@ -1027,7 +1694,7 @@ def load_transient(
 # DG2052 - Function Generator Tools (10)
 # ==============================================================================
 
-@mcp.tool()
+@instrument_tool()
 def awg_reset() -> dict:
     """
     Reset the DG2052 to known state (outputs OFF).
@@ -1042,7 +1709,7 @@ def awg_reset() -> dict:
         return {"ok": False, "error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
 def awg_output(channel: int, enabled: bool) -> dict:
     """
     Enable or disable channel output.
@@ -1063,7 +1730,7 @@ def awg_output(channel: int, enabled: bool) -> dict:
         return {"error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
 def awg_sine(
     channel: int,
     frequency_hz: float,
@@ -1091,7 +1758,7 @@ def awg_sine(
         return {"error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
 def awg_square(
     channel: int,
     frequency_hz: float,
@@ -1119,7 +1786,7 @@ def awg_square(
         return {"error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
 def awg_pulse(
     channel: int,
     frequency_hz: float,
@@ -1149,7 +1816,7 @@ def awg_pulse(
         return {"error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
 def awg_ramp(
     channel: int,
     frequency_hz: float,
@@ -1177,7 +1844,7 @@ def awg_ramp(
         return {"error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
 def awg_noise(channel: int, amplitude_vpp: float, offset_v: float = 0) -> dict:
     """
     Configure noise output.
@@ -1197,7 +1864,7 @@ def awg_noise(channel: int, amplitude_vpp: float, offset_v: float = 0) -> dict:
         return {"error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
 def awg_sweep(
     channel: int,
     start_hz: float,
@@ -1225,7 +1892,7 @@ def awg_sweep(
         return {"error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
 def awg_burst(
     channel: int,
     cycles: int,
@@ -1251,7 +1918,7 @@ def awg_burst(
         return {"error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
 def awg_dual_channel(
     frequency_hz: float,
     amplitude_vpp: float,
@@ -1281,7 +1948,7 @@ def awg_dual_channel(
 # DP932A - Power Supply Tools (9)
 # ==============================================================================
 
-@mcp.tool()
+@instrument_tool()
 def psu_reset(psu: str = "dp932a-1") -> dict:
     """
     Reset the power supply to known state (outputs OFF).
@@ -1299,7 +1966,7 @@ def psu_reset(psu: str = "dp932a-1") -> dict:
         return {"ok": False, "error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
 def psu_output(psu: str, channel: int, enabled: bool) -> dict:
     """
     Enable or disable channel output.
@@ -1321,7 +1988,7 @@ def psu_output(psu: str, channel: int, enabled: bool) -> dict:
         return {"error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
 def psu_all_off(psu: str = "dp932a-1") -> dict:
     """
     Disable all outputs on a power supply.
@@ -1339,7 +2006,7 @@ def psu_all_off(psu: str = "dp932a-1") -> dict:
         return {"error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
 def psu_set_channel(psu: str, channel: int, voltage_v: float, current_a: float) -> dict:
     """
     Set voltage and current for a channel.
@@ -1360,7 +2027,7 @@ def psu_set_channel(psu: str, channel: int, voltage_v: float, current_a: float)
         return {"error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
 def psu_measure(psu: str, channel: int) -> dict:
     """
     Read voltage, current, and power for a channel.
@@ -1379,7 +2046,7 @@ def psu_measure(psu: str, channel: int) -> dict:
         return {"error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
 def psu_measure_all(psu: str = "dp932a-1") -> dict:
     """
     Read measurements for all channels.
@@ -1397,7 +2064,7 @@ def psu_measure_all(psu: str = "dp932a-1") -> dict:
         return {"error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
 def psu_protection(
     psu: str,
     channel: int,
@@ -1432,7 +2099,7 @@ def psu_protection(
         return {"error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
 def psu_tracking(psu: str, mode: int) -> dict:
     """
     Set tracking mode for CH1 and CH2.
@@ -1451,7 +2118,7 @@ def psu_tracking(psu: str, mode: int) -> dict:
         return {"error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
 def psu_quick_output(psu: str, channel: int, voltage_v: float, current_a: float) -> dict:
     """
     Configure and enable output in one call.
@@ -1475,10 +2142,10 @@ def psu_quick_output(psu: str, channel: int, voltage_v: float, current_a: float)
 
 
 # ==============================================================================
-# DMM6500 TSP Mode Tools (19)
+# DMM6500 TSP Mode Tools (20)
 # ==============================================================================
 
-@mcp.tool()
+@instrument_tool()
 def dmm_tsp_reset() -> dict:
     """
     Reset the DMM6500 in TSP mode.
@@ -1495,7 +2162,7 @@ def dmm_tsp_reset() -> dict:
         return {"ok": False, "error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
 def dmm_tsp_configure(
     function: str,
     range_val: Optional[float] = None,
@@ -1521,7 +2188,7 @@ def dmm_tsp_configure(
         return {"error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
 def dmm_tsp_measure() -> dict:
     """
     Take a single measurement with current configuration (TSP mode).
@@ -1536,7 +2203,7 @@ def dmm_tsp_measure() -> dict:
         return {"error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
 def dmm_tsp_measure_dcv(range_val: Optional[float] = None, nplc: float = 1) -> dict:
     """
     Quick DC voltage measurement (TSP mode).
@@ -1555,7 +2222,7 @@ def dmm_tsp_measure_dcv(range_val: Optional[float] = None, nplc: float = 1) -> d
         return {"error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
 def dmm_tsp_measure_dci(range_val: Optional[float] = None, nplc: float = 1) -> dict:
     """
     Quick DC current measurement (TSP mode).
@@ -1574,7 +2241,7 @@ def dmm_tsp_measure_dci(range_val: Optional[float] = None, nplc: float = 1) -> d
         return {"error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
 def dmm_tsp_measure_resistance(
     four_wire: bool = False,
     range_val: Optional[float] = None,
@@ -1598,7 +2265,7 @@ def dmm_tsp_measure_resistance(
         return {"error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
 def dmm_tsp_measure_temperature(sensor: str = "RTD", rtd_type: str = "PT100") -> dict:
     """
     Temperature measurement (TSP mode).
@@ -1619,7 +2286,7 @@ def dmm_tsp_measure_temperature(sensor: str = "RTD", rtd_type: str = "PT100") ->
 
 # ---- TSP Digitizing ----
 
-@mcp.tool()
+@instrument_tool()
 def dmm_tsp_digitize_configure(
     function: str = "dcv",
     sample_rate: int = 1000,
@@ -1645,25 +2312,31 @@ def dmm_tsp_digitize_configure(
         return {"error": str(e)}
 
 
-@mcp.tool()
-def dmm_tsp_digitize_read(buffer_name: str = "defbuffer1") -> dict:
+@instrument_tool()
+def dmm_tsp_digitize_read(buffer_name: str = "defbuffer1", filename: Optional[str] = None) -> dict:
     """
     Read digitized samples from buffer (TSP mode).
 
+    Samples are transferred as binary float32 in large, throughput-tuned
+    windows. For long captures pass filename to save them as a .npy file
+    instead of returning them inline.
+
     Args:
         buffer_name: Buffer to read from (default "defbuffer1")
+        filename: Save samples to this .npy file (optional)
 
     Returns:
-        Dict with samples list and statistics (min, max, avg)
+        Dict with samples list (unless filename is given), statistics
+        (min, max, avg) and transfer figures (chunks, elapsed_s, throughput_mbps)
     """
     try:
         dmm = get_dmm_tsp()
-        return dmm.digitize_read(buffer_name)
+        return dmm.digitize_read(buffer_name, filename)
     except Exception as e:
         return {"error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
 def dmm_tsp_digitize_trigger(
     edge_level: float,
     slope: str = "rising",
@@ -1687,9 +2360,40 @@ def dmm_tsp_digitize_trigger(
         return {"error": str(e)}
 
 
+@instrument_tool()
+def dmm_tsp_digitize_capture(
+    function: str = "dcv",
+    sample_rate: int = 1000,
+    count: int = 1000,
+    range_val: Optional[float] = None,
+    buffer_name: str = "defbuffer1"
+) -> dict:
+    """
+    Configure, digitize and summarise in one exchange (TSP mode).
+
+    Runs an on-instrument function that captures into the buffer and
+    returns its statistics. Read the samples with dmm_tsp_digitize_read.
+
+    Args:
+        function: "dcv" or "dci"
+        sample_rate: Samples per second (1 to 1,000,000)
+        count: Number of samples
+        range_val: Manual range (None for auto)
+        buffer_name: Buffer to capture into
+
+    Returns:
+        Dict with count, min, max, mean, stddev and elapsed_s
+    """
+    try:
+        dmm = get_dmm_tsp()
+        return dmm.digitize_capture(function, sample_rate, count, range_val, buffer_name)
+    except Exception as e:
+        return {"error": str(e)}
+
+
 # ---- TSP Buffers ----
 
-@mcp.tool()
+@instrument_tool()
 def dmm_tsp_buffer_create(
     name: str,
     capacity: int = 1000,
@@ -1713,7 +2417,7 @@ def dmm_tsp_buffer_create(
         return {"error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
 def dmm_tsp_buffer_read(
     buffer_name: str = "defbuffer1",
     start: int = 1,
@@ -1737,7 +2441,7 @@ def dmm_tsp_buffer_read(
         return {"error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
 def dmm_tsp_buffer_clear(buffer_name: str = "defbuffer1") -> dict:
     """
     Clear a buffer (TSP mode).
@@ -1755,7 +2459,7 @@ def dmm_tsp_buffer_clear(buffer_name: str = "defbuffer1") -> dict:
         return {"error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
 def dmm_tsp_buffer_stats(buffer_name: str = "defbuffer1") -> dict:
     """
     Get buffer statistics (TSP mode).
@@ -1775,7 +2479,7 @@ def dmm_tsp_buffer_stats(buffer_name: str = "defbuffer1") -> dict:
 
 # ---- TSP Trigger Model ----
 
-@mcp.tool()
+@instrument_tool()
 def dmm_tsp_trigger_load(template: str, count: int = 1) -> dict:
     """
     Load a trigger model template (TSP mode).
@@ -1794,7 +2498,7 @@ def dmm_tsp_trigger_load(template: str, count: int = 1) -> dict:
         return {"error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
 def dmm_tsp_trigger_initiate() -> dict:
     """
     Start the trigger model (TSP mode).
@@ -1809,7 +2513,7 @@ def dmm_tsp_trigger_initiate() -> dict:
         return {"error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
 def dmm_tsp_trigger_abort() -> dict:
     """
     Abort the running trigger model (TSP mode).
@@ -1826,8 +2530,8 @@ def dmm_tsp_trigger_abort() -> dict:
 
 # ---- TSP Scripting ----
 
-@mcp.tool()
-def dmm_tsp_execute(script: str) -> dict:
+@instrument_tool()
+def dmm_tsp_execute(script: str, name: Optional[str] = None) -> dict:
     """
     Execute arbitrary TSP Lua script (TSP mode).
 
@@ -1836,18 +2540,22 @@ def dmm_tsp_execute(script: str) -> dict:
 
     Args:
         script: Multi-line TSP Lua code
+        name: Store the script on the instrument under this name; repeated
+            runs of the same script then skip the upload. TSP/Lua globals
+            (print, dmm, format, ...) and mcp_* names are rejected
 
     Returns:
-        Dict with ok status and lines executed
+        Dict with ok status and lines executed (plus script, hash and
+        uploaded when name is given)
     """
     try:
         dmm = get_dmm_tsp()
-        return dmm.tsp_execute(script)
+        return dmm.tsp_execute(script, name)
     except Exception as e:
         return {"error": str(e)}
 
 
-@mcp.tool()
+@instrument_tool()
 def dmm_tsp_query(expression: str) -> dict:
     """
     Execute TSP expression and return result (TSP mode).
@@ -1876,5 +2584,8 @@ if __name__ == "__main__":
     logger.info("Instruments configured:")
     for name, config in INSTRUMENTS.items():
         logger.info("  %s: %s:%d", name, config.ip, config.port)
+    if os.environ.get("SCPI_WARMUP", "0") == "1":
+        # Connect to every instrument in parallel while the server starts
+        get_pool().warm_up(background=True)
     logger.info("Listening on port %d", port)
     mcp.run(transport="streamable-http", port=port, host="0.0.0.0")
@@ -4,6 +4,8 @@ SCPISocket - Instrument-agnostic raw TCP SCPI transport.
 
 Handles all Rigol quirks: missing terminators, 50 ms pacing,
 IEEE 488.2 block data, and quiet timeout for unterminated responses.
+Replies that once needed the quiet timeout are framed by their learned
+shape (or an appended *OPC? sentinel) on later reads.
 
 Usage:
     from scpi_transport import SCPISocket
@@ -13,12 +15,21 @@ Usage:
         inst.write(":CHANnel1:DISPlay ON")
         vpp = inst.query(":MEASure:VPP?")
         screenshot = inst.query_block(":DISPlay:DATA? ON,OFF,PNG")
+
+        # Coalesce several commands into one program message
+        with inst.batch() as b:
+            inst.write(":CHANnel1:SCALe 0.5")
+            inst.write(":CHANnel1:OFFSet 0")
+            scale = b.query(":CHANnel1:SCALe?")
+        print(b.results[scale])
 """
 
 import socket
 import time
 import logging
-from typing import Optional
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +38,8 @@ PACING_DELAY = 0.05       # 50 ms inter-command pacing (CRITICAL)
 QUIET_TIMEOUT = 1.0       # seconds - detect unterminated response (raised from 0.5 for large traces)
 DEFAULT_TIMEOUT = 10.0    # seconds - wait for first byte
 DEFAULT_PORT = 5555
+MAX_MESSAGE_LEN = 1024    # bytes - split longer batches into several messages
+RECV_CHUNK = 65536        # bytes - maximum size of a single recv
 
 # TCP keepalive settings (detect dead peers in <90s instead of ~2h)
 KEEPALIVE_IDLE = 60       # seconds before first probe
@@ -34,6 +47,63 @@ KEEPALIVE_INTERVAL = 10   # seconds between probes
 KEEPALIVE_COUNT = 3       # probes before giving up
 
 
+# Pacing modes
+PACING_FIXED = "fixed"    # sleep after every send (legacy behaviour)
+PACING_GAP = "gap"        # enforce minimum gap since the previous send
+PACING_OPC = "opc"        # append *OPC? to writes and wait for completion
+PACING_MODES = (PACING_FIXED, PACING_GAP, PACING_OPC)
+
+
+@dataclass
+class PacingPolicy:
+    """Inter-command pacing policy for one instrument."""
+    mode: str = PACING_GAP
+    min_gap: float = PACING_DELAY   # seconds between consecutive sends
+
+    def delay_before_send(self, last_send: float, now: float) -> float:
+        """Seconds to wait before sending, given the previous send time."""
+        if self.mode != PACING_GAP:
+            return 0.0
+        return max(0.0, last_send + self.min_gap - now)
+
+    def delay_after_send(self) -> float:
+        """Seconds to sleep after a send ("fixed" mode only)."""
+        return self.min_gap if self.mode == PACING_FIXED else 0.0
+
+    def frame_write(self, cmd: str) -> Tuple[str, bool]:
+        """
+        Message to send for a write, and whether to wait for its *OPC?
+        reply ("opc" mode appends *OPC? to every write).
+        """
+        if self.mode == PACING_OPC:
+            return f"{cmd};{SENTINEL_QUERY}", True
+        return cmd, False
+
+
+# Per-model minimum inter-command gaps. Rigol SCPI-over-TCP parsers silently
+# drop commands that arrive closer than ~50 ms apart. The 30 ms DMM6500 and
+# DP932A values are the constants those drivers used before; they have not
+# been measured against the instruments. Gap mode already counts time spent
+# reading replies towards the gap, so these only cost time between
+# back-to-back sends.
+MODEL_PACING: Dict[str, PacingPolicy] = {
+    "rsa5065n": PacingPolicy(PACING_GAP, 0.05),
+    "mso8204": PacingPolicy(PACING_GAP, 0.05),
+    "dl3021a": PacingPolicy(PACING_GAP, 0.05),
+    "dg2052": PacingPolicy(PACING_GAP, 0.05),
+    "dmm6500": PacingPolicy(PACING_GAP, 0.03),
+    "dp932a": PacingPolicy(PACING_GAP, 0.03),
+}
+
+
+def pacing_for(instrument_type: str) -> PacingPolicy:
+    """Return the default pacing policy for an instrument type."""
+    policy = MODEL_PACING.get(instrument_type)
+    if policy is None:
+        return PacingPolicy()
+    return PacingPolicy(policy.mode, policy.min_gap)
+
+
 class SCPIError(Exception):
     """Base SCPI transport error."""
     pass
@@ -49,6 +119,374 @@ class SCPITimeoutError(SCPIError):
     pass
 
 
+def split_response(text: str) -> List[str]:
+    """
+    Split a compound response on ';' separators, honouring quoted strings.
+
+    IEEE 488.2 joins the responses to a compound query with ';', e.g.
+    '1;5.000000E-01;"DC"' -> ['1', '5.000000E-01', '"DC"'].
+    """
+    parts = []
+    current = []
+    quote = None
+    for ch in text:
+        if quote:
+            if ch == quote:
+                quote = None
+        elif ch in "\"'":
+            quote = ch
+        elif ch == ";":
+            parts.append("".join(current).strip())
+            current = []
+            continue
+        current.append(ch)
+    parts.append("".join(current).strip())
+    return parts
+
+
+# Reply shapes used to detect the end of an unterminated response. Only
+# self-delimiting shapes are learned: a text reply's length (e.g. a trace
+# whose point count changes) cannot be predicted from an earlier reply.
+SHAPE_BLOCK = "block"         # IEEE 488.2 definite-length block
+SHAPE_SENTINEL = "sentinel"   # anything else: append *OPC? and wait for it
+
+SENTINEL_QUERY = "*OPC?"
+
+# How a read completed
+READ_TERMINATED = "terminated"        # terminator received
+READ_FRAMED = "framed"                # reply shape matched
+READ_QUIET_TIMEOUT = "quiet_timeout"  # fell back to QUIET_TIMEOUT
+
+
+@dataclass
+class ReplyShape:
+    """Learned shape of one query's reply, used to spot its end early."""
+    kind: str = SHAPE_SENTINEL
+
+    def complete(self, buf: bytes) -> bool:
+        """Return True once buf holds the whole reply."""
+        if self.kind == SHAPE_BLOCK:
+            return _block_complete(buf)
+        return buf.strip().endswith(b";1")
+
+
+def _block_complete(buf: bytes) -> bool:
+    """Return True once buf holds a whole #<d><count><payload> block."""
+    start = buf.find(b"#")
+    if start < 0 or len(buf) < start + 2 or not buf[start + 1:start + 2].isdigit():
+        return False
+    d = int(buf[start + 1:start + 2])
+    if d == 0 or len(buf) < start + 2 + d:
+        return False
+    return len(buf) >= start + 2 + d + int(buf[start + 2:start + 2 + d])
+
+
+def learn_shape(data: bytes) -> ReplyShape:
+    """Infer the reply shape of an unterminated response."""
+    if _block_complete(data.strip()):
+        return ReplyShape(SHAPE_BLOCK)
+    return ReplyShape(SHAPE_SENTINEL)
+
+
+_SENTINEL_SHAPE = ReplyShape(SHAPE_SENTINEL)
+
+
+def _opc_done(buf: bytes) -> bool:
+    """Completion test for a bare *OPC? reply."""
+    return buf.strip() == b"1"
+
+
+def block_header_digits(header: bytes) -> int:
+    """
+    Number of length digits announced by the first two bytes of an
+    IEEE 488.2 block header (#<d>); 0 means indefinite length.
+    """
+    if header[0:1] != b"#" or not header[1:2].isdigit():
+        raise SCPIError(f"Expected '#' block header, got: {bytes(header)!r}")
+    return int(header[1:2])
+
+
+def block_length(count: bytes, length: Optional[int] = None) -> int:
+    """
+    Payload length of a block from its <count> digits. An indefinite-
+    length header (#0, no digits, as Keithley TSP binary output uses) is
+    accepted only when the caller knows the payload length.
+    """
+    if not count:
+        if length is None:
+            raise SCPIError("Indefinite-length block not supported")
+        return length
+    return int(count)
+
+
+class ReplyReader:
+    """
+    Accumulates one reply and decides when it is complete.
+
+    Holds the framing rules shared by the blocking and asyncio transports,
+    which only move bytes: call feed() with each chunk received, quiet()
+    when no byte arrives within timeout(), and closed() on end of stream.
+    Each returns True once the reply is complete; how it ended is left in
+    `end`. quiet()/closed() return False when nothing was received, and
+    the transport raises its timeout or connection error.
+    """
+
+    def __init__(self, terminator: bytes = b"\n", max_bytes: int = 65536,
+                 complete: Optional[Callable[[bytes], bool]] = None):
+        self.terminator = terminator
+        self.max_bytes = max_bytes
+        self.complete = complete
+        self.buf = bytearray()
+        self.end: Optional[str] = None
+
+    def timeout(self, first: float) -> float:
+        """first for the first byte, then QUIET_TIMEOUT of silence ends the reply."""
+        return QUIET_TIMEOUT if self.buf else first
+
+    def feed(self, chunk: bytes) -> bool:
+        """Add received bytes; only the new ones are searched for the terminator."""
+        search_from = max(0, len(self.buf) - len(self.terminator) + 1)
+        self.buf += chunk
+        if self.buf.find(self.terminator, search_from) != -1:
+            self.end = READ_TERMINATED
+        elif self.complete is not None and self.complete(self.buf):
+            self.end = READ_FRAMED
+        elif len(self.buf) > self.max_bytes:
+            raise SCPIError(
+                f"Response exceeded {self.max_bytes} bytes without terminator")
+        return self.end is not None
+
+    def quiet(self) -> bool:
+        """No data within timeout(): quiet after data means the reply is complete."""
+        if self.buf:
+            self.end = READ_QUIET_TIMEOUT
+        return self.end is not None
+
+    def closed(self) -> bool:
+        """End of stream: complete if anything was received."""
+        if self.buf:
+            self.end = READ_TERMINATED
+        return self.end is not None
+
+
+class ResponseFramer:
+    """
+    Per-instrument reply framing state.
+
+    Remembers the shape of every query whose reply arrived without a
+    terminator, so later reads complete as soon as the shape is satisfied
+    instead of waiting QUIET_TIMEOUT, and counts how each read completed.
+    Owned by the connection pool across reconnects.
+    """
+
+    MAX_SHAPES = 256   # bound memory for queries with varying arguments
+
+    def __init__(self):
+        self.shapes: Dict[str, ReplyShape] = {}
+        self.counts: Dict[str, int] = {
+            READ_TERMINATED: 0, READ_FRAMED: 0, READ_QUIET_TIMEOUT: 0}
+        self.quiet_by_command: Dict[str, int] = {}
+
+    def shape_for(self, cmd: str) -> Optional[ReplyShape]:
+        return self.shapes.get(cmd)
+
+    def register(self, cmd: str, shape: ReplyShape) -> None:
+        """Declare the reply shape of a query up front."""
+        self.shapes[cmd] = shape
+
+    def forget(self, cmd: str) -> None:
+        self.shapes.pop(cmd, None)
+
+    def record(self, end: str) -> None:
+        self.counts[end] += 1
+
+    def _count_quiet(self, cmd: str) -> None:
+        self.quiet_by_command[cmd] = self.quiet_by_command.get(cmd, 0) + 1
+
+    def learn(self, cmd: str, data: bytes) -> None:
+        """Record a quiet-timeout read of cmd and learn its reply shape."""
+        self._count_quiet(cmd)
+        if cmd in self.shapes or len(self.shapes) < self.MAX_SHAPES:
+            shape = learn_shape(data)
+            old = self.shapes.get(cmd)
+            if old is not None and old.kind != SHAPE_SENTINEL:
+                # Learned shape did not frame the reply: fall back to sentinel
+                shape = ReplyShape(SHAPE_SENTINEL)
+            self.shapes[cmd] = shape
+            logger.debug("Learned %s reply shape for %s", shape.kind, cmd)
+
+    def sentinel_missing(self, cmd: str) -> None:
+        """
+        The *OPC? sentinel did not follow cmd's reply (the read went quiet
+        instead): forget the shape so cmd is sent plain again.
+        """
+        self._count_quiet(cmd)
+        self.forget(cmd)
+
+    def frame_query(self, cmd: str) -> Tuple[str, Optional[Callable[[bytes], bool]], bool]:
+        """
+        Message to send for query cmd, the completion test for its reply
+        and whether a *OPC? sentinel was appended.
+        """
+        shape = self.shapes.get(cmd)
+        if shape is not None and shape.kind == SHAPE_SENTINEL:
+            return f"{cmd};{SENTINEL_QUERY}", _SENTINEL_SHAPE.complete, True
+        return cmd, shape.complete if shape else None, False
+
+    def finish_query(self, cmd: str, raw: bytes, end: str, sentinel: bool) -> Tuple[str, bool]:
+        """
+        Response text of query cmd from its raw reply, learning from how
+        the read ended. The second item is True when the *OPC? sentinel
+        was answered on a line of its own, which must still be read.
+        """
+        text = raw.decode("ascii", errors="replace").strip()
+        if not sentinel:
+            if end == READ_QUIET_TIMEOUT:
+                self.learn(cmd, raw)
+            return text, False
+        if text.endswith(";1"):
+            return text[:-2].rstrip(), False
+        head, newline, last = text.rpartition("\n")
+        if newline and last.strip() == "1":
+            return head.rstrip(), False   # Sentinel line arrived with the reply
+        if end == READ_TERMINATED:
+            return text, True
+        logger.warning("No *OPC? sentinel after %s, dropping learned shape", cmd)
+        self.sentinel_missing(cmd)
+        return text, False
+
+    def add_responses(self, responses: List[str], raw: bytes, end: str,
+                      key: Optional[str] = None) -> None:
+        """
+        Split one line read for a compound query into responses. A line
+        that needed the quiet timeout teaches the framer to add a sentinel
+        to message key.
+        """
+        if key is not None and end == READ_QUIET_TIMEOUT:
+            self.learn(key, b"")
+        for line in raw.decode("ascii", errors="replace").strip().splitlines():
+            responses.extend(split_response(line))
+
+    def stats(self) -> dict:
+        """Read completion counters and the worst quiet-timeout offenders."""
+        top = sorted(self.quiet_by_command.items(), key=lambda kv: -kv[1])[:10]
+        return {
+            "reads": dict(self.counts),
+            "quiet_timeouts": self.counts[READ_QUIET_TIMEOUT],
+            "quiet_timeouts_by_command": dict(top),
+            "learned_shapes": {cmd: shape.kind for cmd, shape in self.shapes.items()},
+        }
+
+
+class SCPIBatch:
+    """
+    Queue of commands flushed as compound IEEE 488.2 program messages.
+
+    Created by SCPISocket.batch(). While the batch is open, SCPISocket.write()
+    calls are queued instead of sent. Queries are queued with query(), which
+    returns the index of the response in `results` once the batch is flushed.
+    Callbacks registered with on_flush() run once the batch has been sent,
+    or are discarded if it never is.
+    """
+
+    def __init__(self, sock: "SCPISocket"):
+        self._sock = sock
+        self._commands: List[Tuple[str, bool]] = []  # (command, is_query)
+        self._staged: List[Tuple[Callable[[], None], Optional[Callable[[], None]]]] = []
+        self.results: List[str] = []
+
+    def write(self, cmd: str) -> None:
+        """Queue a command (no response expected)."""
+        self._commands.append((cmd, False))
+
+    def query(self, cmd: str) -> int:
+        """Queue a query. Return its index into `results`."""
+        self._commands.append((cmd, True))
+        return sum(1 for _, is_query in self._commands if is_query) - 1
+
+    def on_flush(self, apply: Callable[[], None],
+                 discard: Optional[Callable[[], None]] = None) -> None:
+        """
+        Run apply() after the batch has been sent, in registration order.
+
+        If the batch is abandoned (the block raises or the send fails),
+        discard() is called instead.
+        """
+        self._staged.append((apply, discard))
+
+    def abort(self) -> None:
+        """Drop the queued commands and run the discard callbacks."""
+        staged, self._staged = self._staged, []
+        self._commands = []
+        for _, discard in staged:
+            if discard is not None:
+                discard()
+
+    def __len__(self) -> int:
+        return len(self._commands)
+
+    def _messages(self) -> List[List[Tuple[str, bool]]]:
+        """Group queued commands into messages no longer than MAX_MESSAGE_LEN."""
+        messages = []
+        current: List[Tuple[str, bool]] = []
+        length = 0
+        for cmd, is_query in self._commands:
+            if current and length + len(cmd) + 1 > MAX_MESSAGE_LEN:
+                messages.append(current)
+                current = []
+                length = 0
+            current.append((cmd, is_query))
+            length += len(cmd) + 1
+        if current:
+            messages.append(current)
+        return messages
+
+    def _plan(self) -> List[Tuple[str, int, str, bool, bool]]:
+        """
+        Build the program messages to send for the queued commands.
+
+        Returns (message, n_queries, key, sentinel, sync) tuples: key is the
+        framer key of the message, sentinel means *OPC? was appended to
+        frame a reply that previously needed the quiet timeout, and sync
+        means *OPC? was appended to a write-only message in "opc" mode.
+        """
+        opc_mode = self._sock.policy.mode == PACING_OPC
+        framer = self._sock.framer
+        plan = []
+        for message in self._messages():
+            cmds = [cmd for cmd, _ in message]
+            key = ";".join(cmds)
+            n_queries = sum(1 for _, is_query in message if is_query)
+            sentinel = n_queries > 0 and framer.shape_for(key) is not None
+            sync = opc_mode and n_queries == 0
+            if sync or sentinel:
+                cmds.append(SENTINEL_QUERY)
+            plan.append((";".join(cmds), n_queries, key, sentinel, sync))
+        return plan
+
+    def flush(self) -> List[str]:
+        """Send all queued commands and collect query responses."""
+        for message, n_queries, key, sentinel, sync in self._plan():
+            self._sock._paced_send(message)
+            logger.debug("BATCH: %s", message)
+            if sentinel:
+                self.results.extend(
+                    self._sock._read_responses(n_queries + 1, key, _SENTINEL_SHAPE)[:-1])
+            elif n_queries:
+                self.results.extend(self._sock._read_responses(n_queries, key))
+            elif sync:
+                self._sock._recv_until(complete=_opc_done)
+        return self._sent()
+
+    def _sent(self) -> List[str]:
+        """Clear the queue once flushed and run the on_flush() callbacks."""
+        self._commands = []
+        staged, self._staged = self._staged, []
+        for apply, _ in staged:
+            apply()
+        return self.results
+
+
 class SCPISocket:
     """
     Raw TCP socket SCPI transport for Rigol instruments.
@@ -59,17 +497,48 @@ class SCPISocket:
     1. 50 ms pacing between commands (silent drops without it)
     2. Quiet timeout for responses missing trailing newline
     3. IEEE 488.2 definite-length block data parsing
+
+    Pacing is governed by a PacingPolicy. The default "gap" mode only
+    sleeps for whatever is left of the minimum gap since the previous
+    send, so time spent reading responses counts towards the gap.
+
+    Response framing is tracked by a ResponseFramer: once a query's reply
+    has needed the quiet timeout, its shape is learned and later replies
+    complete as soon as they match it (or as soon as an appended *OPC?
+    sentinel answers), and quiet-timeout hits are counted.
+
+    `cache` holds instrument state that drivers derive from queries (such
+    as the MSO8204 waveform preamble). Drivers are created per call, so
+    the cache lives on the connection; it starts empty on every connect
+    and is cleared by reset().
     """
 
     def __init__(self, ip: str, port: int = DEFAULT_PORT,
                  timeout: float = DEFAULT_TIMEOUT,
-                 pacing: float = PACING_DELAY):
+                 pacing: float = PACING_DELAY,
+                 policy: Optional[PacingPolicy] = None,
+                 framer: Optional[ResponseFramer] = None):
+        if policy is None:
+            policy = PacingPolicy(PACING_GAP, pacing)
+        if policy.mode not in PACING_MODES:
+            raise ValueError(f"Unknown pacing mode: {policy.mode}")
         self.ip = ip
         self.port = port
         self.timeout = timeout
-        self.pacing = pacing
+        self.policy = policy
         self._sock: Optional[socket.socket] = None
         self._idn: Optional[str] = None
+        self._last_send = 0.0
+        self._batch: Optional[SCPIBatch] = None
+        self.framer = framer or ResponseFramer()
+        self.cache: Dict[str, Any] = {}
+        self._read_end = READ_TERMINATED
+        self._queued = 0  # replies requested with send_query() and not yet read
+
+    @property
+    def pacing(self) -> float:
+        """Minimum inter-command gap in seconds."""
+        return self.policy.min_gap
 
     # ---- Connection management ----
 
@@ -78,6 +547,8 @@ class SCPISocket:
         if self._sock is not None:
             self.close()
 
+        self.cache.clear()
+        self._queued = 0
         self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self._sock.settimeout(self.timeout)
 
@@ -134,6 +605,21 @@ class SCPISocket:
 
     # ---- Low-level transport ----
 
+    def _pace(self) -> None:
+        """Wait out the remainder of the minimum gap since the last send."""
+        wait = self.policy.delay_before_send(self._last_send, time.monotonic())
+        if wait > 0:
+            time.sleep(wait)
+
+    def _paced_send(self, cmd: str) -> None:
+        """Send one command line, applying the pacing policy."""
+        self._pace()
+        self._send((cmd + "\n").encode())
+        self._last_send = time.monotonic()
+        after = self.policy.delay_after_send()
+        if after:
+            time.sleep(after)
+
     def _send(self, data: bytes) -> None:
         """Send raw bytes."""
         if self._sock is None:
@@ -145,160 +631,377 @@ class SCPISocket:
             raise SCPIConnectionError(f"Send failed: {e}")
 
     def _recv_until(self, terminator: bytes = b"\n",
-                    max_bytes: int = 65536) -> bytes:
+                    max_bytes: int = 65536,
+                    complete: Optional[Callable[[bytes], bool]] = None) -> bytes:
         """
-        Read until terminator or quiet timeout.
+        Read until terminator, complete(buf) or quiet timeout.
 
         Phase 1: Wait up to self.timeout for first byte.
         Phase 2: Once data arrives, use QUIET_TIMEOUT for subsequent reads.
                  If no data within QUIET_TIMEOUT, response is complete.
+
+        Completion is decided by a ReplyReader. How the read ended is left
+        in self._read_end and counted by the framer.
         """
         if self._sock is None:
             raise SCPIConnectionError("Not connected")
 
-        buf = b""
-        while terminator not in buf:
-            if len(buf) > max_bytes:
-                raise SCPIError(
-                    f"Response exceeded {max_bytes} bytes without terminator")
-            timeout = QUIET_TIMEOUT if buf else self.timeout
-            self._sock.settimeout(timeout)
+        reader = ReplyReader(terminator, max_bytes, complete)
+        while True:
+            self._sock.settimeout(reader.timeout(self.timeout))
             try:
-                chunk = self._sock.recv(4096)
+                chunk = self._sock.recv(RECV_CHUNK)
             except socket.timeout:
-                if buf:
-                    break  # quiet after data = response complete
+                if reader.quiet():
+                    break
                 self._sock = None  # Bug fix: null socket on timeout to trigger reconnect
                 raise SCPITimeoutError(
                     f"Read timed out after {self.timeout}s (no data received)")
             if not chunk:
-                if buf:
+                if reader.closed():
                     break
                 self._sock = None  # Bug fix: null socket on close to trigger reconnect
                 raise SCPIConnectionError("Connection closed by instrument")
-            buf += chunk
+            if reader.feed(chunk):
+                break
 
-        return buf
+        self._read_end = reader.end
+        self.framer.record(reader.end)
+        return bytes(reader.buf)
 
-    def _recv_exact(self, n: int) -> bytes:
-        """Read exactly n bytes from socket."""
+    def _read_responses(self, n: int, key: Optional[str] = None,
+                        shape: Optional[ReplyShape] = None) -> List[str]:
+        """
+        Read n ';'-separated responses to a compound query.
+
+        Most instruments answer with one line joining all responses; some
+        terminate each response individually, so keep reading lines until
+        n responses have been collected. A line that needed the quiet
+        timeout teaches the framer to add a sentinel to message key.
+        """
+        complete = shape.complete if shape is not None else None
+        responses: List[str] = []
+        while len(responses) < n:
+            raw = self._recv_until(complete=complete)
+            self.framer.add_responses(responses, raw, self._read_end, key)
+        if len(responses) != n:
+            raise SCPIError(
+                f"Expected {n} responses to compound query, got {len(responses)}")
+        return responses
+
+    def flush_input(self, quiet: float = QUIET_TIMEOUT, limit: Optional[float] = None) -> int:
+        """
+        Discard unread input until the line has been quiet for `quiet` s.
+
+        Resynchronises the connection after replies were left unread, such
+        as pipelined blocks whose reader failed. If data keeps arriving for
+        `limit` seconds (default: the socket timeout) the connection is
+        closed instead, so the pool reconnects on next use.
+
+        Returns:
+            Number of bytes discarded
+        """
         if self._sock is None:
             raise SCPIConnectionError("Not connected")
-
-        buf = b""
-        remaining = n
-        while remaining > 0:
+        deadline = time.monotonic() + (limit if limit is not None else self.timeout)
+        discarded = 0
+        self._sock.settimeout(quiet)
+        while True:
             try:
-                chunk = self._sock.recv(min(remaining, 65536))
+                chunk = self._sock.recv(RECV_CHUNK)
             except socket.timeout:
-                self._sock = None  # Bug fix: null socket on timeout to trigger reconnect
-                raise SCPITimeoutError(
-                    f"Read timed out. Expected {n} bytes, received {len(buf)}.")
+                break
             if not chunk:
                 self._sock = None  # Bug fix: null socket on close to trigger reconnect
-                raise SCPIConnectionError(
-                    f"Socket closed during read. Expected {n} bytes, got {len(buf)}.")
-            buf += chunk
-            remaining -= len(chunk)
-
-        return buf
-
-    def _recv_block(self) -> bytes:
-        """
-        Read IEEE 488.2 definite-length block data.
+                raise SCPIConnectionError("Connection closed by instrument")
+            discarded += len(chunk)
+            if time.monotonic() > deadline:
+                self.close()
+                raise SCPITimeoutError(
+                    f"Input still arriving after {discarded} bytes discarded; connection closed")
+        self._sock.settimeout(self.timeout)
+        self._queued = 0
+        if discarded:
+            logger.info("Discarded %d unread bytes", discarded)
+        return discarded
 
-        Format: #<d><count><payload>
-        """
+    def _recv_into(self, view: memoryview, what: str = "read") -> None:
+        """Fill view completely from the socket using recv_into (no copies)."""
         if self._sock is None:
             raise SCPIConnectionError("Not connected")
 
-        # Read '#'
         self._sock.settimeout(self.timeout)
-        header = b""
-        while len(header) < 2:
+        total = len(view)
+        received = 0
+        while received < total:
             try:
-                chunk = self._sock.recv(2 - len(header))
+                n = self._sock.recv_into(view[received:], min(total - received, RECV_CHUNK))
             except socket.timeout:
-                self._sock = None  # Bug fix: null socket on timeout
-                raise SCPITimeoutError("Timeout reading block header")
-            if not chunk:
-                self._sock = None  # Bug fix: null socket on close
-                raise SCPIConnectionError("Connection closed reading block header")
-            header += chunk
-
-        if header[0:1] != b"#":
-            raise SCPIError(f"Expected '#' block header, got: {header!r}")
+                self._sock = None  # Bug fix: null socket on timeout to trigger reconnect
+                raise SCPITimeoutError(
+                    f"Timeout during {what} ({received}/{total} bytes)")
+            if n == 0:
+                self._sock = None  # Bug fix: null socket on close to trigger reconnect
+                raise SCPIConnectionError(
+                    f"Connection closed during {what} ({received}/{total} bytes)")
+            received += n
 
-        d = int(header[1:2])
-        if d == 0:
-            raise SCPIError("Indefinite-length block not supported")
+    def _recv_exact(self, n: int) -> bytearray:
+        """Read exactly n bytes from socket."""
+        buf = bytearray(n)
+        self._recv_into(memoryview(buf))
+        return buf
 
-        # Read count digits
-        count_buf = b""
-        while len(count_buf) < d:
-            try:
-                chunk = self._sock.recv(d - len(count_buf))
-            except socket.timeout:
-                self._sock = None  # Bug fix: null socket on timeout
-                raise SCPITimeoutError("Timeout reading block count")
-            if not chunk:
-                self._sock = None  # Bug fix: null socket on close
-                raise SCPIConnectionError("Connection closed reading block count")
-            count_buf += chunk
+    def _read_block_header(self, length: Optional[int] = None) -> int:
+        """
+        Read an IEEE 488.2 definite-length block header.
 
-        payload_len = int(count_buf)
+        Format: #<d><count>. Returns the payload length. An indefinite-
+        length header (#0, as Keithley TSP binary output uses) is accepted
+        only when the caller knows the payload length.
+        """
+        d = block_header_digits(self._recv_exact(2))
+        payload_len = block_length(self._recv_exact(d) if d else b"", length)
         logger.debug("Block data: %d bytes expected", payload_len)
+        return payload_len
 
-        # Read payload
-        payload = b""
-        while len(payload) < payload_len:
-            remaining = payload_len - len(payload)
-            try:
-                chunk = self._sock.recv(min(remaining, 65536))
-            except socket.timeout:
-                self._sock = None  # Bug fix: null socket on timeout
-                raise SCPITimeoutError(
-                    f"Timeout during block read ({len(payload)}/{payload_len} bytes)")
-            if not chunk:
-                self._sock = None  # Bug fix: null socket on close
-                raise SCPIConnectionError(
-                    f"Connection closed during block read "
-                    f"({len(payload)}/{payload_len} bytes)")
-            payload += chunk
+    def _consume_block_terminator(self) -> None:
+        """
+        Consume the newline after block data, if the instrument sends one.
 
-        # Consume trailing newline if present
-        self._sock.settimeout(0.2)
+        The next byte is peeked and dropped only if it is the newline, so
+        a pipelined reply that follows directly keeps its '#'. When another
+        reply has been requested, the peek returns as soon as either one
+        arrives; otherwise it gives up after 0.2 s.
+        """
+        self._sock.settimeout(self.timeout if self._queued else 0.2)
         try:
-            self._sock.recv(1)
+            if self._sock.recv(1, socket.MSG_PEEK) == b"\n":
+                self._sock.recv(1)
         except socket.timeout:
             pass
+        finally:
+            self._sock.settimeout(self.timeout)
+
+    def _recv_block(self) -> bytearray:
+        """
+        Read IEEE 488.2 definite-length block data.
+
+        Format: #<d><count><payload>
 
+        The payload is received straight into a preallocated bytearray.
+        """
+        payload = bytearray(self._read_block_header())
+        self._recv_into(memoryview(payload), "block read")
+        self._consume_block_terminator()
         return payload
 
+    def _recv_block_into(self, buf, length: Optional[int] = None) -> int:
+        """
+        Read IEEE 488.2 block data into a caller-supplied writable buffer.
+
+        Returns the payload length. If the payload does not fit, it is
+        drained from the socket and SCPIError is raised. length is the
+        expected size of an indefinite-length (#0) block.
+        """
+        view = memoryview(buf).cast("B")
+        payload_len = self._read_block_header(length)
+        if payload_len > len(view):
+            scratch = memoryview(bytearray(min(payload_len, RECV_CHUNK)))
+            remaining = payload_len
+            while remaining > 0:
+                n = min(remaining, len(scratch))
+                self._recv_into(scratch[:n], "block drain")
+                remaining -= n
+            self._consume_block_terminator()
+            raise SCPIError(
+                f"Block payload ({payload_len} bytes) exceeds buffer ({len(view)} bytes)")
+        self._recv_into(view[:payload_len], "block read")
+        self._consume_block_terminator()
+        return payload_len
+
     # ---- SCPI commands ----
 
     def write(self, cmd: str) -> None:
-        """Send a SCPI command (no response expected). Applies pacing delay."""
-        self._send((cmd + "\n").encode())
-        time.sleep(self.pacing)
+        """
+        Send a SCPI command (no response expected). Applies pacing policy.
+
+        In "opc" mode the command is followed by *OPC? in the same message
+        and the call returns once the instrument has processed it. Inside
+        batch() the command is queued instead of sent.
+        """
+        if self._batch is not None:
+            self._batch.write(cmd)
+            return
+        message, wait = self.policy.frame_write(cmd)
+        self._paced_send(message)
+        if wait:
+            self._recv_until(complete=_opc_done)
         logger.debug("WRITE: %s", cmd)
 
     def query(self, cmd: str) -> str:
-        """Send a SCPI query and return the text response (stripped)."""
-        self._send((cmd + "\n").encode())
-        time.sleep(self.pacing)
-        response = self._recv_until().decode("ascii", errors="replace").strip()
+        """
+        Send a SCPI query and return the text response (stripped).
+
+        If the reply to cmd has previously arrived unterminated, a block
+        reply is read until its declared length; any other reply gets a
+        *OPC? sentinel appended to the query so its end is unambiguous.
+        """
+        self._check_not_batching(cmd)
+        message, complete, sentinel = self.framer.frame_query(cmd)
+        self._paced_send(message)
+        raw = self._recv_until(complete=complete)
+        response, opc_pending = self.framer.finish_query(cmd, raw, self._read_end, sentinel)
+        if opc_pending:
+            self._recv_until(complete=_opc_done)  # Sentinel answered as a separate line
         logger.debug("QUERY: %s -> %s", cmd, response[:80] if len(response) > 80 else response)
         return response
 
-    def query_block(self, cmd: str) -> bytes:
+    def query_block(self, cmd: str) -> bytearray:
         """Send a SCPI query and return IEEE 488.2 block data (binary)."""
-        self._send((cmd + "\n").encode())
-        time.sleep(self.pacing)
+        self._check_not_batching(cmd)
+        self._paced_send(cmd)
         data = self._recv_block()
         logger.debug("BLOCK: %s -> %d bytes", cmd, len(data))
         return data
 
+    def query_block_into(self, cmd: str, buf) -> int:
+        """
+        Send a SCPI query and read its block payload into buf.
+
+        buf is any writable buffer (bytearray, memoryview, numpy array)
+        and can be reused across captures. Returns the payload length;
+        only the first that many bytes of buf are valid.
+        """
+        self._check_not_batching(cmd)
+        self._paced_send(cmd)
+        n = self._recv_block_into(buf)
+        logger.debug("BLOCK: %s -> %d bytes (into buffer)", cmd, n)
+        return n
+
+    def send_query(self, cmd: str) -> None:
+        """
+        Send a query without reading its response.
+
+        Lets a caller request the next block while it is still processing
+        the previous one; collect the reply with read_block_into().
+        """
+        self._check_not_batching(cmd)
+        self._paced_send(cmd)
+        self._queued += 1
+
+    def read_block_into(self, buf, length: Optional[int] = None) -> int:
+        """
+        Read the block reply to a query sent with send_query() into buf.
+
+        length is needed only for indefinite-length (#0) replies.
+        """
+        self._queued = max(self._queued - 1, 0)
+        return self._recv_block_into(buf, length)
+
+    def query_many(self, cmds: List[str]) -> List[str]:
+        """
+        Send several queries in one compound message and return the responses.
+
+        The queries are joined with ';' and the combined reply is split back
+        into one stripped response per query, in order.
+        """
+        if not cmds:
+            return []
+        self._check_not_batching(cmds[0])
+        batch = SCPIBatch(self)
+        for cmd in cmds:
+            batch.query(cmd)
+        responses = batch.flush()
+        logger.debug("QUERY_MANY: %d queries", len(cmds))
+        return responses
+
+    def _check_not_batching(self, cmd: str) -> None:
+        if self._batch is not None:
+            raise SCPIError(
+                f"Cannot query '{cmd}' inside batch(); use batch.query() instead")
+
+    @contextmanager
+    def batch(self) -> Iterator[SCPIBatch]:
+        """
+        Coalesce commands into one compound program message.
+
+        Writes issued inside the block are joined with ';' and sent with a
+        single sendall when the block exits; queries queued with
+        batch.query() are answered in the same round-trip and split back
+        into batch.results. Nested batches join the outer batch. Nothing
+        is sent if the block raises, and the batch's on_flush() callbacks
+        are discarded if the block raises or the send fails.
+        """
+        if self._batch is not None:
+            yield self._batch
+            return
+        batch = SCPIBatch(self)
+        self._batch = batch
+        try:
+            yield batch
+        except BaseException:
+            self._batch = None
+            batch.abort()
+            raise
+        self._batch = None
+        try:
+            batch.flush()
+        except BaseException:
+            batch.abort()
+            raise
+
+    @property
+    def batching(self) -> Optional[SCPIBatch]:
+        """The batch currently open on this socket, if any."""
+        return self._batch
+
+    def query_block_stream(self, cmd: str, sink,
+                           progress: Optional[Callable[[int, int], None]] = None,
+                           chunk_size: int = RECV_CHUNK) -> int:
+        """
+        Send a SCPI query and stream its block payload to a sink.
+
+        The payload is never held in memory as a whole: it is received in
+        chunks of up to chunk_size bytes into one reused buffer and passed
+        on as each chunk completes.
+
+        Args:
+            cmd: SCPI query returning IEEE 488.2 block data
+            sink: File-like object (has write()), hash object (has update())
+                  or callable taking a memoryview. Chunk views are only
+                  valid for the duration of the call.
+            progress: Optional callback(received_bytes, total_bytes)
+            chunk_size: Maximum bytes per chunk
+
+        Returns:
+            Payload length in bytes.
+        """
+        if hasattr(sink, "write"):
+            emit = sink.write
+        elif hasattr(sink, "update"):
+            emit = sink.update
+        elif callable(sink):
+            emit = sink
+        else:
+            raise TypeError("sink must have write() or update(), or be callable")
+
+        self._check_not_batching(cmd)
+        self._paced_send(cmd)
+        total = self._read_block_header()
+        view = memoryview(bytearray(min(chunk_size, max(total, 1))))
+        received = 0
+        while received < total:
+            n = min(total - received, len(view))
+            self._recv_into(view[:n], "block stream")
+            emit(view[:n])
+            received += n
+            if progress is not None:
+                progress(received, total)
+        self._consume_block_terminator()
+        logger.debug("BLOCK STREAM: %s -> %d bytes", cmd, total)
+        return total
+
     def query_opc(self) -> bool:
         """Wait for *OPC? to return '1'."""
         resp = self.query("*OPC?")
@@ -308,6 +1011,7 @@ class SCPISocket:
 
     def reset(self) -> None:
         """Send *RST, wait for OPC, drain error queue."""
+        self.cache.clear()
         self.write("*RST")
         time.sleep(1.0)  # RST needs settling time
         self.query_opc()
@@ -360,11 +1064,10 @@ class SCPISocket:
 
         for cmd in commands:
             try:
-                data = self.query_block(cmd)
                 with open(filename, "wb") as f:
-                    f.write(data)
-                logger.info("Screenshot saved: %s (%d bytes)", filename, len(data))
-                return len(data)
+                    size = self.query_block_stream(cmd, f)
+                logger.info("Screenshot saved: %s (%d bytes)", filename, size)
+                return size
             except SCPIError:
                 logger.debug("Screenshot command failed: %s", cmd)
                 continue
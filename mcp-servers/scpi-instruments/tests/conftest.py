@@ -0,0 +1,118 @@
+"""
+Pytest fixtures for SCPI instruments testing.
+
+No instrument is needed: transport tests run an SCPISocket over one end
+of a socketpair, with the test playing the instrument on the other end.
+"""
+
+import os
+import socket
+import sys
+import threading
+import time
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scpi_transport
+from scpi_transport import PacingPolicy, SCPISocket, PACING_GAP
+
+
+class Wire:
+    """An SCPISocket connected to a scripted peer through a socketpair."""
+
+    def __init__(self, policy: PacingPolicy):
+        self.sock = SCPISocket("127.0.0.1", policy=policy, timeout=2.0)
+        self.sock._sock, self.peer = socket.socketpair()
+        self.peer.settimeout(2.0)
+
+    def reply(self, data: bytes) -> None:
+        """Queue bytes for the SCPISocket to read."""
+        self.peer.sendall(data)
+
+    def sent(self) -> str:
+        """Everything the SCPISocket has sent so far."""
+        self.peer.settimeout(0.05)
+        chunks = []
+        try:
+            while True:
+                chunk = self.peer.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+        except socket.timeout:
+            pass
+        finally:
+            self.peer.settimeout(2.0)
+        return b"".join(chunks).decode()
+
+    def script(self, *replies) -> "ScriptedPeer":
+        """Answer from now on with replies; see ScriptedPeer."""
+        peer = ScriptedPeer(self.peer, list(replies))
+        peer.start()
+        return peer
+
+    def close(self) -> None:
+        self.sock.close()
+        self.peer.close()
+
+
+class ScriptedPeer(threading.Thread):
+    """
+    Plays an instrument that answers as commands arrive.
+
+    Each received line is recorded in lines and answered with the reply
+    of the first (substring, reply) pair it contains; other lines get no
+    answer. Needed when replies must not arrive before their command.
+    """
+
+    def __init__(self, peer: socket.socket, replies):
+        super().__init__(daemon=True)
+        self.peer = peer
+        self.replies = replies
+        self.lines = []
+
+    def run(self) -> None:
+        buf = b""
+        while True:
+            try:
+                chunk = self.peer.recv(65536)
+            except OSError:
+                return
+            if not chunk:
+                return
+            buf += chunk
+            while b"\n" in buf:
+                line, buf = buf.split(b"\n", 1)
+                self.lines.append(line.decode())
+                for key, reply in self.replies:
+                    if key in self.lines[-1]:
+                        self.peer.sendall(reply)
+                        break
+
+    def wait_for(self, line: str, timeout: float = 2.0) -> bool:
+        """Wait until line has been received; return whether it was."""
+        deadline = time.monotonic() + timeout
+        while line not in self.lines:
+            if time.monotonic() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+
+@pytest.fixture
+def quiet_timeout(monkeypatch):
+    """Shorten the quiet timeout so unterminated replies end quickly."""
+    monkeypatch.setattr(scpi_transport, "QUIET_TIMEOUT", 0.05)
+    return 0.05
+
+
+@pytest.fixture
+def wire(quiet_timeout):
+    """SCPISocket over a socketpair, with no pacing delay."""
+    w = Wire(PacingPolicy(PACING_GAP, 0.0))
+    yield w
+    w.close()
+
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Acquisition Stream Test Suite
+
+Covers the RingBuffer that holds streamed captures.
+
+Usage:
+    pytest tests/test_acquisition_stream.py -v
+"""
+
+import numpy as np
+import pytest
+
+from acquisition_stream import RingBuffer
+
+
+def segment(value, points=4):
+    return np.full(points, value, dtype=np.float32)
+
+
+class TestRingBuffer:
+    """Fixed-capacity segment ring with sequence numbers."""
+
+    def test_rejects_zero_capacity(self):
+        with pytest.raises(ValueError):
+            RingBuffer(0)
+
+    def test_empty(self):
+        ring = RingBuffer(4)
+        seqs, stamps, data = ring.pull()
+        assert ring.shape is None and len(ring) == 0
+        assert seqs.size == 0 and stamps.size == 0 and data.shape == (0,)
+
+    def test_pull_in_order(self):
+        ring = RingBuffer(4)
+        for i in range(3):
+            assert ring.push(segment(i), 10.0 + i) == i
+        assert ring.shape == (4,) and len(ring) == 3
+        seqs, stamps, data = ring.pull()
+        np.testing.assert_array_equal(seqs, [0, 1, 2])
+        np.testing.assert_array_equal(stamps, [10.0, 11.0, 12.0])
+        np.testing.assert_array_equal(data[:, 0], [0, 1, 2])
+        assert len(ring) == 0
+
+    def test_pull_limited(self):
+        ring = RingBuffer(4)
+        for i in range(3):
+            ring.push(segment(i), i)
+        assert ring.pull(max_segments=2)[0].tolist() == [0, 1]
+        assert ring.pull()[0].tolist() == [2]
+
+    def test_overwrite_counts_dropped(self):
+        ring = RingBuffer(3)
+        for i in range(5):
+            ring.push(segment(i), i)
+        seqs, _, data = ring.pull()
+        assert seqs.tolist() == [2, 3, 4]
+        np.testing.assert_array_equal(data[:, 0], [2, 3, 4])
+        assert ring.stats()["dropped"] == 2
+
+    def test_pulled_data_is_a_copy(self):
+        ring = RingBuffer(2)
+        ring.push(segment(1), 0)
+        _, _, data = ring.pull()
+        ring.push(segment(2), 1)
+        ring.push(segment(3), 2)
+        assert data[0, 0] == 1
+
+    def test_latest_does_not_consume(self):
+        ring = RingBuffer(4)
+        for i in range(3):
+            ring.push(segment(i), i)
+        ring.pull()
+        seqs, _, data = ring.latest(2)
+        assert seqs.tolist() == [1, 2] and data[:, 0].tolist() == [1, 2]
+        assert len(ring) == 0
+
+    def test_shape_mismatch_padded_or_truncated(self):
+        ring = RingBuffer(4)
+        ring.push(segment(1, points=4), 0)
+        ring.push(segment(2, points=2), 1)
+        ring.push(segment(3, points=6), 2)
+        _, _, data = ring.pull()
+        assert data.shape == (3, 4)
+        np.testing.assert_array_equal(data[1, :2], [2, 2])
+        assert np.isnan(data[1, 2:]).all()
+        np.testing.assert_array_equal(data[2], [3, 3, 3, 3])
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Base Instrument Test Suite
+
+Covers setting comparison and the shadow state BaseInstrument keeps on
+the connection cache, over a socketpair (see conftest.Wire).
+
+Usage:
+    pytest tests/test_base.py -v
+"""
+
+import pytest
+
+from instruments import MSO8204, RSA5065N
+from instruments.base import _same_setting
+
+
+class TestSameSetting:
+    """Written values match their read-back spellings."""
+
+    @pytest.mark.parametrize("written,read", [
+        (1000, "1.000000E+03"),
+        ("ON", "1"),
+        ("OFF", "0"),
+        ("CHANnel1", "CHAN1"),
+        ("dc", '"DC"'),
+        (0.001, "1.0E-3"),
+    ])
+    def test_same(self, written, read):
+        assert _same_setting(read, written)
+
+    @pytest.mark.parametrize("written,read", [
+        (1000, "1.000001E+03"),
+        ("ON", "0"),
+        ("CHANnel1", "CHAN2"),
+    ])
+    def test_different(self, written, read):
+        assert not _same_setting(read, written)
+
+
+class TestShadow:
+    """Shadow state kept by BaseInstrument on the connection cache."""
+
+    SCALE = ":CHANnel1:SCALe"
+
+    def test_write_setting_skips_known_value(self, wire):
+        scope = MSO8204(wire.sock)
+        assert scope.write_setting(self.SCALE, 1)
+        assert not scope.write_setting(self.SCALE, "1.000000E+00")
+        assert wire.sent() == ":CHANnel1:SCALe 1\n"
+
+    def test_read_settings_queries_missing_once(self, wire):
+        scope = MSO8204(wire.sock)
+        wire.reply(b"5.0E-1\n")
+        assert scope.read_setting(self.SCALE) == "5.0E-1"
+        assert scope.read_setting(self.SCALE) == "5.0E-1"
+        assert wire.sent() == ":CHANnel1:SCALe?\n"
+
+    def test_raw_write_is_written_through(self, wire):
+        scope = MSO8204(wire.sock)
+        scope.remember(self.SCALE, "1")
+        scope.write(f"{self.SCALE} 2;:CHANnel1:OFFSet 0")
+        assert scope.shadow == {self.SCALE: "2"}
+
+    def test_reset_forgets_everything(self, wire):
+        scope = MSO8204(wire.sock)
+        scope.remember(self.SCALE, "1")
+        scope.write("*RST")
+        assert scope.shadow == {}
+
+    def test_autoscale_forgets_prefixes(self, wire):
+        scope = MSO8204(wire.sock)
+        scope.remember(self.SCALE, "1")
+        scope.remember(":ACQuire:TYPE", "NORM")
+        scope.write(":AUToscale")
+        assert scope.shadow == {":ACQuire:TYPE": "NORM"}
+
+    def test_batch_staged_until_flush(self, wire):
+        scope = MSO8204(wire.sock)
+        scope.remember(self.SCALE, "1")
+        with scope.batch():
+            scope.write_setting(self.SCALE, 2)
+            assert self.SCALE not in scope.shadow
+        assert scope.shadow == {self.SCALE: "2"}
+        assert wire.sent() == ":CHANnel1:SCALe 2\n"
+
+    def test_batch_abort_leaves_setting_unknown(self, wire):
+        scope = MSO8204(wire.sock)
+        scope.remember(self.SCALE, "1")
+        with pytest.raises(RuntimeError):
+            with scope.batch():
+                scope.write_setting(self.SCALE, 2)
+                raise RuntimeError("abandon")
+        assert self.SCALE not in scope.shadow
+        assert wire.sent() == ""
+
+    def test_batch_abort_discards_remember(self, wire):
+        scope = MSO8204(wire.sock)
+        with pytest.raises(RuntimeError):
+            with scope.batch():
+                scope.remember(":TIMebase:SCALe", "1e-3")
+                raise RuntimeError("abandon")
+        assert scope.shadow == {}
+
+    def test_forget_after_staged_value(self, wire):
+        scope = MSO8204(wire.sock)
+        with scope.batch():
+            scope.write_setting(self.SCALE, 2)
+            scope.write("*RST")
+        assert scope.shadow == {}
+
+    def test_trace_format_staged_on_outer_batch(self, wire):
+        analyzer = RSA5065N(wire.sock)
+        with pytest.raises(RuntimeError):
+            with analyzer.batch():
+                analyzer.set_trace_format("ASCII")
+                raise RuntimeError("abandon")
+        assert "rsa5065n.trace_format" not in wire.sock.cache
+        with analyzer.batch():
+            analyzer.set_trace_format("ASCII")
+        assert wire.sock.cache["rsa5065n.trace_format"] == "ASCII"
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Connection Pool Test Suite
+
+Covers the per-instrument circuit breaker and locking with a fake clock
+and a fake socket whose connect() fails on demand.
+
+Usage:
+    pytest tests/test_connection_pool.py -v
+"""
+
+import threading
+
+import pytest
+
+import connection_pool
+from connection_pool import (
+    BREAKER_BACKOFF,
+    BREAKER_MAX_BACKOFF,
+    BREAKER_THRESHOLD,
+    CIRCUIT_CLOSED,
+    CIRCUIT_HALF_OPEN,
+    CIRCUIT_OPEN,
+    ConnectionPool,
+    InstrumentConfig,
+)
+from scpi_transport import SCPIConnectionError, SCPITimeoutError
+
+
+class FakeClock:
+    """Stands in for the time module: monotonic() only moves when told."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class FakeSocket:
+    """SCPISocket stand-in; FakeSocket.failure is raised by connect()."""
+
+    failure = None
+    attempts = 0
+
+    def __init__(self, ip, port, timeout, policy=None, framer=None):
+        self.framer = framer
+        self.connected = False
+
+    def connect(self) -> str:
+        FakeSocket.attempts += 1
+        if FakeSocket.failure is not None:
+            raise FakeSocket.failure
+        self.connected = True
+        return "RIGOL TECHNOLOGIES,DP932A,1,1.0"
+
+    def close(self) -> None:
+        self.connected = False
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(connection_pool, "time", fake)
+    return fake
+
+
+@pytest.fixture
+def pool(monkeypatch, clock):
+    monkeypatch.setattr(connection_pool, "SCPISocket", FakeSocket)
+    FakeSocket.failure = SCPIConnectionError("Connection refused by 10.0.0.1:5555")
+    FakeSocket.attempts = 0
+    return ConnectionPool({"psu": InstrumentConfig("psu", "10.0.0.1", instrument_type="dp932a")})
+
+
+def fail(pool, times):
+    return [pool.connect("psu") for _ in range(times)]
+
+
+class TestCircuitBreaker:
+    """Consecutive connect failures open the circuit."""
+
+    def test_closed_below_threshold(self, pool):
+        results = fail(pool, BREAKER_THRESHOLD - 1)
+        assert all(r["circuit"] == CIRCUIT_CLOSED for r in results)
+        assert FakeSocket.attempts == BREAKER_THRESHOLD - 1
+
+    def test_opens_at_threshold(self, pool):
+        results = fail(pool, BREAKER_THRESHOLD + 2)
+        assert results[BREAKER_THRESHOLD - 1]["circuit"] == CIRCUIT_OPEN
+        # Further connects fail fast without touching the network
+        assert FakeSocket.attempts == BREAKER_THRESHOLD
+        assert "Circuit open" in results[-1]["error"]
+
+    def test_idn_timeout_counts(self, pool):
+        FakeSocket.failure = SCPITimeoutError("Read timed out after 10.0s (no data received)")
+        results = fail(pool, BREAKER_THRESHOLD)
+        assert results[-1]["circuit"] == CIRCUIT_OPEN
+
+    def test_half_open_after_backoff(self, pool, clock):
+        fail(pool, BREAKER_THRESHOLD)
+        clock.advance(BREAKER_BACKOFF)
+        state = pool._connections["psu"]
+        assert pool._circuit(state) == CIRCUIT_HALF_OPEN
+        assert pool.status()["instruments"][0]["circuit"]["state"] == CIRCUIT_HALF_OPEN
+
+    def test_failed_probe_doubles_backoff(self, pool, clock):
+        fail(pool, BREAKER_THRESHOLD)
+        backoff = BREAKER_BACKOFF
+        while backoff < BREAKER_MAX_BACKOFF:
+            clock.advance(backoff)
+            result = pool.connect("psu")
+            assert result["circuit"] == CIRCUIT_OPEN
+            backoff = min(backoff * 2, BREAKER_MAX_BACKOFF)
+            assert pool._connections["psu"].backoff == backoff
+        clock.advance(backoff)
+        pool.connect("psu")
+        assert pool._connections["psu"].backoff == BREAKER_MAX_BACKOFF
+
+    def test_successful_probe_closes(self, pool, clock):
+        fail(pool, BREAKER_THRESHOLD)
+        clock.advance(BREAKER_BACKOFF)
+        FakeSocket.failure = None
+        result = pool.connect("psu")
+        assert result["connected"]
+        state = pool._connections["psu"]
+        assert state.error_count == 0 and pool._circuit(state) == CIRCUIT_CLOSED
+
+    def test_force_bypasses_open_circuit(self, pool):
+        fail(pool, BREAKER_THRESHOLD)
+        FakeSocket.failure = None
+        assert pool.connect("psu", force=True)["connected"]
+
+    def test_get_socket_raises_when_open(self, pool):
+        fail(pool, BREAKER_THRESHOLD)
+        with pytest.raises(SCPIConnectionError, match="Circuit open"):
+            pool.get_socket("psu")
+
+    def test_framer_survives_failures(self, pool):
+        fail(pool, 1)
+        framer = pool._connections["psu"].framer
+        FakeSocket.failure = None
+        pool.connect("psu")
+        assert pool._connections["psu"].framer is framer
+
+
+class TestInstrumentLock:
+    """Sockets are only closed between operations."""
+
+    @pytest.mark.parametrize("close", [
+        lambda pool: pool.disconnect_all(),
+        lambda pool: pool.register_instrument("psu", "10.0.0.2", instrument_type="dp932a"),
+    ])
+    def test_close_waits_for_operation(self, pool, close):
+        FakeSocket.failure = None
+        sock = pool.get_socket("psu")
+        closer = threading.Thread(target=close, args=(pool,))
+        with pool.instrument_lock("psu"):
+            closer.start()
+            closer.join(0.2)
+            assert closer.is_alive() and sock.connected
+        closer.join(2.0)
+        assert not closer.is_alive() and not sock.connected
+        assert "psu" not in pool._connections
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+DMM6500 TSP Test Suite
+
+Covers Lua argument formatting, script name checks and the output
+format kept across buffer downloads, over a socketpair (see conftest.Wire).
+
+Usage:
+    pytest tests/test_dmm6500_tsp.py -v
+"""
+
+import numpy as np
+import pytest
+
+from instruments import DMM6500_TSP
+from instruments.dmm6500_tsp import BINARY_RESTORE, RESERVED_SCRIPT_PREFIX, lua_args
+from scpi_transport import SCPITimeoutError
+
+
+class TestLuaArgs:
+    """Python values formatted as Lua arguments."""
+
+    def test_values(self):
+        assert lua_args(None, True, False, 10, 0.5, "dmm.FUNC_DC_VOLTAGE") == \
+            "nil, true, false, 10, 0.5, dmm.FUNC_DC_VOLTAGE"
+
+    def test_empty(self):
+        assert lua_args() == ""
+
+
+class TestScriptNames:
+    """User scripts may not shadow Lua or TSP globals."""
+
+    @pytest.mark.parametrize("name", [
+        "print", "format", "dmm", "end", "string", "_G",
+        f"{RESERVED_SCRIPT_PREFIX}lib", "1script", "my-script",
+    ])
+    def test_rejected(self, wire, name):
+        with pytest.raises(ValueError):
+            DMM6500_TSP(wire.sock).load_script(name, "x = 1")
+        assert wire.sent() == ""
+
+
+class TestOutputFormat:
+    """ASCII print() output is restored on every new connection."""
+
+    N_QUERY = "print(defbuffer1.n)"
+
+    def test_first_query_restores_ascii(self, wire):
+        dmm = DMM6500_TSP(wire.sock)
+        scripted = wire.script((self.N_QUERY, b"5\n"))
+        assert dmm.tsp_query("defbuffer1.n") == "5"
+        assert dmm.tsp_query("defbuffer1.n") == "5"
+        assert scripted.lines == [f"{BINARY_RESTORE} {self.N_QUERY}", self.N_QUERY]
+
+    def test_restored_after_download(self, wire):
+        dmm = DMM6500_TSP(wire.sock)
+        readings = np.array([1.5, 2.5], dtype=np.float32)
+        scripted = wire.script((self.N_QUERY, b"2\n"), ("printbuffer", b"#18" + readings.tobytes() + b"\n"))
+        result = dmm.buffer_download(chunk=10)
+        np.testing.assert_array_equal(result["readings"], readings)
+        dmm.tsp_query("defbuffer1.n")
+        assert scripted.lines[-2:] == [BINARY_RESTORE, self.N_QUERY]
+
+    def test_lost_connection_leaves_restore_pending(self, wire):
+        dmm = DMM6500_TSP(wire.sock)
+        wire.script((self.N_QUERY, b"2\n"), ("printbuffer", b"#18abc"))
+        wire.sock.timeout = 0.2
+        with pytest.raises(SCPITimeoutError):
+            dmm.buffer_download(chunk=10)
+        assert not wire.sock.connected
+        assert wire.sock.cache["dmm6500_tsp.format"] == "REAL32"
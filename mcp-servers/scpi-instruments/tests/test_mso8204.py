@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+MSO8204 Test Suite
+
+Covers measurement name resolution, waveform decoding and measurement
+reads over a socketpair (see conftest.Wire).
+
+Usage:
+    pytest tests/test_mso8204.py -v
+"""
+
+import numpy as np
+import pytest
+
+from instruments import MSO8204
+from instruments.mso8204 import decode_waveform, measure_name
+
+
+class TestMeasureName:
+    """Measurement names in any accepted spelling."""
+
+    @pytest.mark.parametrize("name,expected", [
+        ("VAMPlitude", "VAMPlitude"),
+        ("vamp", "VAMPlitude"),
+        ("RTIMe", "RISetime"),
+        ("ris", "RISetime"),
+        (" :vpp ", "VPP"),
+    ])
+    def test_known(self, name, expected):
+        assert measure_name(name) == expected
+
+    def test_unknown(self):
+        assert measure_name("rise") is None
+
+
+class TestDecodeWaveform:
+    """BYTE/WORD codes converted to volts."""
+
+    def test_byte(self):
+        volts = decode_waveform(bytes([0, 127, 255]), "BYTE", 0.01, 0, 127)
+        assert volts.dtype == np.float32
+        np.testing.assert_allclose(volts, [-1.27, 0.0, 1.28], rtol=1e-6)
+
+    def test_word_little_endian(self):
+        raw = np.array([100, 32868], dtype="<u2").tobytes()
+        volts = decode_waveform(raw, "word", 0.001, -32768, 0)
+        np.testing.assert_allclose(volts, [32.868, 65.636], rtol=1e-6)
+
+    def test_into_buffer(self):
+        out = np.empty(4, dtype=np.float32)
+        volts = decode_waveform(bytearray(b"\x00\x01\x02\x03"), "BYTE", 1.0, 1, 0, out=out)
+        assert volts is out
+        np.testing.assert_array_equal(out, [-1, 0, 1, 2])
+
+
+class TestMeasure:
+    """Measurements read in one round-trip."""
+
+    def test_combined(self, wire):
+        wire.reply(b"1.0E+00;2.5E-03\n")
+        result = MSO8204(wire.sock).measure(2, ["vpp", "PERiod"])
+        assert result == {"channel": 2, "results": {"vpp": 1.0, "PERiod": 2.5e-3}}
+        assert wire.sent() == ":MEASure:SOURce CHANnel2;:MEASure:VPP?;:MEASure:PERiod?\n"
+
+    def test_unknown_rejected_before_sending(self, wire):
+        result = MSO8204(wire.sock).measure(1, ["VPP", "rise"])
+        assert "rise" in result["error"]
+        assert wire.sent() == ""
+
+
+class TestWaveformDeep:
+    """RAW memory read in windows sized from the RAW preamble."""
+
+    PREAMBLE = b"0,2,6,1,1.0E-09,0,0,1.0E+00,0,0;1.0E+09\n"
+
+    def test_points_from_preamble(self, wire):
+        scripted = wire.script(
+            (":WAVeform:PREamble?", self.PREAMBLE),
+            (":WAVeform:STARt?", b"1;1000\n"),
+            (":WAVeform:STOP 4;", b"#14\x00\x01\x02\x03\n"),
+            (":WAVeform:STOP 6;", b"#12\x04\x05\n"),
+        )
+        result = MSO8204(wire.sock).waveform_deep(1, chunk_points=4)
+        assert result["points"] == 6 and result["chunks"] == 2
+        np.testing.assert_array_equal(result["volts"], [0, 1, 2, 3, 4, 5])
+        assert not any("MDEPth" in line for line in scripted.lines)
+        assert scripted.wait_for(":WAVeform:STARt 1;:WAVeform:STOP 1000")
+
+
+class TestPreambleCache:
+    """Writes that change the scaling drop cached preambles."""
+
+    def cached(self, wire):
+        scope = MSO8204(wire.sock)
+        for channel in (1, 2):
+            scope._preambles[(channel, "NORMAL", "BYTE", None)] = {"points": 1000}
+        return scope
+
+    @pytest.mark.parametrize("header,value", [
+        (":ACQuire:MDEPth", "1M"),
+        (":ACQuire:TYPE", "HRESolution"),
+        (":TIMebase:MAIN:SCALe", 1e-3),
+    ])
+    def test_acquisition_settings_drop_all(self, wire, header, value):
+        scope = self.cached(wire)
+        scope.write_setting(header, value)
+        assert scope._preambles == {}
+
+    def test_channel_setting_drops_that_channel(self, wire):
+        scope = self.cached(wire)
+        with scope.batch():
+            scope.write_setting(":CHANnel2:SCALe", 0.5)
+        assert list(scope._preambles) == [(1, "NORMAL", "BYTE", None)]
+
+    def test_unrelated_write_keeps_cache(self, wire):
+        scope = self.cached(wire)
+        scope.write(":TRIGger:EDGe:LEVel 0.5")
+        assert len(scope._preambles) == 2
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+RSA5065N Test Suite
+
+Covers limit mask interpolation and violation reporting.
+
+Usage:
+    pytest tests/test_rsa5065n.py -v
+"""
+
+import numpy as np
+import pytest
+
+from instruments.rsa5065n import limit_violations, mask_limits
+
+
+class TestLimitMasks:
+    """Mask interpolation and violation reporting."""
+
+    FREQS = np.linspace(0, 1000, 11)
+
+    def test_no_mask(self):
+        assert mask_limits(None, self.FREQS) is None
+        assert mask_limits([], self.FREQS) is None
+
+    def test_interpolated(self):
+        limits = mask_limits([[1000, -20], [0, -40]], self.FREQS)
+        assert limits.dtype == np.float32
+        np.testing.assert_allclose(limits, np.linspace(-40, -20, 11))
+
+    def test_outside_range_unchecked(self):
+        limits = mask_limits([[200, -30], [800, -30]], self.FREQS)
+        assert np.isnan(limits[:2]).all() and np.isnan(limits[-2:]).all()
+        assert (limits[2:9] == -30).all()
+
+    def test_step(self):
+        limits = mask_limits([[0, -50], [500, -50], [500, -20], [1000, -20]], self.FREQS)
+        assert limits[4] == -50 and limits[6] == -20
+
+    @pytest.mark.parametrize("mask", [[[1, 2, 3]], [1, 2], [["a", "b"]]])
+    def test_invalid(self, mask):
+        with pytest.raises(ValueError):
+            mask_limits(mask, self.FREQS)
+
+    def test_violations(self):
+        trace = np.full(11, -60, dtype=np.float32)
+        trace[3:6] = [-25, -10, -25]
+        trace[9] = -90
+        upper = mask_limits([[0, -30], [1000, -30]], self.FREQS)
+        lower = mask_limits([[800, -80], [1000, -80]], self.FREQS)
+        events = limit_violations(trace, self.FREQS, upper, lower)
+        assert [e["kind"] for e in events] == ["upper", "lower"]
+        assert events[0]["freq_hz"] == 400 and events[0]["margin_db"] == pytest.approx(20)
+        assert (events[0]["start_hz"], events[0]["stop_hz"]) == (300, 500)
+        assert events[1]["freq_hz"] == 900 and events[1]["margin_db"] == pytest.approx(10)
+
+    def test_nan_limits_pass(self):
+        trace = np.zeros(11, dtype=np.float32)
+        upper = mask_limits([[500, -30], [600, -30]], self.FREQS)
+        assert len(limit_violations(trace, self.FREQS, upper)) == 1
@@ -0,0 +1,482 @@
+#!/usr/bin/env python3
+"""
+SCPI Transport Test Suite
+
+Covers the helpers in scpi_transport and SCPISocket round-trips over a
+socketpair (see conftest.Wire).
+
+Usage:
+    pytest tests/test_transport.py -v
+"""
+
+import hashlib
+import io
+import threading
+import time
+
+import numpy as np
+import pytest
+
+import scpi_transport
+from scpi_transport import (
+    MAX_MESSAGE_LEN,
+    PACING_FIXED,
+    PACING_GAP,
+    PACING_OPC,
+    READ_FRAMED,
+    READ_QUIET_TIMEOUT,
+    READ_TERMINATED,
+    SHAPE_BLOCK,
+    SHAPE_SENTINEL,
+    PacingPolicy,
+    ReplyReader,
+    ReplyShape,
+    ResponseFramer,
+    SCPIBatch,
+    SCPIError,
+    SCPISocket,
+    block_header_digits,
+    block_length,
+    learn_shape,
+    pacing_for,
+    split_response,
+)
+
+
+def block(payload: bytes) -> bytes:
+    """IEEE 488.2 definite-length block with trailing newline."""
+    count = str(len(payload)).encode()
+    return b"#" + str(len(count)).encode() + count + payload + b"\n"
+
+
+class TestSplitResponse:
+    """Compound responses are split on ';' outside quotes."""
+
+    def test_plain(self):
+        assert split_response('1;5.000000E-01;"DC"') == ["1", "5.000000E-01", '"DC"']
+
+    def test_single(self):
+        assert split_response(" 42 ") == ["42"]
+
+    def test_quoted_separator(self):
+        assert split_response('"a;b";\'c;d\';e') == ['"a;b"', "'c;d'", "e"]
+
+    def test_empty_fields_kept(self):
+        assert split_response("1;;2") == ["1", "", "2"]
+
+
+class TestPacingPolicy:
+    """Pacing modes and the per-model defaults."""
+
+    def test_gap_waits_remainder(self):
+        policy = PacingPolicy(PACING_GAP, 0.05)
+        assert policy.delay_before_send(10.0, 10.02) == pytest.approx(0.03)
+        assert policy.delay_before_send(10.0, 10.10) == 0.0
+        assert policy.delay_after_send() == 0.0
+
+    def test_fixed_sleeps_after(self):
+        policy = PacingPolicy(PACING_FIXED, 0.05)
+        assert policy.delay_before_send(10.0, 10.0) == 0.0
+        assert policy.delay_after_send() == 0.05
+
+    def test_opc_appends_sentinel(self):
+        assert PacingPolicy(PACING_OPC, 0.0).frame_write(":RUN") == (":RUN;*OPC?", True)
+        assert PacingPolicy(PACING_GAP, 0.0).frame_write(":RUN") == (":RUN", False)
+
+    def test_model_defaults(self):
+        assert pacing_for("mso8204").min_gap == 0.05
+        assert pacing_for("dp932a").min_gap == 0.03
+        assert pacing_for("dmm6500").min_gap == 0.03
+        assert pacing_for("unknown") == PacingPolicy()
+
+    def test_defaults_are_copies(self):
+        policy = pacing_for("dp932a")
+        policy.min_gap = 1.0
+        assert pacing_for("dp932a").min_gap == 0.03
+
+
+class TestReplyShape:
+    """Only self-delimiting shapes are learned."""
+
+    def test_block_learned(self):
+        assert learn_shape(b"#15hello").kind == SHAPE_BLOCK
+
+    def test_text_needs_sentinel(self):
+        assert learn_shape(b"1.0,2.0,3.0").kind == SHAPE_SENTINEL
+        assert learn_shape(b"").kind == SHAPE_SENTINEL
+
+    def test_block_complete(self):
+        shape = ReplyShape(SHAPE_BLOCK)
+        assert not shape.complete(b"#15hel")
+        assert shape.complete(b"#15hello")
+        assert not shape.complete(b"#0hello")
+
+    def test_sentinel_complete(self):
+        shape = ReplyShape(SHAPE_SENTINEL)
+        assert not shape.complete(b"1,2,3")
+        assert shape.complete(b"1,2,3;1")
+
+
+class TestBlockHeader:
+    """#<d><count> parsing, including indefinite-length #0."""
+
+    def test_digits(self):
+        assert block_header_digits(b"#9") == 9
+        assert block_header_digits(b"#0") == 0
+
+    def test_bad_header(self):
+        with pytest.raises(SCPIError):
+            block_header_digits(b"1,")
+
+    def test_length(self):
+        assert block_length(b"000001024") == 1024
+
+    def test_indefinite_needs_length(self):
+        assert block_length(b"", 80) == 80
+        with pytest.raises(SCPIError):
+            block_length(b"")
+
+
+class TestReplyReader:
+    """Completion decisions shared by the blocking and asyncio transports."""
+
+    def test_terminator(self):
+        reader = ReplyReader()
+        assert not reader.feed(b"1.2")
+        assert reader.feed(b"3\n")
+        assert reader.end == READ_TERMINATED
+        assert bytes(reader.buf) == b"1.23\n"
+
+    def test_terminator_split_across_chunks(self):
+        reader = ReplyReader(b"\r\n")
+        assert not reader.feed(b"OK\r")
+        assert reader.feed(b"\n")
+
+    def test_framed(self):
+        reader = ReplyReader(complete=ReplyShape(SHAPE_BLOCK).complete)
+        assert not reader.feed(b"#13ab")
+        assert reader.feed(b"c")
+        assert reader.end == READ_FRAMED
+
+    def test_quiet_after_data(self):
+        reader = ReplyReader()
+        assert reader.timeout(10.0) == 10.0
+        assert not reader.quiet()
+        reader.feed(b"1")
+        assert reader.timeout(10.0) == scpi_transport.QUIET_TIMEOUT
+        assert reader.quiet()
+        assert reader.end == READ_QUIET_TIMEOUT
+
+    def test_closed(self):
+        assert not ReplyReader().closed()
+        reader = ReplyReader()
+        reader.feed(b"1")
+        assert reader.closed()
+
+    def test_max_bytes(self):
+        reader = ReplyReader(max_bytes=4)
+        with pytest.raises(SCPIError):
+            reader.feed(b"123456")
+
+
+class TestResponseFramer:
+    """Learning from quiet timeouts and reading *OPC? sentinels."""
+
+    def test_quiet_reply_learns_sentinel(self):
+        framer = ResponseFramer()
+        assert framer.frame_query(":X?") == (":X?", None, False)
+        text, pending = framer.finish_query(":X?", b"1,2,3", READ_QUIET_TIMEOUT, False)
+        assert (text, pending) == ("1,2,3", False)
+        message, complete, sentinel = framer.frame_query(":X?")
+        assert message == ":X?;*OPC?" and sentinel
+        assert complete(b"1,2,3,4,5;1")
+
+    def test_learned_block(self):
+        framer = ResponseFramer()
+        framer.finish_query(":D?", b"#13abc", READ_QUIET_TIMEOUT, False)
+        message, complete, sentinel = framer.frame_query(":D?")
+        assert message == ":D?" and not sentinel
+        assert complete(b"#13abc")
+
+    def test_sentinel_stripped(self):
+        framer = ResponseFramer()
+        assert framer.finish_query(":X?", b"1,2;1", READ_FRAMED, True) == ("1,2", False)
+
+    def test_sentinel_on_own_line(self):
+        framer = ResponseFramer()
+        assert framer.finish_query(":X?", b"1,2\n", READ_TERMINATED, True) == ("1,2", True)
+
+    def test_missing_sentinel_forgets_shape(self):
+        framer = ResponseFramer()
+        framer.register(":X?", ReplyShape(SHAPE_SENTINEL))
+        framer.finish_query(":X?", b"1,2", READ_QUIET_TIMEOUT, True)
+        assert framer.shape_for(":X?") is None
+        assert framer.stats()["quiet_timeouts_by_command"] == {":X?": 1}
+
+    def test_wrong_block_shape_falls_back(self):
+        framer = ResponseFramer()
+        framer.register(":D?", ReplyShape(SHAPE_BLOCK))
+        framer.learn(":D?", b"1,2,3")
+        assert framer.shape_for(":D?").kind == SHAPE_SENTINEL
+
+    def test_shapes_bounded(self, monkeypatch):
+        monkeypatch.setattr(ResponseFramer, "MAX_SHAPES", 2)
+        framer = ResponseFramer()
+        for i in range(4):
+            framer.learn(f":Q{i}?", b"1")
+        assert len(framer.shapes) == 2
+
+
+class TestBatchPlan:
+    """Grouping queued commands into program messages."""
+
+    def make(self, mode=PACING_GAP):
+        return SCPIBatch(SCPISocket("127.0.0.1", policy=PacingPolicy(mode, 0.0)))
+
+    def test_one_message(self):
+        batch = self.make()
+        batch.write(":A 1")
+        batch.query(":B?")
+        assert batch.query(":C?") == 1
+        assert batch._plan() == [(":A 1;:B?;:C?", 2, ":A 1;:B?;:C?", False, False)]
+
+    def test_split_at_max_length(self):
+        batch = self.make()
+        cmd = ":SOURce1:FREQuency 1000"
+        count = MAX_MESSAGE_LEN // len(cmd) + 5
+        for _ in range(count):
+            batch.write(cmd)
+        plan = batch._plan()
+        assert len(plan) == 2
+        assert all(len(message) <= MAX_MESSAGE_LEN for message, *_ in plan)
+        assert sum(message.count(cmd) for message, *_ in plan) == count
+
+    def test_opc_mode_syncs_writes(self):
+        batch = self.make(PACING_OPC)
+        batch.write(":A 1")
+        assert batch._plan() == [(":A 1;*OPC?", 0, ":A 1", False, True)]
+
+    def test_learned_key_gets_sentinel(self):
+        batch = self.make()
+        batch._sock.framer.register(":A?;:B?", ReplyShape(SHAPE_SENTINEL))
+        batch.query(":A?")
+        batch.query(":B?")
+        assert batch._plan() == [(":A?;:B?;*OPC?", 2, ":A?;:B?", True, False)]
+
+    def test_abort_discards(self):
+        batch = self.make()
+        events = []
+        batch.write(":A 1")
+        batch.on_flush(lambda: events.append("apply"), lambda: events.append("discard"))
+        batch.abort()
+        assert len(batch) == 0 and events == ["discard"]
+
+
+class TestQuery:
+    """Single queries and reply framing over the wire."""
+
+    def test_terminated(self, wire):
+        wire.reply(b"RIGOL,MSO8204,1,2\n")
+        assert wire.sock.query("*IDN?") == "RIGOL,MSO8204,1,2"
+        assert wire.sent() == "*IDN?\n"
+
+    def test_unterminated_learns_sentinel(self, wire):
+        wire.reply(b"1,2,3")
+        assert wire.sock.query(":TRAC?") == "1,2,3"
+        assert wire.sock.framer.counts[READ_QUIET_TIMEOUT] == 1
+
+        # A longer reply is not cut at the previous length
+        wire.reply(b"1,2,3,4,5;1")
+        assert wire.sock.query(":TRAC?") == "1,2,3,4,5"
+        assert wire.sent() == ":TRAC?\n:TRAC?;*OPC?\n"
+        assert wire.sock.framer.counts[READ_FRAMED] == 1
+
+    def test_sentinel_answered_separately(self, wire):
+        wire.sock.framer.register(":TRAC?", ReplyShape(SHAPE_SENTINEL))
+        wire.reply(b"1,2\n1\n")
+        assert wire.sock.query(":TRAC?") == "1,2"
+        wire.reply(b"OK\n")
+        assert wire.sock.query(":NEXT?") == "OK"
+
+
+class TestQueryMany:
+    """Compound queries answered in one round-trip."""
+
+    def test_query_many(self, wire):
+        wire.reply(b'1;2.5;"DC"\n')
+        assert wire.sock.query_many([":A?", ":B?", ":C?"]) == ["1", "2.5", '"DC"']
+        assert wire.sent() == ":A?;:B?;:C?\n"
+
+    def test_query_many_line_per_response(self, wire):
+        wire.reply(b"1\n2\n")
+        assert wire.sock.query_many([":A?", ":B?"]) == ["1", "2"]
+
+    def test_query_many_too_many(self, wire):
+        wire.reply(b"1;2;3\n")
+        with pytest.raises(SCPIError):
+            wire.sock.query_many([":A?", ":B?"])
+
+
+class TestBatch:
+    """batch() coalesces writes and queries into one message."""
+
+    def test_coalesced(self, wire):
+        wire.reply(b"1000\n")
+        with wire.sock.batch() as batch:
+            wire.sock.write(":FREQ 1000")
+            wire.sock.write(":VOLT 1")
+            index = batch.query(":FREQ?")
+        assert batch.results[index] == "1000"
+        assert wire.sent() == ":FREQ 1000;:VOLT 1;:FREQ?\n"
+
+    def test_nested_joins_outer(self, wire):
+        with wire.sock.batch():
+            wire.sock.write(":A 1")
+            with wire.sock.batch():
+                wire.sock.write(":B 2")
+        assert wire.sent() == ":A 1;:B 2\n"
+
+    def test_query_inside_batch_rejected(self, wire):
+        with pytest.raises(SCPIError):
+            with wire.sock.batch():
+                wire.sock.query(":A?")
+
+    def test_raise_sends_nothing(self, wire):
+        events = []
+        with pytest.raises(RuntimeError):
+            with wire.sock.batch() as batch:
+                wire.sock.write(":A 1")
+                batch.on_flush(lambda: events.append("apply"), lambda: events.append("discard"))
+                raise RuntimeError("abandon")
+        assert wire.sent() == ""
+        assert events == ["discard"]
+        assert wire.sock.batching is None
+
+    def test_failed_flush_discards(self, wire):
+        events = []
+        wire.peer.close()
+        with pytest.raises(SCPIError):
+            with wire.sock.batch() as batch:
+                batch.on_flush(lambda: events.append("apply"), lambda: events.append("discard"))
+                batch.query(":A?")
+        assert events == ["discard"]
+
+    def test_flush_applies(self, wire):
+        events = []
+        with wire.sock.batch() as batch:
+            wire.sock.write(":A 1")
+            batch.on_flush(lambda: events.append("apply"), lambda: events.append("discard"))
+        assert events == ["apply"]
+
+
+class TestBlocks:
+    """Block reads into preallocated buffers."""
+
+    def test_query_block(self, wire):
+        wire.reply(block(b"\x01\x02\x03"))
+        assert wire.sock.query_block(":DATA?") == bytearray(b"\x01\x02\x03")
+
+    def test_query_block_into_numpy(self, wire):
+        samples = np.arange(1000, dtype="<f4")
+        wire.reply(block(samples.tobytes()))
+        buf = np.zeros(2000, dtype="<f4")
+        n = wire.sock.query_block_into(":TRAC:DATA?", buf)
+        assert n == samples.nbytes
+        np.testing.assert_array_equal(buf[:1000], samples)
+
+    def test_too_small_buffer_drained(self, wire):
+        wire.reply(block(b"x" * 64) + b"OK\n")
+        with pytest.raises(SCPIError):
+            wire.sock.query_block_into(":DATA?", bytearray(8))
+        assert wire.sock.query("*OPC?") == "OK"
+
+
+class TestBlockStream:
+    """Block payloads streamed to a sink."""
+
+    def test_stream_to_hash(self, wire):
+        payload = bytes(range(256)) * 100
+        wire.reply(block(payload))
+        digest = hashlib.sha256()
+        progress = []
+        total = wire.sock.query_block_stream(
+            ":DISP:DATA?", digest, lambda done, size: progress.append(done), chunk_size=4096)
+        assert total == len(payload)
+        assert digest.hexdigest() == hashlib.sha256(payload).hexdigest()
+        assert progress[-1] == len(payload) and len(progress) == 7
+
+    def test_stream_to_file(self, wire):
+        wire.reply(block(b"PNGDATA"))
+        out = io.BytesIO()
+        assert wire.sock.query_block_stream(":DISP:DATA?", out) == 7
+        assert out.getvalue() == b"PNGDATA"
+
+    def test_stream_bad_sink(self, wire):
+        with pytest.raises(TypeError):
+            wire.sock.query_block_stream(":DISP:DATA?", object())
+
+
+class TestPipelinedBlocks:
+    """Queries sent ahead of reading their block replies."""
+
+    def test_pipelined_reads(self, wire):
+        wire.reply(block(b"aaaa") + block(b"bb"))
+        wire.sock.send_query(":DATA? 1")
+        wire.sock.send_query(":DATA? 2")
+        buf = bytearray(8)
+        assert wire.sock.read_block_into(buf) == 4 and buf[:4] == b"aaaa"
+        assert wire.sock.read_block_into(buf) == 2 and buf[:2] == b"bb"
+
+    def test_pipelined_without_terminators(self, wire):
+        wire.reply(b"#14aaaa#12bb")
+        wire.sock.send_query(":DATA? 1")
+        wire.sock.send_query(":DATA? 2")
+        buf = bytearray(8)
+        t0 = time.monotonic()
+        assert wire.sock.read_block_into(buf) == 4 and buf[:4] == b"aaaa"
+        assert time.monotonic() - t0 < 0.1  # next reply already queued: no terminator wait
+        assert wire.sock.read_block_into(buf) == 2 and buf[:2] == b"bb"
+
+    def test_terminator_arriving_late(self, wire):
+        wire.sock.send_query(":DATA? 1")
+        wire.sock.send_query(":DATA? 2")
+        wire.reply(b"#14aaaa")
+        threading.Timer(0.3, wire.reply, [b"\n" + block(b"bb")]).start()
+        buf = bytearray(8)
+        assert wire.sock.read_block_into(buf) == 4
+        assert wire.sock.read_block_into(buf) == 2 and buf[:2] == b"bb"
+
+
+class TestIndefiniteBlocks:
+    """#0 blocks whose length the caller knows."""
+
+    def test_indefinite_length(self, wire):
+        wire.reply(b"#0" + b"x" * 16 + b"\n")
+        buf = bytearray(16)
+        wire.sock.send_query("printbuffer(1, 2, defbuffer1.readings)")
+        assert wire.sock.read_block_into(buf, length=16) == 16
+
+    def test_indefinite_length_needs_length(self, wire):
+        wire.reply(b"#0" + b"x" * 16 + b"\n")
+        with pytest.raises(SCPIError):
+            wire.sock.query_block_into(":DATA?", bytearray(16))
+
+
+class TestFlushInput:
+    """Discarding replies left unread."""
+
+    def test_discards_pending(self, wire):
+        wire.reply(block(b"x" * 100))
+        assert wire.sock.flush_input(quiet=0.05) == len(block(b"x" * 100))
+        wire.reply(b"1\n")
+        assert wire.sock.query("*OPC?") == "1"
+
+    def test_nothing_pending(self, wire):
+        assert wire.sock.flush_input(quiet=0.05) == 0
+        assert wire.sock.connected
+
+    def test_peer_closed(self, wire):
+        wire.peer.close()
+        with pytest.raises(SCPIError):
+            wire.sock.flush_input(quiet=0.05)
+        assert not wire.sock.connected
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Waveform Analysis Test Suite
+
+Covers host-side characterisation and spectral analysis against
+synthetic waveforms with known parameters.
+
+Usage:
+    pytest tests/test_waveform_analysis.py -v
+"""
+
+import numpy as np
+import pytest
+
+from waveform_analysis import analyse_spectrum, characterise
+
+XINC = 1e-6          # 1 MSa/s
+POINTS = 100000      # 100 ms
+
+
+def square(freq_hz, duty=0.5, low=0.0, high=3.3, edge_points=10):
+    """Square wave with linear edges edge_points samples long."""
+    t = np.arange(POINTS) * XINC
+    phase = (t * freq_hz) % 1.0
+    ramp = edge_points * XINC * freq_hz
+    level = np.clip(np.minimum(phase / ramp, (duty + ramp - phase) / ramp), 0, 1)
+    return (low + (high - low) * level).astype(np.float32)
+
+
+def sine(freq_hz, amplitude=1.0):
+    t = np.arange(POINTS) * XINC
+    return (amplitude * np.sin(2 * np.pi * freq_hz * t)).astype(np.float32)
+
+
+class TestCharacterise:
+    """Time-domain parameters of synthetic waveforms."""
+
+    def test_square(self):
+        result = characterise(square(1000.0), XINC)
+        assert result["frequency_hz"] == pytest.approx(1000.0, rel=1e-3)
+        assert result["period_s"] == pytest.approx(1e-3, rel=1e-3)
+        assert result["vtop_v"] == pytest.approx(3.3, abs=0.05)
+        assert result["vbase_v"] == pytest.approx(0.0, abs=0.05)
+        assert result["duty_cycle_pos_pct"] == pytest.approx(50.0, abs=1.0)
+        # 10-90 % of a 10-sample linear edge is 8 samples
+        assert result["rise_time_s"] == pytest.approx(8 * XINC, rel=0.15)
+        assert result["fall_time_s"] == pytest.approx(8 * XINC, rel=0.15)
+        assert result["waveform_shape"] == "SQUARE"
+
+    def test_pulse(self):
+        result = characterise(square(2000.0, duty=0.2), XINC)
+        assert result["duty_cycle_pos_pct"] == pytest.approx(20.0, abs=1.0)
+        assert result["duty_cycle_neg_pct"] == pytest.approx(80.0, abs=1.0)
+        assert result["waveform_shape"] == "PULSE"
+
+    def test_sine(self):
+        result = characterise(sine(500.0), XINC)
+        assert result["frequency_hz"] == pytest.approx(500.0, rel=1e-3)
+        assert result["vpp_v"] == pytest.approx(2.0, rel=1e-3)
+        assert result["vrms_v"] == pytest.approx(1 / np.sqrt(2), rel=1e-3)
+        assert result["waveform_shape"] == "SINE"
+
+    def test_triangle(self):
+        t = np.arange(POINTS) * XINC
+        volts = (2 * np.abs(2 * ((t * 1000.0) % 1.0) - 1) - 1).astype(np.float32)
+        assert characterise(volts, XINC)["waveform_shape"] == "TRIANGLE"
+
+    def test_dc(self):
+        result = characterise(np.full(1000, 1.5, dtype=np.float32), XINC)
+        assert result["waveform_shape"] == "DC"
+        assert result["frequency_hz"] is None and result["rising_edges"] == 0
+        assert result["vavg_v"] == pytest.approx(1.5)
+
+    def test_rejects_bad_input(self):
+        with pytest.raises(ValueError):
+            characterise(np.zeros((2, 10)), XINC)
+        with pytest.raises(ValueError):
+            characterise(np.zeros(1), XINC)
+
+
+class TestAnalyseSpectrum:
+    """Spectral summary of tones with known harmonic content."""
+
+    def test_fundamental_and_thd(self):
+        volts = sine(10000.0) + sine(20000.0, 0.01)   # 2nd harmonic at -40 dBc
+        result = analyse_spectrum(volts, XINC, unit="VRMS")
+        assert result["fundamental_hz"] == pytest.approx(10000.0, rel=1e-3)
+        assert result["fundamental_level"] == pytest.approx(1 / np.sqrt(2), rel=0.01)
+        assert result["thd_db"] == pytest.approx(-40.0, abs=0.5)
+        assert result["thd_pct"] == pytest.approx(1.0, rel=0.05)
+        assert result["harmonics"][1]["dbc"] == pytest.approx(-40.0, abs=0.5)
+        assert result["sfdr_db"] == pytest.approx(40.0, abs=0.5)
+
+    def test_dbv(self):
+        result = analyse_spectrum(sine(10000.0), XINC, unit="dbv")
+        assert result["unit"] == "DBV"
+        assert result["fundamental_level"] == pytest.approx(-3.01, abs=0.1)
+
+    def test_averaged_captures(self):
+        captures = np.stack([sine(10000.0), sine(10000.0)])
+        result = analyse_spectrum(captures, XINC)
+        assert result["captures"] == 2 and result["points"] == POINTS
+
+    def test_peaks_sorted(self):
+        volts = sine(10000.0) + sine(33000.0, 0.1)
+        peaks = analyse_spectrum(volts, XINC, unit="VRMS", n_peaks=2)["peaks"]
+        assert [round(p["freq_hz"], -2) for p in peaks] == [10000.0, 33000.0]
+
+    def test_unknown_unit(self):
+        with pytest.raises(ValueError):
+            analyse_spectrum(sine(10000.0), XINC, unit="WATTS")
@@ -0,0 +1,464 @@
+#!/usr/bin/env python3
+"""
+Waveform Analysis - host-side signal characterisation with NumPy.
+
+Computes the parameters the oscilloscope's measurement system reports
+(frequency, 10-90% edges, top/base, RMS, duty, overshoot) from one
+captured array, so a full characterisation is one data transfer plus
+vectorised math. Works equally on live captures and archived .npy files.
+
+All functions take volts as a 1-D array and the sample interval in
+seconds; nothing here talks to an instrument.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+# Histogram resolution for top/base estimation
+HISTOGRAM_BINS = 256
+
+# A histogram mode counts as a flat level when its bin holds this many
+# times the mean bin population of its half
+PLATEAU_RATIO = 5.0
+
+# Schmitt-trigger hysteresis around the mid level, as a fraction of amplitude
+EDGE_HYSTERESIS = 0.1
+
+# Edge reference levels (fractions of amplitude above base)
+LOW_REF = 0.1
+MID_REF = 0.5
+HIGH_REF = 0.9
+
+# Amplitude (V) at or below this counts as no signal
+MIN_AMPLITUDE = 1e-6
+
+
+def top_base(volts: np.ndarray, bins: int = HISTOGRAM_BINS) -> Tuple[float, float]:
+    """
+    Estimate the top and base levels from the voltage histogram.
+
+    The most populated bin in the upper and lower half of the range is
+    taken as top and base, as a scope does for pulse-like signals. A half
+    without a clear mode (no flat level, e.g. a triangle) falls back to
+    the extreme value, as VTOP/VBASe do on the scope.
+
+    Returns:
+        Tuple of (top_v, base_v)
+    """
+    vmin, vmax = float(volts.min()), float(volts.max())
+    if vmax - vmin <= MIN_AMPLITUDE:
+        return vmax, vmin
+    counts, edges = np.histogram(volts, bins=bins, range=(vmin, vmax))
+    centres = (edges[:-1] + edges[1:]) / 2
+    half = bins // 2
+    lower, upper = counts[:half], counts[half:]
+    base = centres[np.argmax(lower)] if lower.max() > PLATEAU_RATIO * lower.mean() else vmin
+    top = centres[half + np.argmax(upper)] if upper.max() > PLATEAU_RATIO * upper.mean() else vmax
+    return float(top), float(base)
+
+
+def level_crossings(volts: np.ndarray, level: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Fractional sample positions where the signal crosses a level.
+
+    Positions are linearly interpolated between the samples either side.
+
+    Returns:
+        Tuple of (rising, falling) float64 arrays of sample positions
+    """
+    above = volts >= level
+    change = np.flatnonzero(above[1:] != above[:-1])
+    v0 = volts[change].astype(np.float64)
+    v1 = volts[change + 1].astype(np.float64)
+    frac = np.divide(level - v0, v1 - v0, out=np.zeros_like(v0), where=v1 != v0)
+    pos = change + frac
+    rising = above[change + 1]
+    return pos[rising], pos[~rising]
+
+
+def _schmitt_edges(volts: np.ndarray, lo: float, hi: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sample indices where a Schmitt trigger with thresholds lo/hi switches.
+
+    Samples between the thresholds keep the previous state (forward-filled
+    with a running maximum over indices), so noise on a slow edge does not
+    produce extra edges.
+    """
+    state = np.full(volts.size, -1, dtype=np.int8)
+    state[volts >= hi] = 1
+    state[volts <= lo] = 0
+    idx = np.where(state >= 0, np.arange(volts.size), 0)
+    np.maximum.accumulate(idx, out=idx)
+    state = state[idx]
+    known = np.flatnonzero(state >= 0)
+    if known.size == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    state = state[known[0]:]
+    step = np.flatnonzero(np.diff(state)) + 1 + known[0]
+    rising = volts[step] >= hi
+    return step[rising], step[~rising]
+
+
+def _edge_times(edges: np.ndarray, mid: np.ndarray, start: np.ndarray,
+                end: np.ndarray) -> np.ndarray:
+    """
+    Start-to-end level transition durations (in samples) for each edge.
+
+    For each Schmitt edge the nearest preceding mid crossing is found; the
+    transition runs from the last start-level crossing before it to the
+    first end-level crossing after it. Edges without both are dropped.
+    """
+    if edges.size == 0 or mid.size == 0:
+        return np.empty(0)
+    m = np.searchsorted(mid, edges, side="right") - 1
+    m = mid[m[m >= 0]]
+    s = np.searchsorted(start, m, side="right") - 1
+    e = np.searchsorted(end, m, side="left")
+    ok = (s >= 0) & (e < end.size)
+    return end[e[ok]] - start[s[ok]]
+
+
+def infer_shape(volts: np.ndarray, top: float, base: float,
+                duty_pct: Optional[float], rise_s: Optional[float],
+                fall_s: Optional[float]) -> str:
+    """
+    Classify the waveform shape from the sample distribution.
+
+    Two-level signals (most samples near top or base) are SQUARE or PULSE
+    depending on duty. Otherwise the crest factor of the AC component
+    separates SINE (~1.41) from TRIANGLE (~1.73), and strongly asymmetric
+    edges make a triangle a RAMP.
+    """
+    amplitude = top - base
+    if amplitude <= MIN_AMPLITUDE or duty_pct is None:
+        return "DC" if amplitude <= MIN_AMPLITUDE else "UNKNOWN"
+
+    band = 0.1 * amplitude
+    flat = np.count_nonzero((np.abs(volts - top) <= band) | (np.abs(volts - base) <= band))
+    if flat / volts.size > 0.8:
+        return "SQUARE" if 40 < duty_pct < 60 else "PULSE"
+
+    ac = volts - volts.mean(dtype=np.float64)
+    rms = float(np.sqrt(np.mean(np.square(ac, dtype=np.float64))))
+    if rms == 0:
+        return "UNKNOWN"
+    crest = float(np.max(np.abs(ac))) / rms
+    if crest < 1.57:
+        return "SINE"
+    if rise_s and fall_s and max(rise_s, fall_s) / min(rise_s, fall_s) > 3:
+        return "RAMP"
+    return "TRIANGLE"
+
+
+def characterise(volts, xinc_s: float) -> dict:
+    """
+    Full signal characterisation of one captured waveform.
+
+    Args:
+        volts: 1-D array of voltages (any float dtype, memmap is fine)
+        xinc_s: Sample interval in seconds
+
+    Returns:
+        Dict with the same keys as MSO8204.characterise_channel()
+        (frequency_hz, period_s, vpp_v, amplitude_v, vtop_v, vbase_v,
+        vrms_v, vmax_v, vmin_v, rise_time_s, fall_time_s,
+        duty_cycle_pos_pct, duty_cycle_neg_pct, overshoot_pct,
+        preshoot_pct, waveform_shape) plus vavg_v, points and edge counts.
+        Parameters that need edges are None when there are too few.
+    """
+    volts = np.asarray(volts)
+    if volts.ndim != 1 or volts.size < 2:
+        raise ValueError("Expected a 1-D waveform of at least 2 points")
+
+    vmax, vmin = float(volts.max()), float(volts.min())
+    top, base = top_base(volts)
+    amplitude = top - base
+    result = {
+        "points": int(volts.size),
+        "vpp_v": vmax - vmin,
+        "amplitude_v": amplitude,
+        "vtop_v": top,
+        "vbase_v": base,
+        "vmax_v": vmax,
+        "vmin_v": vmin,
+        "vavg_v": float(volts.mean(dtype=np.float64)),
+        "vrms_v": float(np.sqrt(np.mean(np.square(volts, dtype=np.float64)))),
+        "overshoot_pct": (vmax - top) / amplitude * 100 if amplitude > MIN_AMPLITUDE else None,
+        "preshoot_pct": (base - vmin) / amplitude * 100 if amplitude > MIN_AMPLITUDE else None,
+        "frequency_hz": None,
+        "period_s": None,
+        "rise_time_s": None,
+        "fall_time_s": None,
+        "duty_cycle_pos_pct": None,
+        "duty_cycle_neg_pct": None,
+        "rising_edges": 0,
+        "falling_edges": 0,
+    }
+
+    if amplitude > MIN_AMPLITUDE:
+        mid = base + MID_REF * amplitude
+        low = base + LOW_REF * amplitude
+        high = base + HIGH_REF * amplitude
+        hyst = EDGE_HYSTERESIS * amplitude
+
+        rise_idx, fall_idx = _schmitt_edges(volts, mid - hyst, mid + hyst)
+        mid_r, mid_f = level_crossings(volts, mid)
+        low_r, low_f = level_crossings(volts, low)
+        high_r, high_f = level_crossings(volts, high)
+
+        # Mid-level position of every hysteresis-qualified edge
+        r = np.searchsorted(mid_r, rise_idx, side="right") - 1
+        f = np.searchsorted(mid_f, fall_idx, side="right") - 1
+        rising = mid_r[r[r >= 0]]
+        falling = mid_f[f[f >= 0]]
+        result["rising_edges"] = int(rising.size)
+        result["falling_edges"] = int(falling.size)
+
+        rise = _edge_times(rise_idx, mid_r, low_r, high_r)
+        fall = _edge_times(fall_idx, mid_f, high_f, low_f)
+        if rise.size:
+            result["rise_time_s"] = float(rise.mean() * xinc_s)
+        if fall.size:
+            result["fall_time_s"] = float(fall.mean() * xinc_s)
+
+        if rising.size >= 2:
+            period = float(np.diff(rising).mean() * xinc_s)
+            result["period_s"] = period
+            result["frequency_hz"] = 1.0 / period if period > 0 else None
+
+            # High time: each rising edge to the next falling edge within its period
+            nxt = np.searchsorted(falling, rising[:-1], side="right")
+            ok = nxt < falling.size
+            high_t = falling[nxt[ok]] - rising[:-1][ok]
+            spans = np.diff(rising)[ok]
+            valid = high_t < spans
+            if np.any(valid):
+                duty = float(np.mean(high_t[valid] / spans[valid]) * 100)
+                result["duty_cycle_pos_pct"] = duty
+                result["duty_cycle_neg_pct"] = 100 - duty
+
+    result["waveform_shape"] = infer_shape(
+        volts, top, base, result["duty_cycle_pos_pct"],
+        result["rise_time_s"], result["fall_time_s"])
+    return result
+
+
+# ---- Spectral analysis ----
+
+# Window name (as :MATH:FFT:WINDow) -> (cosine-sum coefficients, main-lobe half width in bins)
+WINDOWS = {
+    "RECTangle": ((1.0,), 1),
+    "HANNing": ((0.5, 0.5), 2),
+    "HAMMing": ((0.54, 0.46), 2),
+    "BLACkman": ((0.42, 0.5, 0.08), 3),
+    "FLATtop": ((0.21557895, 0.41663158, 0.277263158, 0.083578947, 0.006947368), 5),
+}
+
+# Spectrum units: Vrms per bin, dB relative to 1 Vrms, dB relative to 1 mW
+SPECTRUM_UNITS = ("VRMS", "DBV", "DBM")
+
+# Bins either side of DC excluded from peaks, spurs and noise
+DC_EXCLUDE_BINS = 3
+
+
+def _window_name(name: str) -> str:
+    """Resolve a window name case-insensitively, accepting SCPI short forms."""
+    for full in WINDOWS:
+        short = "".join(c for c in full if c.isupper())
+        if name.upper() in (full.upper(), short):
+            return full
+    raise ValueError(f"Unknown window {name}. Valid: {list(WINDOWS)}")
+
+
+def window(name: str, n: int) -> Tuple[np.ndarray, float, float]:
+    """
+    Cosine-sum window samples.
+
+    Returns:
+        Tuple of (window, coherent_gain, enbw_bins). Coherent gain
+        corrects tone amplitudes; ENBW (equivalent noise bandwidth, in
+        bins) corrects powers summed over several bins.
+    """
+    coeffs, _ = WINDOWS[_window_name(name)]
+    phase = 2 * np.pi * np.arange(n) / n
+    w = np.zeros(n)
+    for k, a in enumerate(coeffs):
+        w += (-1) ** k * a * np.cos(k * phase)
+    gain = w.mean()
+    enbw = n * np.sum(w * w) / np.sum(w) ** 2
+    return w.astype(np.float32), float(gain), float(enbw)
+
+
+def power_spectrum(volts, xinc_s: float, window_name: str = "HANNing") -> Tuple[np.ndarray, np.ndarray, float]:
+    """
+    Single-sided power spectrum in Vrms^2 per bin, calibrated for tones.
+
+    volts may be 1-D (one capture) or 2-D (captures x points); several
+    captures are power-averaged, which lowers the noise variance without
+    needing phase-coherent triggering.
+
+    Returns:
+        Tuple of (freqs_hz, power_vrms2, enbw_bins)
+    """
+    volts = np.atleast_2d(np.asarray(volts))
+    n = volts.shape[1]
+    w, gain, enbw = window(window_name, n)
+    spec = np.fft.rfft(volts * w, axis=1)
+    power = np.mean(np.abs(spec) ** 2, axis=0) / (n * gain) ** 2
+    power[1:] *= 2      # fold negative frequencies: tone bins now hold Vrms^2
+    if n % 2 == 0:
+        power[-1] /= 2  # the Nyquist bin has no mirror image
+    return np.fft.rfftfreq(n, xinc_s), power, enbw
+
+
+def to_unit(power: np.ndarray, unit: str = "DBV", impedance: float = 50.0) -> np.ndarray:
+    """Convert Vrms^2 power to VRMS, DBV or DBM (into impedance ohms)."""
+    unit = unit.upper()
+    tiny = np.finfo(np.float64).tiny
+    if unit == "VRMS":
+        return np.sqrt(power)
+    if unit == "DBV":
+        return 10 * np.log10(np.maximum(power, tiny))
+    if unit == "DBM":
+        return 10 * np.log10(np.maximum(power / impedance / 1e-3, tiny))
+    raise ValueError(f"Unknown unit {unit}. Valid: {list(SPECTRUM_UNITS)}")
+
+
+def find_peaks(power: np.ndarray, count: int, separation: int = 1,
+               start: int = DC_EXCLUDE_BINS) -> np.ndarray:
+    """
+    Bin indices of the largest local maxima, strongest first.
+
+    Peaks closer than `separation` bins to a stronger peak are dropped,
+    so one window main lobe yields one peak.
+    """
+    p = power[start:]
+    if p.size < 3:
+        return np.empty(0, dtype=np.int64)
+    local = np.flatnonzero((p[1:-1] > p[:-2]) & (p[1:-1] >= p[2:])) + 1 + start
+    local = local[np.argsort(power[local])[::-1]]
+    kept = []
+    for i in local:
+        if all(abs(i - k) > separation for k in kept):
+            kept.append(i)
+            if len(kept) == count:
+                break
+    return np.array(kept, dtype=np.int64)
+
+
+def _peak_freq(power: np.ndarray, i: int, df: float) -> float:
+    """Refine a peak frequency by parabolic interpolation of the dB levels."""
+    if 0 < i < power.size - 1:
+        a, b, c = to_unit(power[i - 1:i + 2], "DBV")
+        denom = a - 2 * b + c
+        if denom != 0:
+            return float((i + 0.5 * (a - c) / denom) * df)
+    return float(i * df)
+
+
+def analyse_spectrum(volts, xinc_s: float, window_name: str = "HANNing",
+                     unit: str = "DBV", n_peaks: int = 10, n_harmonics: int = 5,
+                     impedance: float = 50.0) -> dict:
+    """
+    FFT a waveform (or several captures) and summarise the spectrum.
+
+    The strongest peak is taken as the fundamental. Harmonic, noise and
+    spur powers are integrated over each tone's main lobe and corrected
+    for the window's ENBW.
+
+    Args:
+        volts: 1-D array, or 2-D (captures x points) for averaging
+        xinc_s: Sample interval in seconds
+        window_name: Window ("RECTangle", "HANNing", "HAMMing", "BLACkman", "FLATtop")
+        unit: Level unit for the tables ("VRMS", "DBV", "DBM")
+        n_peaks: Number of peaks in the peak table
+        n_harmonics: Harmonics (including the fundamental) to analyse
+        impedance: Load impedance for DBM
+
+    Returns:
+        Dict with resolution_hz, fundamental_hz/level, thd_db, thd_pct,
+        snr_db, sinad_db, sfdr_db, harmonics table and peaks table
+    """
+    name = _window_name(window_name)
+    unit = unit.upper()
+    if unit not in SPECTRUM_UNITS:
+        raise ValueError(f"Unknown unit {unit}. Valid: {list(SPECTRUM_UNITS)}")
+    captures = np.atleast_2d(np.asarray(volts))
+    freqs, power, enbw = power_spectrum(captures, xinc_s, name)
+    df = float(freqs[1]) if freqs.size > 1 else 0.0
+    span = WINDOWS[name][1] + 1
+
+    def band(i: int) -> slice:
+        return slice(max(i - span, 0), min(i + span + 1, power.size))
+
+    result = {
+        "points": int(captures.shape[1]),
+        "captures": int(captures.shape[0]),
+        "window": name,
+        "unit": unit,
+        "resolution_hz": df,
+        "enbw_hz": enbw * df,
+        "dc_level": float(to_unit(power[:1], unit, impedance)[0]),
+        "fundamental_hz": None,
+        "fundamental_level": None,
+        "thd_db": None,
+        "thd_pct": None,
+        "snr_db": None,
+        "sinad_db": None,
+        "sfdr_db": None,
+        "harmonics": [],
+        "peaks": []
+    }
+
+    peaks = find_peaks(power, n_peaks, span)
+    result["peaks"] = [
+        {"freq_hz": _peak_freq(power, i, df), "level": float(to_unit(power[i:i + 1], unit, impedance)[0])}
+        for i in peaks
+    ]
+    if peaks.size == 0:
+        return result
+
+    # Tone powers: main-lobe sums, corrected for the window's ENBW
+    fund = int(peaks[0])
+    f0 = _peak_freq(power, fund, df)
+    used = np.zeros(power.size, dtype=bool)
+    used[:DC_EXCLUDE_BINS + 1] = True
+    tones = []
+    for h in range(1, n_harmonics + 1):
+        i = int(round(h * f0 / df)) if df else 0
+        if i >= power.size:
+            break
+        if h > 1:  # the harmonic's lobe peak may sit a bin off the predicted position
+            lo, hi = max(i - 1, 0), min(i + 2, power.size)
+            i = lo + int(np.argmax(power[lo:hi]))
+        p = float(power[band(i)].sum() / enbw)
+        used[band(i)] = True
+        tones.append((h, i, p))
+
+    p_fund = tones[0][2]
+    p_harm = sum(p for h, _, p in tones[1:])
+    p_noise = float(power[~used].sum() / enbw)
+    spur_mask = ~used
+    spur_mask[band(fund)] = False
+    for _, i, _ in tones[1:]:
+        spur_mask[band(i)] = True  # harmonics count as spurs for SFDR
+    spur = float(power[spur_mask].max()) if spur_mask.any() else 0.0
+
+    result["fundamental_hz"] = f0
+    result["fundamental_level"] = float(to_unit(np.array([p_fund]), unit, impedance)[0])
+    result["harmonics"] = [
+        {"n": h, "freq_hz": float(i * df), "level": float(to_unit(np.array([p]), unit, impedance)[0]),
+         "dbc": float(10 * np.log10(p / p_fund)) if p > 0 else None}
+        for h, i, p in tones
+    ]
+    if p_harm > 0:
+        result["thd_db"] = float(10 * np.log10(p_harm / p_fund))
+        result["thd_pct"] = float(100 * np.sqrt(p_harm / p_fund))
+    if p_noise > 0:
+        result["snr_db"] = float(10 * np.log10(p_fund / p_noise))
+    if p_noise + p_harm > 0:
+        result["sinad_db"] = float(10 * np.log10(p_fund / (p_noise + p_harm)))
+    if spur > 0:
+        result["sfdr_db"] = float(10 * np.log10(float(power[fund]) / spur))
+    return result